@@ -0,0 +1,68 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Helper class to schedule polls of long-running operations adaptively.
+
+Instead of polling at a fixed interval, the next poll is scheduled based on the
+rate of change of the operation's progress percentage: halfway to the estimated
+completion time, so that polls become more frequent as it approaches, but are
+rare while there's a long way to go. Without progress, the interval backs off.
+"""
+
+import time
+from typing import Callable, Optional, Tuple
+
+
+class PollSchedule:
+  """Adaptive poll interval, based on the progress of an operation."""
+
+  def __init__(self,
+               min_interval: float,
+               max_interval: float,
+               clock: Callable[[], float] = time.monotonic):
+    """Initializes the schedule.
+
+    Args:
+      min_interval: Minimum number of seconds between polls.
+      max_interval: Maximum number of seconds between polls.
+      clock: Function that returns the current time in seconds.
+
+    Raises:
+      ValueError: Invalid input value.
+    """
+    if not 0 < min_interval <= max_interval:
+      raise ValueError(
+          f"invalid poll intervals: min={min_interval}, max={max_interval}")
+    self.min_interval = min_interval
+    self.max_interval = max_interval
+    self._clock = clock
+    self._interval = min_interval
+    self._last_sample: Optional[Tuple[float, float]] = None
+
+  def next_interval(self, progress_percentage: float) -> float:
+    """Records the latest progress, and returns the seconds until next poll."""
+    now = self._clock()
+    if self._last_sample is not None:
+      last_time, last_progress = self._last_sample
+      rate = 0.0
+      if now > last_time:
+        rate = (progress_percentage - last_progress) / (now - last_time)
+      if rate > 0:
+        self._interval = (100.0 - progress_percentage) / rate / 2
+      else:
+        self._interval *= 2
+      self._interval = min(max(self._interval, self.min_interval),
+                           self.max_interval)
+    self._last_sample = (now, progress_percentage)
+    return self._interval
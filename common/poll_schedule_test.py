@@ -0,0 +1,59 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the "poll_schedule" module."""
+
+import unittest
+
+from . import poll_schedule
+
+
+class PollScheduleTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.now = 0.0
+    self.schedule = poll_schedule.PollSchedule(5, 300, lambda: self.now)
+
+  def test_first_poll_uses_min_interval(self):
+    self.assertEqual(self.schedule.next_interval(0.0), 5)
+
+  def test_interval_follows_rate_of_progress(self):
+    self.schedule.next_interval(0.0)
+    self.now = 10.0
+    # 1% per second, 90 seconds left: poll again halfway there.
+    self.assertEqual(self.schedule.next_interval(10.0), 45.0)
+    self.now = 50.0
+    # Closer to the end, polls become more frequent, down to the minimum.
+    self.assertEqual(self.schedule.next_interval(50.0), 25.0)
+    self.now = 80.0
+    self.assertEqual(self.schedule.next_interval(98.0), 5)
+
+  def test_interval_backs_off_without_progress(self):
+    self.schedule.next_interval(0.0)
+    intervals = []
+    for _ in range(8):
+      self.now += 10.0
+      intervals.append(self.schedule.next_interval(0.0))
+    self.assertEqual(intervals, [10, 20, 40, 80, 160, 300, 300, 300])
+
+  def test_invalid_intervals(self):
+    with self.assertRaises(ValueError):
+      poll_schedule.PollSchedule(10, 5)
+    with self.assertRaises(ValueError):
+      poll_schedule.PollSchedule(0, 5)
+
+
+if __name__ == "__main__":
+  unittest.main()
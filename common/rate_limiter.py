@@ -0,0 +1,68 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Helper class to limit the rate of API calls across threads.
+
+This is a token bucket: tokens are added at a fixed rate (queries per second),
+up to a maximum burst size, and each API call consumes one token, waiting for
+it if necessary.
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+class RateLimiter:
+  """Thread-safe token bucket rate limiter."""
+
+  def __init__(self,
+               qps: float,
+               burst: int = 1,
+               clock: Callable[[], float] = time.monotonic,
+               sleep: Callable[[float], None] = time.sleep):
+    """Initializes the rate limiter.
+
+    Args:
+      qps: Maximum average number of calls per second.
+      burst: Maximum number of calls that may be made at once.
+      clock: Function that returns the current time in seconds.
+      sleep: Function that sleeps for a number of seconds.
+
+    Raises:
+      ValueError: Invalid input value.
+    """
+    if qps <= 0 or burst < 1:
+      raise ValueError(f"invalid rate limit: qps={qps}, burst={burst}")
+    self.qps = qps
+    self.burst = burst
+    self._clock = clock
+    self._sleep = sleep
+    self._lock = threading.Lock()
+    self._tokens = float(burst)
+    self._last_refill = clock()
+
+  def acquire(self):
+    """Waits until a call may be made, and consumes a token for it."""
+    with self._lock:
+      now = self._clock()
+      self._tokens = min(self.burst,
+                         self._tokens + (now - self._last_refill) * self.qps)
+      self._last_refill = now
+      # Tokens may go negative: callers reserve future tokens, and sleep until
+      # their turn, outside the lock.
+      self._tokens -= 1
+      wait = -self._tokens / self.qps if self._tokens < 0 else 0.0
+    if wait > 0:
+      self._sleep(wait)
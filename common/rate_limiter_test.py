@@ -0,0 +1,63 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the "rate_limiter" module."""
+
+import unittest
+
+from . import rate_limiter
+
+
+class RateLimiterTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.now = 0.0
+    self.sleeps = []
+
+  def limiter(self, qps, burst=1):
+    return rate_limiter.RateLimiter(qps, burst, lambda: self.now,
+                                    self.sleeps.append)
+
+  def test_calls_are_spaced_evenly(self):
+    limiter = self.limiter(qps=2)
+    for _ in range(3):
+      limiter.acquire()
+    # Nobody actually sleeps, so each caller waits for one more token.
+    self.assertEqual(self.sleeps, [0.5, 1.0])
+
+  def test_burst(self):
+    limiter = self.limiter(qps=10, burst=3)
+    for _ in range(4):
+      limiter.acquire()
+    self.assertEqual(self.sleeps, [0.1])
+
+  def test_tokens_refill_over_time(self):
+    limiter = self.limiter(qps=1, burst=2)
+    limiter.acquire()
+    limiter.acquire()
+    self.now = 10.0  # Refills up to the burst size, not 10 tokens.
+    for _ in range(3):
+      limiter.acquire()
+    self.assertEqual(self.sleeps, [1.0])
+
+  def test_invalid_rate(self):
+    with self.assertRaises(ValueError):
+      rate_limiter.RateLimiter(0)
+    with self.assertRaises(ValueError):
+      rate_limiter.RateLimiter(1, burst=0)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,77 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Helper function to retry API calls that failed transiently.
+
+API calls are retried with exponential backoff (and jitter) if they failed due
+to a connection error, quota exhaustion (HTTP status 429), or a server error
+(HTTP status 5xx). Other errors, e.g. invalid arguments, are raised right away.
+"""
+
+import random
+import time
+from typing import Callable, TypeVar
+
+from google.auth.transport import requests
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_INITIAL_BACKOFF_SECONDS = 1.0
+DEFAULT_MAX_BACKOFF_SECONDS = 32.0
+
+T = TypeVar("T")
+
+
+def is_retryable(error: Exception) -> bool:
+  """Returns whether an API call that raised an error may succeed if retried."""
+  if isinstance(error, requests.requests.exceptions.HTTPError):
+    status_code = getattr(error.response, "status_code", None)
+    return status_code == 429 or (status_code or 0) >= 500
+  return isinstance(error, (requests.requests.exceptions.ConnectionError,
+                            requests.requests.exceptions.Timeout))
+
+
+def call_with_retry(
+    func: Callable[[], T],
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    initial_backoff_seconds: float = DEFAULT_INITIAL_BACKOFF_SECONDS,
+    max_backoff_seconds: float = DEFAULT_MAX_BACKOFF_SECONDS,
+    sleep: Callable[[float], None] = time.sleep) -> T:
+  """Calls a function, and retries it if it fails transiently.
+
+  Args:
+    func: Function that makes an API call, without arguments (use a lambda or
+      functools.partial to bind them).
+    max_attempts: Maximum number of calls, including the first one.
+    initial_backoff_seconds: Maximum delay before the first retry. The delay
+      doubles before each retry, up to max_backoff_seconds.
+    max_backoff_seconds: Maximum delay between retries.
+    sleep: Function that sleeps for a number of seconds.
+
+  Returns:
+    The return value of the first successful call.
+
+  Raises:
+    The error of the last call, or of the first call that can't be retried.
+  """
+  backoff = initial_backoff_seconds
+  for attempt in range(1, max_attempts + 1):
+    try:
+      return func()
+    except Exception as e:  # pylint: disable=broad-except
+      if attempt == max_attempts or not is_retryable(e):
+        raise
+    # Full jitter, to spread out retries of concurrent callers.
+    sleep(random.uniform(0, backoff))
+    backoff = min(backoff * 2, max_backoff_seconds)
+  raise ValueError(f"max_attempts must be positive, got {max_attempts}")
@@ -0,0 +1,73 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the "retry" module."""
+
+import unittest
+from unittest import mock
+
+from google.auth.transport import requests
+
+from . import retry
+
+
+def http_error(status_code):
+  response = requests.requests.Response()
+  response.status_code = status_code
+  return requests.requests.exceptions.HTTPError(response=response)
+
+
+class RetryTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.sleeps = []
+
+  def call(self, func, **kwargs):
+    return retry.call_with_retry(func, sleep=self.sleeps.append, **kwargs)
+
+  def test_success_without_retries(self):
+    self.assertEqual(self.call(lambda: 42), 42)
+    self.assertEqual(self.sleeps, [])
+
+  def test_retry_transient_errors(self):
+    func = mock.Mock(side_effect=[
+        http_error(429),
+        http_error(503),
+        requests.requests.exceptions.ConnectionError(), "ok"
+    ])
+    self.assertEqual(self.call(func, initial_backoff_seconds=1.0), "ok")
+    self.assertEqual(func.call_count, 4)
+    self.assertEqual(len(self.sleeps), 3)
+    # Exponential backoff with jitter.
+    for sleep, max_backoff in zip(self.sleeps, (1.0, 2.0, 4.0)):
+      self.assertLessEqual(sleep, max_backoff)
+
+  def test_non_retryable_error(self):
+    func = mock.Mock(side_effect=http_error(400))
+    with self.assertRaises(requests.requests.exceptions.HTTPError):
+      self.call(func)
+    self.assertEqual(func.call_count, 1)
+
+  def test_max_attempts(self):
+    func = mock.Mock(side_effect=http_error(500))
+    with self.assertRaises(requests.requests.exceptions.HTTPError):
+      self.call(func, max_attempts=3, max_backoff_seconds=1.5)
+    self.assertEqual(func.call_count, 3)
+    self.assertEqual(len(self.sleeps), 2)
+    self.assertLessEqual(self.sleeps[1], 1.5)
+
+
+if __name__ == "__main__":
+  unittest.main()
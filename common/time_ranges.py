@@ -0,0 +1,95 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Helper functions to split time ranges into shards.
+
+Shard boundaries are whole seconds, because the APIs receive times in the
+format "%Y-%m-%dT%H:%M:%SZ" (see datetime_converter.strftime). This guarantees
+that consecutive shards neither overlap nor leave gaps between them.
+"""
+
+import datetime
+from typing import List, Tuple
+
+TimeRange = Tuple[datetime.datetime, datetime.datetime]
+
+
+def _truncate_to_second(t: datetime.datetime) -> datetime.datetime:
+  return t.replace(microsecond=0)
+
+
+def split_time_range(start_time: datetime.datetime,
+                     end_time: datetime.datetime,
+                     num_shards: int) -> List[TimeRange]:
+  """Splits a time range into consecutive shards of (nearly) equal duration.
+
+  Args:
+    start_time: Start of the time range, inclusive.
+    end_time: End of the time range, exclusive.
+    num_shards: Number of shards to split the time range into. Fewer shards are
+      returned if the time range is shorter than num_shards seconds.
+
+  Returns:
+    List of (start time, end time) tuples, in chronological order. The first
+    shard starts at start_time, and the last shard ends at end_time.
+
+  Raises:
+    ValueError: Invalid input value.
+  """
+  if num_shards < 1:
+    raise ValueError(f"num_shards must be positive, got {num_shards}")
+  if start_time >= end_time:
+    raise ValueError("start time should be earlier than the end time")
+
+  duration = end_time - start_time
+  boundaries = [start_time]
+  for i in range(1, num_shards):
+    boundary = _truncate_to_second(start_time + duration * i / num_shards)
+    if boundary > boundaries[-1]:
+      boundaries.append(boundary)
+  boundaries.append(end_time)
+  return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def split_time_range_by_duration(
+    start_time: datetime.datetime, end_time: datetime.datetime,
+    shard_duration: datetime.timedelta) -> List[TimeRange]:
+  """Splits a time range into consecutive shards of a maximum duration.
+
+  Args:
+    start_time: Start of the time range, inclusive.
+    end_time: End of the time range, exclusive.
+    shard_duration: Maximum duration of each shard (at least 1 second).
+
+  Returns:
+    List of (start time, end time) tuples, in chronological order. All the
+    shards have the given duration, except for the last one, which may be
+    shorter.
+
+  Raises:
+    ValueError: Invalid input value.
+  """
+  if shard_duration < datetime.timedelta(seconds=1):
+    raise ValueError("shard_duration must be at least 1 second")
+  if start_time >= end_time:
+    raise ValueError("start time should be earlier than the end time")
+
+  shards = []
+  shard_start = start_time
+  while shard_start < end_time:
+    shard_end = min(_truncate_to_second(shard_start + shard_duration),
+                    end_time)
+    shards.append((shard_start, shard_end))
+    shard_start = shard_end
+  return shards
@@ -0,0 +1,76 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the "time_ranges" module."""
+
+import datetime
+import unittest
+
+from . import time_ranges
+
+
+class TimeRangesTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.start_time = datetime.datetime(
+        2020, 11, 5, 0, 0, 0, 0, tzinfo=datetime.timezone.utc)
+
+  def test_split_time_range(self):
+    end_time = self.start_time + datetime.timedelta(days=3)
+    shards = time_ranges.split_time_range(self.start_time, end_time, 3)
+    self.assertEqual(shards, [
+        (self.start_time, self.start_time + datetime.timedelta(days=1)),
+        (self.start_time + datetime.timedelta(days=1),
+         self.start_time + datetime.timedelta(days=2)),
+        (self.start_time + datetime.timedelta(days=2), end_time),
+    ])
+
+  def test_split_time_range_rounds_to_seconds(self):
+    end_time = self.start_time + datetime.timedelta(seconds=10)
+    shards = time_ranges.split_time_range(self.start_time, end_time, 3)
+    self.assertEqual([e - s for s, e in shards], [
+        datetime.timedelta(seconds=3),
+        datetime.timedelta(seconds=3),
+        datetime.timedelta(seconds=4),
+    ])
+
+  def test_split_short_time_range(self):
+    end_time = self.start_time + datetime.timedelta(seconds=2)
+    shards = time_ranges.split_time_range(self.start_time, end_time, 5)
+    self.assertEqual(len(shards), 2)
+    self.assertEqual(shards[0][0], self.start_time)
+    self.assertEqual(shards[-1][1], end_time)
+
+  def test_split_time_range_invalid_arguments(self):
+    with self.assertRaises(ValueError):
+      time_ranges.split_time_range(self.start_time, self.start_time, 2)
+    with self.assertRaises(ValueError):
+      time_ranges.split_time_range(
+          self.start_time, self.start_time + datetime.timedelta(hours=1), 0)
+
+  def test_split_time_range_by_duration(self):
+    end_time = self.start_time + datetime.timedelta(hours=5)
+    shards = time_ranges.split_time_range_by_duration(
+        self.start_time, end_time, datetime.timedelta(hours=2))
+    self.assertEqual(shards, [
+        (self.start_time, self.start_time + datetime.timedelta(hours=2)),
+        (self.start_time + datetime.timedelta(hours=2),
+         self.start_time + datetime.timedelta(hours=4)),
+        (self.start_time + datetime.timedelta(hours=4), end_time),
+    ])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -16,18 +16,29 @@
 #
 r"""Executable sample for batch updating curated rule sets deployments.
 
+With a manifest file, the current deployments are listed and compared to the
+desired state in the manifest, and only the deployments that differ are
+updated, in chunked batchUpdate calls that are sent concurrently.
+
 Sample Commands (run from api_samples_python dir):
     # Modify the script to update the constants that point to deployments.
     python3 -m detect.v1alpha.batch_update_curated_rule_set_deployments \
         -r=<region> -p=<project_id> -i=<instance_id>
 
+    # Converge the deployments to a manifest (add --dry_run to only print the
+    # changes).
+    python3 -m detect.v1alpha.batch_update_curated_rule_set_deployments \
+        -r=<region> -p=<project_id> -i=<instance_id> \
+        -m=detect/v1alpha/example_input/curated_rule_set_deployments.json
+
 API reference:
     https://cloud.google.com/chronicle/docs/reference/rest/v1alpha/projects.locations.instances.curatedRuleSetCategories.curatedRuleSets.curatedRuleSetDeployments/batchUpdate
     https://cloud.google.com/chronicle/docs/reference/rest/v1alpha/projects.locations.instances.curatedRuleSetCategories.curatedRuleSets.curatedRuleSetDeployments#CuratedRuleSetDeployment
 """
 import argparse
+import concurrent.futures
 import json
-from typing import Any, Mapping
+from typing import Any, Mapping, Sequence, Tuple
 from common import chronicle_auth
 from common import project_id
 from common import project_instance
@@ -40,14 +51,91 @@ SCOPES = [
     "https://www.googleapis.com/auth/cloud-platform",
 ]
 
+# Keys of each deployment in a manifest file.
+MANIFEST_KEYS = frozenset(
+    ("category", "rule_set", "precision", "enabled", "alerting"))
+# Maximum number of deployments listed per page.
+MAX_PAGE_SIZE = 1000
+# Maximum number of update requests in one batchUpdate call.
+MAX_BATCH_SIZE = 50
+DEFAULT_MAX_CONCURRENCY = 4
 
-def batch_update_curated_rule_set_deployments(
+
+def make_deployment_name(
+    parent: str, category: str, rule_set: str, precision: str
+) -> str:
+  """Returns the resource name of a curated rule set deployment.
+
+  Args:
+    parent: resource name of the instance ("projects/.../instances/<id>")
+    category: ID of the curated rule set category
+    rule_set: ID of the curated rule set
+    precision: precision of the deployment ("broad" or "precise")
+  """
+  # pylint: disable-next=line-too-long
+  return f"{parent}/curatedRuleSetCategories/{category}/curatedRuleSets/{rule_set}/curatedRuleSetDeployments/{precision}"
+
+
+def deployment_ids(name: str) -> Tuple[str, str, str] | None:
+  """Returns the (category, rule_set, precision) IDs in a deployment name.
+
+  The project segment of names may be either the project ID or number, so
+  deployments are matched by these IDs instead of by their full names.
+
+  Args:
+    name: resource name of a curated rule set deployment (see
+      make_deployment_name)
+
+  Returns:
+    the IDs, or None if the name isn't a curated rule set deployment name
+  """
+  segments = name.split("/")
+  if len(segments) < 6 or segments[-6::2] != [
+      "curatedRuleSetCategories", "curatedRuleSets",
+      "curatedRuleSetDeployments"
+  ]:
+    return None
+  return segments[-5], segments[-3], segments[-1]
+
+
+def load_manifest(manifest_file: str) -> Sequence[Mapping[str, Any]]:
+  """Loads the desired state of curated rule set deployments.
+
+  The manifest is a JSON list of deployments, each with the keys "category",
+  "rule_set", "precision", "enabled" and "alerting" (see
+  example_input/curated_rule_set_deployments.json).
+
+  Args:
+    manifest_file: path of the manifest file
+
+  Returns:
+    the deployments in the manifest
+
+  Raises:
+    ValueError: a deployment is missing a key, or appears more than once.
+  """
+  with open(manifest_file) as f:
+    manifest = json.load(f)
+  seen = set()
+  for deployment in manifest:
+    missing = MANIFEST_KEYS - deployment.keys()
+    if missing:
+      raise ValueError(f"deployment {deployment} is missing {sorted(missing)}")
+    key = (deployment["category"], deployment["rule_set"],
+           deployment["precision"])
+    if key in seen:
+      raise ValueError(f"deployment {key} appears more than once")
+    seen.add(key)
+  return manifest
+
+
+def list_curated_rule_set_deployments(
     http_session: requests.AuthorizedSession,
     proj_region: str,
     proj_id: str,
     proj_instance: str,
-) -> Mapping[str, Any]:
-  """Batch update curated rule set deployments.
+) -> Sequence[Mapping[str, Any]]:
+  """Lists all the curated rule set deployments, across all pages.
 
   Args:
     http_session: Authorized session for HTTP requests.
@@ -56,29 +144,78 @@ def batch_update_curated_rule_set_deployments(
     proj_instance: uuid of the instance (with dashes)
 
   Returns:
-    an object with information about the modified deployments
+    CuratedRuleSetDeployment objects, with their "name", "enabled" and
+    "alerting" fields
 
   Raises:
     requests.exceptions.HTTPError: HTTP request resulted in an error
       (response.status_code >= 400).
   """
-
   base_url_with_region = regions.url_always_prepend_region(
       CHRONICLE_API_BASE_URL,
-      args.region
+      proj_region
   )
   # pylint: disable-next=line-too-long
   parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
+  url = f"{base_url_with_region}/v1alpha/{parent}/curatedRuleSetCategories/-/curatedRuleSets/-/curatedRuleSetDeployments"
 
-  # We use "-" in the URL because we provide category and rule_set IDs
-  # in the request data.
-  url = f"{base_url_with_region}/v1alpha/{parent}/curatedRuleSetCategories/-/curatedRuleSets/-/curatedRuleSetDeployments:batchUpdate"
+  deployments = []
+  params = {"pageSize": MAX_PAGE_SIZE}
+  while True:
+    response = http_session.request("GET", url, params=params)
+    if response.status_code >= 400:
+      print(response.text)
+    response.raise_for_status()
+    page = response.json()
+    deployments.extend(page.get("curatedRuleSetDeployments", []))
+    if not page.get("nextPageToken"):
+      return deployments
+    params["pageToken"] = page["nextPageToken"]
+
+
+def diff_deployments(
+    parent: str,
+    manifest: Sequence[Mapping[str, Any]],
+    current: Sequence[Mapping[str, Any]],
+) -> Sequence[Mapping[str, Any]]:
+  """Computes the update requests that converge deployments to a manifest.
+
+  Args:
+    parent: resource name of the instance ("projects/.../instances/<id>")
+    manifest: desired deployments (see load_manifest)
+    current: current deployments (see list_curated_rule_set_deployments);
+      deployments that aren't listed are considered disabled
+
+  Returns:
+    batchUpdate requests, only for the deployments that need to change, with
+    only the changed fields in their update masks
+  """
+  current_by_ids = {deployment_ids(d["name"]): d for d in current}
+  update_requests = []
+  for desired in manifest:
+    name = make_deployment_name(parent, desired["category"],
+                                desired["rule_set"], desired["precision"])
+    existing = current_by_ids.get(deployment_ids(name), {})
+    paths = [
+        field for field in ("alerting", "enabled")
+        if bool(desired[field]) != bool(existing.get(field, False))
+    ]
+    if paths:
+      update_requests.append({
+          "curated_rule_set_deployment": {
+              "name": name,
+              "enabled": bool(desired["enabled"]),
+              "alerting": bool(desired["alerting"]),
+          },
+          "update_mask": {
+              "paths": paths,
+          },
+      })
+  return update_requests
 
-  # Helper function for making a deployment name. Use this as the
-  # curated_rule_set_deployment.name field in the request data below.
-  def make_deployment_name(category, rule_set, precision):
-    return f"{parent}/curatedRuleSetCategories/{category}/curatedRuleSets/{rule_set}/curatedRuleSetDeployments/{precision}"
 
+def _example_update_requests(parent: str) -> Sequence[Mapping[str, Any]]:
+  """Returns batchUpdate requests for two example deployments."""
   # Note that IDs are hard-coded below, as examples.
   print("\nCategories, rule sets, and precisions are hard-coded as " +
         "examples. Update the script to provide actual IDs.\n"
@@ -96,42 +233,86 @@ def batch_update_curated_rule_set_deployments(
   precision_b = "precise"
 
   # Modify the data below to change the behavior of the request.
-  # - Add elements to `requests` to batch update multiple deployments
+  # - Add elements to the list to batch update multiple deployments
   # - Change the enabled and alerting fields as needed
   # - Change the update_mask to modify only certain properties
-  json_data = {
-      "parent": f"{parent}/curatedRuleSetCategories/-/curatedRuleSets/-",
-      "requests": [
-          {
-              "curated_rule_set_deployment": {
-                  "name": make_deployment_name(
-                      category_a,
-                      rule_set_a,
-                      precision_a,
-                  ),
-                  "enabled": True,
-                  "alerting": False,
-              },
-              "update_mask": {
-                  "paths": ["alerting", "enabled"],
-              },
+  return [
+      {
+          "curated_rule_set_deployment": {
+              "name": make_deployment_name(
+                  parent,
+                  category_a,
+                  rule_set_a,
+                  precision_a,
+              ),
+              "enabled": True,
+              "alerting": False,
           },
-          {
-              "curated_rule_set_deployment": {
-                  "name": make_deployment_name(
-                      category_b,
-                      rule_set_b,
-                      precision_b,
-                  ),
-                  "enabled": True,
-                  "alerting": True,
-              },
-              "update_mask": {
-                  "paths": ["alerting", "enabled"],
-              },
+          "update_mask": {
+              "paths": ["alerting", "enabled"],
           },
-      ],
-    }
+      },
+      {
+          "curated_rule_set_deployment": {
+              "name": make_deployment_name(
+                  parent,
+                  category_b,
+                  rule_set_b,
+                  precision_b,
+              ),
+              "enabled": True,
+              "alerting": True,
+          },
+          "update_mask": {
+              "paths": ["alerting", "enabled"],
+          },
+      },
+  ]
+
+
+def batch_update_curated_rule_set_deployments(
+    http_session: requests.AuthorizedSession,
+    proj_region: str,
+    proj_id: str,
+    proj_instance: str,
+    update_requests: Sequence[Mapping[str, Any]] | None = None,
+) -> Mapping[str, Any]:
+  """Batch update curated rule set deployments.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    proj_region: region in which the target project is located
+    proj_id: GCP project id or number which the target instance belongs to
+    proj_instance: uuid of the instance (with dashes)
+    update_requests: batchUpdate requests (see diff_deployments), at most
+      MAX_BATCH_SIZE; if not provided, example requests with hard-coded IDs
+      are sent
+
+  Returns:
+    an object with information about the modified deployments
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+
+  base_url_with_region = regions.url_always_prepend_region(
+      CHRONICLE_API_BASE_URL,
+      proj_region
+  )
+  # pylint: disable-next=line-too-long
+  parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
+
+  # We use "-" in the URL because we provide category and rule_set IDs
+  # in the request data.
+  url = f"{base_url_with_region}/v1alpha/{parent}/curatedRuleSetCategories/-/curatedRuleSets/-/curatedRuleSetDeployments:batchUpdate"
+
+  if update_requests is None:
+    update_requests = _example_update_requests(parent)
+  json_data = {
+      "parent": f"{parent}/curatedRuleSetCategories/-/curatedRuleSets/-",
+      "requests": list(update_requests),
+  }
 
   # See API reference links at top of this file, for response format.
   response = http_session.request("POST", url, json=json_data)
@@ -142,27 +323,113 @@ def batch_update_curated_rule_set_deployments(
   return response.json()
 
 
+def apply_manifest(
+    http_session: requests.AuthorizedSession,
+    proj_region: str,
+    proj_id: str,
+    proj_instance: str,
+    manifest: Sequence[Mapping[str, Any]],
+    batch_size: int = MAX_BATCH_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    dry_run: bool = False,
+) -> Sequence[Mapping[str, Any]]:
+  """Converges curated rule set deployments to the state in a manifest.
+
+  Each deployment appears in at most one batch, so the batches are
+  independent, and are sent concurrently.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    proj_region: region in which the target project is located
+    proj_id: GCP project id or number which the target instance belongs to
+    proj_instance: uuid of the instance (with dashes)
+    manifest: desired deployments (see load_manifest)
+    batch_size: maximum number of update requests per batchUpdate call
+    max_concurrency: maximum number of batchUpdate calls at the same time
+    dry_run: only compute the update requests, without sending them
+
+  Returns:
+    the update requests for the deployments that were changed (or would be
+    changed, in a dry run)
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  # pylint: disable-next=line-too-long
+  parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
+  current = list_curated_rule_set_deployments(http_session, proj_region,
+                                              proj_id, proj_instance)
+  update_requests = diff_deployments(parent, manifest, current)
+  if dry_run or not update_requests:
+    return update_requests
+
+  batches = [
+      update_requests[i:i + batch_size]
+      for i in range(0, len(update_requests), batch_size)
+  ]
+  with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+    futures = [
+        executor.submit(batch_update_curated_rule_set_deployments,
+                        http_session, proj_region, proj_id, proj_instance,
+                        batch) for batch in batches
+    ]
+    for future in concurrent.futures.as_completed(futures):
+      future.result()
+  return update_requests
+
+
 if __name__ == "__main__":
   parser = argparse.ArgumentParser()
   chronicle_auth.add_argument_credentials_file(parser)
   regions.add_argument_region(parser)
   project_instance.add_argument_project_instance(parser)
   project_id.add_argument_project_id(parser)
+  parser.add_argument(
+      "-m",
+      "--manifest_file",
+      type=str,
+      help="JSON file with the desired state of deployments",
+  )
+  parser.add_argument(
+      "--dry_run",
+      action="store_true",
+      help="only print the changes that the manifest would make",
+  )
+  parser.add_argument(
+      "--max_concurrency",
+      type=int,
+      default=DEFAULT_MAX_CONCURRENCY,
+      help="maximum number of concurrent batchUpdate calls",
+  )
 
   args = parser.parse_args()
   auth_session = chronicle_auth.initialize_http_session(
       args.credentials_file,
       SCOPES
   )
-  session = chronicle_auth.initialize_http_session(args.credentials_file)
-  print(
-      json.dumps(
-          batch_update_curated_rule_set_deployments(
-              auth_session,
-              args.region,
-              args.project_id,
-              args.project_instance,
-          ),
-          indent=2,
-      )
-  )
+  if args.manifest_file:
+    changes = apply_manifest(
+        auth_session,
+        args.region,
+        args.project_id,
+        args.project_instance,
+        load_manifest(args.manifest_file),
+        max_concurrency=args.max_concurrency,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps(changes, indent=2))
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"{verb} {len(changes)} deployments")
+  else:
+    print(
+        json.dumps(
+            batch_update_curated_rule_set_deployments(
+                auth_session,
+                args.region,
+                args.project_id,
+                args.project_instance,
+            ),
+            indent=2,
+        )
+    )
@@ -0,0 +1,76 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "batch_update_curated_rule_set_deployments" module."""
+
+import unittest
+
+from . import batch_update_curated_rule_set_deployments as deployments
+
+PARENT = "projects/my-project/locations/us/instances/i"
+
+
+class DiffDeploymentsTest(unittest.TestCase):
+
+  def test_deployment_ids(self):
+    name = deployments.make_deployment_name(PARENT, "c", "r", "broad")
+    self.assertEqual(deployments.deployment_ids(name), ("c", "r", "broad"))
+    self.assertIsNone(deployments.deployment_ids(f"{PARENT}/rules/ru_1"))
+
+  def test_diff_matches_other_project_segment(self):
+    manifest = [
+        {"category": "c", "rule_set": "r1", "precision": "broad",
+         "enabled": True, "alerting": True},
+        {"category": "c", "rule_set": "r2", "precision": "precise",
+         "enabled": True, "alerting": False},
+    ]
+    # The server names the project by its number, not its ID.
+    other_parent = "projects/123456789/locations/us/instances/i"
+    current = [
+        {"name": deployments.make_deployment_name(other_parent, "c", "r1",
+                                                  "broad"),
+         "enabled": True, "alerting": True},
+        {"name": deployments.make_deployment_name(other_parent, "c", "r2",
+                                                  "precise"),
+         "enabled": True},
+    ]
+
+    update_requests = deployments.diff_deployments(PARENT, manifest, current)
+
+    self.assertEqual(update_requests, [])
+
+  def test_diff_only_changed_fields(self):
+    manifest = [
+        {"category": "c", "rule_set": "r1", "precision": "broad",
+         "enabled": True, "alerting": True},
+        {"category": "c", "rule_set": "r2", "precision": "broad",
+         "enabled": True, "alerting": False},
+    ]
+    current = [
+        {"name": deployments.make_deployment_name(PARENT, "c", "r1", "broad"),
+         "enabled": True},
+    ]
+
+    update_requests = deployments.diff_deployments(PARENT, manifest, current)
+
+    self.assertEqual(
+        [r["update_mask"]["paths"] for r in update_requests],
+        [["alerting"], ["enabled"]])
+    self.assertEqual(
+        update_requests[1]["curated_rule_set_deployment"]["name"],
+        deployments.make_deployment_name(PARENT, "c", "r2", "broad"))
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+r"""Executable and reusable sample for getting many alerts.
+
+The file provided to the --alert_ids_file parameter should have one alert
+ ID per line like so:
+```
+de_ad9d2771-a567-49ee-6452-1b2db13c1d33
+de_3c2e2556-aba1-a253-7518-b4ddb666cc32
+```
+Duplicate IDs are fetched once. Alerts are fetched concurrently (see
+get_alert), under a rate limit, with retries of transient errors. One compact
+JSON result per alert is printed, in the order of the input (or, with
+--as_completed, as soon as each one is fetched), followed by a summary (on
+STDERR).
+
+With --cache_file, the immutable fields of fetched alerts are cached in a
+file (per instance), for --cache_ttl_seconds. Mutable fields (see
+MUTABLE_FIELDS, e.g. the analyst feedback) are never cached, so the cache is
+only used to skip fetches with --immutable_fields_only, which also omits the
+mutable fields from fetched alerts.
+
+Usage:
+  python -m detect.v1alpha.bulk_get_alerts \
+    --project_id=<PROJECT_ID>   \
+    --project_instance=<PROJECT_INSTANCE> \
+    --alert_ids_file=<PATH_TO_FILE> \
+    --cache_file=<PATH_TO_FILE> \
+    --cache_ttl_seconds=<SECONDS> \
+    --max_workers=<MAX_WORKERS> \
+    --qps=<QPS> \
+    --immutable_fields_only \
+    --as_completed
+
+API reference:
+  https://cloud.google.com/chronicle/docs/reference/rest/v1alpha/projects.locations.instances.legacy/legacyGetAlert
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping
+
+from common import chronicle_auth
+from common import project_id
+from common import project_instance
+from common import rate_limiter
+from common import regions
+from common import retry
+
+from . import get_alert
+
+from google.auth.transport import requests
+
+SCOPES = [
+    "https://www.googleapis.com/auth/cloud-platform",
+]
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_QPS = 5.0
+DEFAULT_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Fields of an Alert that can change after it's created (e.g. by update_alert),
+# and are therefore never cached.
+MUTABLE_FIELDS = (
+    "feedbackSummary",
+    "feedbackHistory",
+    "caseName",
+)
+
+
+def immutable_fields(alert: Mapping[str, Any]) -> Dict[str, Any]:
+  """Returns an alert without its MUTABLE_FIELDS."""
+  return {k: v for k, v in alert.items() if k not in MUTABLE_FIELDS}
+
+
+class AlertCache:
+  """Thread-safe cache of the immutable fields of alerts, with a TTL.
+
+  Entries expire ttl_seconds after they're added. The cache can be saved to
+  and loaded from a JSON file, to reuse it across runs; expiration times are
+  therefore in wall clock time (seconds since the epoch).
+  """
+
+  def __init__(self,
+               ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+               clock: Callable[[], float] = time.time):
+    """Initializes an empty cache.
+
+    Args:
+      ttl_seconds: Number of seconds after which entries expire.
+      clock: Function that returns the current time in seconds since the
+        epoch (for testing).
+    """
+    self._ttl_seconds = ttl_seconds
+    self._clock = clock
+    self._lock = threading.Lock()
+    # Cache key -> (expiration time, alert without mutable fields).
+    self._entries: Dict[str, tuple[float, Mapping[str, Any]]] = {}
+
+  @staticmethod
+  def key(proj_id: str,
+          proj_instance: str,
+          proj_region: str,
+          alert_id: str,
+          include_detections: bool = False) -> str:
+    """Returns the cache key of an alert.
+
+    Keys include the instance, so one cache can be used with many instances.
+    Alerts with and without detections are different responses.
+    """
+    # pylint: disable-next=line-too-long
+    parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
+    key = f"{parent}/alerts/{alert_id}"
+    return f"{key}+detections" if include_detections else key
+
+  def get(self, key: str) -> Mapping[str, Any] | None:
+    """Returns the cached alert, or None if it's missing or has expired."""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        return None
+      if entry[0] <= self._clock():
+        del self._entries[key]
+        return None
+      return entry[1]
+
+  def put(self, key: str, alert: Mapping[str, Any]):
+    """Caches the immutable fields of an alert."""
+    with self._lock:
+      self._entries[key] = (self._clock() + self._ttl_seconds,
+                            immutable_fields(alert))
+
+  def __len__(self) -> int:
+    with self._lock:
+      return len(self._entries)
+
+  def load(self, cache_file: str):
+    """Loads the unexpired entries of a cache file, if it exists."""
+    if not os.path.exists(cache_file):
+      return
+    with open(cache_file) as fh:
+      entries = json.load(fh)
+    now = self._clock()
+    with self._lock:
+      for key, (expiration, alert) in entries.items():
+        if expiration > now:
+          self._entries[key] = (expiration, alert)
+
+  def save(self, cache_file: str):
+    """Saves the unexpired entries to a cache file, replacing it atomically."""
+    now = self._clock()
+    with self._lock:
+      entries = {k: e for k, e in self._entries.items() if e[0] > now}
+    tmp_file = f"{cache_file}.tmp"
+    with open(tmp_file, "w") as fh:
+      json.dump(entries, fh, separators=(",", ":"))
+    os.replace(tmp_file, cache_file)
+
+
+def bulk_get_alerts(
+    http_session: requests.AuthorizedSession,
+    proj_id: str,
+    proj_instance: str,
+    proj_region: str,
+    alert_ids: Iterable[str],
+    include_detections: bool = False,
+    cache: AlertCache | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    qps: float = DEFAULT_QPS,
+    ordered: bool = True,
+    immutable_fields_only: bool = False,
+) -> Iterator[Dict[str, Any]]:
+  """Gets many Alerts concurrently, fetching each one at most once.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    proj_id: GCP project id or number to which the target instance belongs.
+    proj_instance: Customer ID (uuid with dashes) for the Chronicle instance.
+    proj_region: region in which the target project is located.
+    alert_ids: Identifiers of the alerts to get (duplicates are ignored).
+    include_detections: Flag to include detections.
+    cache: Optional cache of alerts, to which fetched alerts are added.
+    max_workers: Maximum number of alerts to fetch at the same time.
+    qps: Maximum number of API calls per second.
+    ordered: Whether to yield results in the order of alert_ids, or as soon as
+      each alert is fetched (cached alerts first).
+    immutable_fields_only: Whether to omit MUTABLE_FIELDS from all the alerts,
+      which lets alerts found in the cache be returned without fetching them.
+
+  Yields:
+    A result for each unique alert ID, with its "alert_id", and either the
+    "alert" (and "cached": True if it came from the cache) or the "error" if
+    it failed after retries.
+  """
+  unique_ids = list(
+      dict.fromkeys(a.strip() for a in alert_ids if a.strip()))
+  limiter = rate_limiter.RateLimiter(qps)
+
+  def key_of(alert_id: str) -> str:
+    return AlertCache.key(proj_id, proj_instance, proj_region, alert_id,
+                          include_detections)
+
+  def fetch(alert_id: str) -> Mapping[str, Any]:
+    def call():
+      limiter.acquire()
+      return get_alert.get_alert(http_session, proj_id, proj_instance,
+                                 proj_region, alert_id, include_detections)
+    alert = retry.call_with_retry(call)
+    if cache is not None:
+      cache.put(key_of(alert_id), alert)
+    return immutable_fields(alert) if immutable_fields_only else alert
+
+  def result_of(alert_id: str,
+                future: concurrent.futures.Future) -> Dict[str, Any]:
+    try:
+      return {"alert_id": alert_id, "alert": future.result()}
+    except requests.requests.exceptions.RequestException as e:
+      return {"alert_id": alert_id, "error": str(e)}
+
+  cached = {}
+  if cache is not None and immutable_fields_only:
+    for alert_id in unique_ids:
+      alert = cache.get(key_of(alert_id))
+      if alert is not None:
+        cached[alert_id] = {"alert_id": alert_id, "alert": alert,
+                            "cached": True}
+
+  with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+    futures = {
+        a: executor.submit(fetch, a) for a in unique_ids if a not in cached
+    }
+    if ordered:
+      for alert_id in unique_ids:
+        if alert_id in cached:
+          yield cached[alert_id]
+        else:
+          yield result_of(alert_id, futures[alert_id])
+    else:
+      yield from cached.values()
+      ids_by_future = {f: a for a, f in futures.items()}
+      for future in concurrent.futures.as_completed(ids_by_future):
+        yield result_of(ids_by_future[future], future)
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  project_instance.add_argument_project_instance(parser)
+  project_id.add_argument_project_id(parser)
+  regions.add_argument_region(parser)
+  parser.add_argument(
+      "--alert_ids_file", type=str, required=True,
+      help="File with one alert ID per line."
+  )
+  parser.add_argument(
+      "-d", "--include-detections", action="store_true",
+      help="Flag to include detections."
+  )
+  parser.add_argument(
+      "--cache_file", type=str, required=False, default=None,
+      help="File to cache the immutable fields of alerts in, across runs."
+  )
+  parser.add_argument(
+      "--cache_ttl_seconds", type=float, required=False,
+      default=DEFAULT_CACHE_TTL_SECONDS,
+      help=("Number of seconds for which cached alerts are reused "
+            f"({DEFAULT_CACHE_TTL_SECONDS}).")
+  )
+  parser.add_argument(
+      "--max_workers", type=int, required=False, default=DEFAULT_MAX_WORKERS,
+      help=f"Maximum number of concurrent requests ({DEFAULT_MAX_WORKERS})."
+  )
+  parser.add_argument(
+      "--qps", type=float, required=False, default=DEFAULT_QPS,
+      help=f"Maximum number of requests per second ({DEFAULT_QPS})."
+  )
+  parser.add_argument(
+      "--immutable_fields_only", action="store_true",
+      help=("Omit mutable fields (e.g. the feedback) from all the alerts, and "
+            "reuse the alerts in --cache_file instead of fetching them.")
+  )
+  parser.add_argument(
+      "--as_completed", action="store_true",
+      help="Print alerts as soon as they're fetched, not in input order."
+  )
+  args = parser.parse_args()
+
+  auth_session = chronicle_auth.initialize_http_session(
+      args.credentials_file,
+      SCOPES,
+  )
+  alert_cache = None
+  if args.cache_file:
+    alert_cache = AlertCache(args.cache_ttl_seconds)
+    alert_cache.load(args.cache_file)
+  counts = {"fetched": 0, "cached": 0, "failed": 0}
+  start = time.monotonic()
+  try:
+    with open(args.alert_ids_file) as fh:
+      for result in bulk_get_alerts(
+          auth_session,
+          args.project_id,
+          args.project_instance,
+          args.region,
+          fh,
+          args.include_detections,
+          alert_cache,
+          args.max_workers,
+          args.qps,
+          not args.as_completed,
+          args.immutable_fields_only,
+      ):
+        if "error" in result:
+          counts["failed"] += 1
+        elif result.get("cached"):
+          counts["cached"] += 1
+        else:
+          counts["fetched"] += 1
+        print(json.dumps(result, separators=(",", ":")))
+  finally:
+    # Alerts fetched before an interruption are still worth reusing.
+    if alert_cache is not None:
+      alert_cache.save(args.cache_file)
+  counts["seconds"] = round(time.monotonic() - start, 3)
+  print(json.dumps(counts), file=sys.stderr)
@@ -0,0 +1,195 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "bulk_get_alerts" module."""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from google.auth.transport import requests
+
+from . import bulk_get_alerts
+
+FEEDBACK = {"status": "OPEN"}
+
+
+def _alert(alert_id):
+  return {"id": alert_id, "feedbackSummary": FEEDBACK}
+
+
+class AlertCacheTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.now = 1000.0
+    self.cache = bulk_get_alerts.AlertCache(60, lambda: self.now)
+    self.key = bulk_get_alerts.AlertCache.key("p", "i", "us", "de_1")
+
+  def test_ttl(self):
+    self.cache.put(self.key, _alert("de_1"))
+    self.now += 59
+    self.assertEqual(self.cache.get(self.key), {"id": "de_1"})
+    self.now += 1
+    self.assertIsNone(self.cache.get(self.key))
+    self.assertEqual(len(self.cache), 0)
+
+  def test_mutable_fields_are_never_cached(self):
+    alert = {"id": "de_1", "caseName": "c", "feedbackHistory": [FEEDBACK]}
+    alert.update(_alert("de_1"))
+    self.cache.put(self.key, alert)
+    self.assertEqual(self.cache.get(self.key), {"id": "de_1"})
+
+  def test_keys_per_instance(self):
+    keys = {
+        bulk_get_alerts.AlertCache.key("p", "i", "us", "de_1"),
+        bulk_get_alerts.AlertCache.key("p", "i2", "us", "de_1"),
+        bulk_get_alerts.AlertCache.key("p2", "i", "us", "de_1"),
+        bulk_get_alerts.AlertCache.key("p", "i", "europe", "de_1"),
+        bulk_get_alerts.AlertCache.key("p", "i", "us", "de_1", True),
+    }
+    self.assertEqual(len(keys), 5)
+    self.cache.put(self.key, _alert("de_1"))
+    self.assertIsNone(
+        self.cache.get(bulk_get_alerts.AlertCache.key("p", "i2", "us",
+                                                      "de_1")))
+
+  def test_save_and_load(self):
+    other_key = bulk_get_alerts.AlertCache.key("p", "i", "us", "de_2")
+    self.cache.put(self.key, _alert("de_1"))
+    self.now += 30
+    self.cache.put(other_key, _alert("de_2"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      cache_file = os.path.join(tmp_dir, "cache.json")
+      self.cache.save(cache_file)
+      self.assertFalse(os.path.exists(f"{cache_file}.tmp"))
+
+      # Entries keep their expiration times across runs.
+      self.now += 40
+      loaded = bulk_get_alerts.AlertCache(60, lambda: self.now)
+      loaded.load(cache_file)
+      self.assertEqual(len(loaded), 1)
+      self.assertIsNone(loaded.get(self.key))
+      self.assertEqual(loaded.get(other_key), {"id": "de_2"})
+
+  def test_load_missing_file(self):
+    self.cache.load("/nonexistent/cache.json")
+    self.assertEqual(len(self.cache), 0)
+
+
+class BulkGetAlertsTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.lock = threading.Lock()
+    self.fetched = []
+    patcher = mock.patch.object(bulk_get_alerts.get_alert, "get_alert",
+                                side_effect=self.fake_get_alert)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+    self.waits = {}  # Alert ID -> event to wait for before returning it.
+    self.fetch_events = {}  # Alert ID -> event to set once it's fetched.
+    self.errors = {}  # Alert ID -> error to raise.
+
+  def fake_get_alert(self, http_session, proj_id, proj_instance, proj_region,
+                     alert_id, include_detections):
+    del http_session, proj_id, proj_instance, proj_region  # Unused.
+    del include_detections  # Unused.
+    if alert_id in self.waits:
+      self.assertTrue(self.waits[alert_id].wait(timeout=5))
+    with self.lock:
+      self.fetched.append(alert_id)
+    if alert_id in self.fetch_events:
+      self.fetch_events[alert_id].set()
+    if alert_id in self.errors:
+      raise self.errors[alert_id]
+    return _alert(alert_id)
+
+  def bulk_get(self, alert_ids, **kwargs):
+    return bulk_get_alerts.bulk_get_alerts(None, "p", "i", "us", alert_ids,
+                                           qps=1000, **kwargs)
+
+  def test_duplicates_are_fetched_once(self):
+    results = list(self.bulk_get(["de_1\n", "de_2", " de_1 ", "\n"]))
+    self.assertCountEqual(self.fetched, ["de_1", "de_2"])
+    self.assertEqual(results, [
+        {"alert_id": "de_1", "alert": _alert("de_1")},
+        {"alert_id": "de_2", "alert": _alert("de_2")},
+    ])
+
+  def test_ordered(self):
+    # de_2 is fetched first, but de_1 is still yielded first.
+    fetched_2 = threading.Event()
+    self.waits = {"de_1": fetched_2}
+    self.fetch_events = {"de_2": fetched_2}
+    results = list(self.bulk_get(["de_1", "de_2"], max_workers=2))
+    self.assertEqual([r["alert_id"] for r in results], ["de_1", "de_2"])
+    self.assertEqual(self.fetched, ["de_2", "de_1"])
+
+  def test_as_completed(self):
+    # de_1 is fetched only after de_2 is yielded.
+    release_1 = threading.Event()
+    self.waits = {"de_1": release_1}
+    results = self.bulk_get(["de_1", "de_2"], max_workers=2, ordered=False)
+    self.assertEqual(next(results)["alert_id"], "de_2")
+    release_1.set()
+    self.assertEqual(next(results)["alert_id"], "de_1")
+    self.assertEqual(list(results), [])
+
+  def test_errors(self):
+    response = requests.requests.Response()
+    response.status_code = 404
+    self.errors = {
+        "de_1": requests.requests.exceptions.HTTPError(response=response)
+    }
+    results = list(self.bulk_get(["de_1", "de_2"]))
+    self.assertEqual(results[0]["alert_id"], "de_1")
+    self.assertIn("error", results[0])
+    self.assertNotIn("alert", results[0])
+    self.assertEqual(results[1]["alert"], _alert("de_2"))
+
+  def test_cache_is_only_filled_by_default(self):
+    cache = bulk_get_alerts.AlertCache()
+    cache.put(bulk_get_alerts.AlertCache.key("p", "i", "us", "de_1"),
+              _alert("de_1"))
+
+    results = list(self.bulk_get(["de_1", "de_2"], cache=cache))
+
+    # All the alerts are fetched, with their mutable fields.
+    self.assertCountEqual(self.fetched, ["de_1", "de_2"])
+    self.assertEqual([r["alert"] for r in results],
+                     [_alert("de_1"), _alert("de_2")])
+    self.assertEqual(len(cache), 2)
+
+  def test_cache_with_immutable_fields_only(self):
+    cache = bulk_get_alerts.AlertCache()
+    cache.put(bulk_get_alerts.AlertCache.key("p", "i", "us", "de_1"),
+              _alert("de_1"))
+
+    results = list(
+        self.bulk_get(["de_2", "de_1"], cache=cache, ordered=False,
+                      immutable_fields_only=True))
+
+    self.assertEqual(self.fetched, ["de_2"])
+    # Cached alerts are yielded first, and no result has mutable fields.
+    self.assertEqual(results, [
+        {"alert_id": "de_1", "alert": {"id": "de_1"}, "cached": True},
+        {"alert_id": "de_2", "alert": {"id": "de_2"}},
+    ])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -22,11 +22,24 @@ The file provided to the --alert_ids_file parameter should have one alert
 de_ad9d2771-a567-49ee-6452-1b2db13c1d33
 de_3c2e2556-aba1-a253-7518-b4ddb666cc32
 ```
+Alerts are updated concurrently, under a rate limit, with retries of transient
+errors. One compact JSON result per alert is printed, followed by a summary (on
+STDERR). With --checkpoint_file, the IDs of updated alerts are recorded, and
+are skipped if the command is run again (e.g. after a crash). With
+--skip_unchanged, each alert is fetched first (see get_alert), and is updated
+only if its current priority, status or verdict differs from the requested one
+(see update_alert.feedback_changes); the summary reports how many writes were
+avoided.
+
 Usage:
   python -m alerts.v1alpha.bulk_update_alerts \
     --project_id=<PROJECT_ID>   \
     --project_instance=<PROJECT_INSTANCE> \
     --alert_ids_file=<PATH_TO_FILE> \
+    --checkpoint_file=<PATH_TO_FILE> \
+    --max_workers=<MAX_WORKERS> \
+    --qps=<QPS> \
+    --skip_unchanged \
     --confidence_score=<CONFIDENCE_SCORE> \
     --priority=<PRIORITY> \
     --reason=<REASON> \
@@ -53,12 +66,21 @@ API reference:
 """
 # pylint: enable=line-too-long
 
+import concurrent.futures
 import json
+import os
+import sys
+import time
+from typing import Any, Iterable, Mapping, TextIO
 
 from common import chronicle_auth
+from common import rate_limiter
+from common import retry
 
+from . import get_alert
 from . import update_alert
 
+from google.auth.transport import requests
 
 CHRONICLE_API_BASE_URL = "https://chronicle.googleapis.com"
 SCOPES = [
@@ -72,6 +94,138 @@ DEFAULT_FEEDBACK = {
     "status": "CLOSED",
     "verdict": "VERDICT_UNSPECIFIED",
 }
+# Keyword arguments of update_alert.update_alert that hold feedback fields.
+FEEDBACK_ARGS = (
+    "confidence_score",
+    "reason",
+    "reputation",
+    "priority",
+    "status",
+    "verdict",
+    "risk_score",
+    "disregarded",
+    "severity",
+    "comment",
+    "root_cause",
+)
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_QPS = 5.0
+
+# Per-alert result statuses.
+UPDATED = "UPDATED"
+UNCHANGED = "UNCHANGED"  # The alert already had the requested feedback.
+FAILED = "FAILED"
+
+
+def load_checkpoint(checkpoint_file: str) -> set[str]:
+  """Loads the IDs of alerts that were already updated, if any."""
+  if not os.path.exists(checkpoint_file):
+    return set()
+  with open(checkpoint_file) as fh:
+    return {line.strip() for line in fh if line.strip()}
+
+
+def bulk_update_alerts(
+    http_session: requests.AuthorizedSession,
+    proj_id: str,
+    proj_instance: str,
+    proj_region: str,
+    alert_ids: Iterable[str],
+    feedback: Mapping[str, Any],
+    checkpoint_file: str | None = None,
+    output: TextIO | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    qps: float = DEFAULT_QPS,
+    skip_unchanged: bool = False,
+) -> Mapping[str, Any]:
+  """Updates many Alerts concurrently, skipping the ones already updated.
+
+  Each alert is updated with retries of transient errors (HTTP 429 and 5xx).
+  Updated alert IDs are appended to the checkpoint file as soon as they're
+  done, so an interrupted run can be resumed by running it again.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    proj_id: GCP project id or number to which the target instance belongs.
+    proj_instance: Customer ID (uuid with dashes) for the Chronicle instance.
+    proj_region: region in which the target project is located.
+    alert_ids: Identifiers of the alerts to update (duplicates are ignored).
+    feedback: Keyword arguments for update_alert.update_alert (see
+      FEEDBACK_ARGS).
+    checkpoint_file: Optional path of a file with the IDs of alerts that were
+      already updated, one per line.
+    output: Optional text file to write one compact JSON result per alert to.
+    max_workers: Maximum number of alerts to update at the same time.
+    qps: Maximum number of API calls per second.
+    skip_unchanged: Whether to get each alert first, and update it only if
+      update_alert.feedback_changes finds changes.
+
+  Returns:
+    Summary of the run: numbers of alerts "updated", "unchanged" (writes
+    avoided by skip_unchanged), "failed" and "skipped" (already in the
+    checkpoint file), "seconds" and "alerts_per_second".
+  """
+  done = load_checkpoint(checkpoint_file) if checkpoint_file else set()
+  to_update = []
+  skipped = 0
+  for alert_id in dict.fromkeys(a.strip() for a in alert_ids if a.strip()):
+    if alert_id in done:
+      skipped += 1
+    else:
+      to_update.append(alert_id)
+
+  limiter = rate_limiter.RateLimiter(qps)
+  requested_feedback = update_alert.build_feedback(**feedback)
+
+  def call_with_limits(func, *func_args, **func_kwargs):
+    def call():
+      limiter.acquire()
+      return func(*func_args, **func_kwargs)
+    return retry.call_with_retry(call)
+
+  def update(alert_id: str) -> str:
+    if skip_unchanged:
+      alert = call_with_limits(get_alert.get_alert, http_session, proj_id,
+                               proj_instance, proj_region, alert_id)
+      if not update_alert.feedback_changes(alert, requested_feedback):
+        return UNCHANGED
+    call_with_limits(update_alert.update_alert, http_session, proj_id,
+                     proj_instance, proj_region, alert_id, **feedback)
+    return UPDATED
+
+  start = time.monotonic()
+  counts = {UPDATED: 0, UNCHANGED: 0, FAILED: 0}
+  checkpoint = open(checkpoint_file, "a") if checkpoint_file else None
+  try:
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+      futures = {executor.submit(update, a): a for a in to_update}
+      # Results are handled in this thread only, so files need no locking.
+      for future in concurrent.futures.as_completed(futures):
+        alert_id = futures[future]
+        try:
+          result = {"alert_id": alert_id, "status": future.result()}
+          if checkpoint:
+            checkpoint.write(alert_id + "\n")
+            checkpoint.flush()
+        except requests.requests.exceptions.RequestException as e:
+          result = {"alert_id": alert_id, "status": FAILED, "error": str(e)}
+        counts[result["status"]] += 1
+        if output:
+          output.write(json.dumps(result, separators=(",", ":")) + "\n")
+  finally:
+    if checkpoint:
+      checkpoint.close()
+
+  seconds = time.monotonic() - start
+  return {
+      "updated": counts[UPDATED],
+      "unchanged": counts[UNCHANGED],
+      "failed": counts[FAILED],
+      "skipped": skipped,
+      "seconds": round(seconds, 3),
+      "alerts_per_second": (round(sum(counts.values()) / seconds, 3)
+                            if seconds else 0.0),
+  }
 
 
 if __name__ == "__main__":
@@ -80,6 +234,24 @@ if __name__ == "__main__":
       "--alert_ids_file", type=str, required=True,
       help="File with one alert ID per line."
   )
+  parser.add_argument(
+      "--checkpoint_file", type=str, required=False, default=None,
+      help=("File to record updated alert IDs in, so that they are skipped "
+            "when the command is run again.")
+  )
+  parser.add_argument(
+      "--max_workers", type=int, required=False, default=DEFAULT_MAX_WORKERS,
+      help=f"Maximum number of concurrent updates ({DEFAULT_MAX_WORKERS})."
+  )
+  parser.add_argument(
+      "--qps", type=float, required=False, default=DEFAULT_QPS,
+      help=f"Maximum number of updates per second ({DEFAULT_QPS})."
+  )
+  parser.add_argument(
+      "--skip_unchanged", action="store_true",
+      help=("Get each alert first, and update it only if its priority, status "
+            "or verdict would change.")
+  )
   parser.set_defaults(
       comment=DEFAULT_FEEDBACK["comment"],
       reason=DEFAULT_FEEDBACK["reason"],
@@ -98,23 +270,17 @@ if __name__ == "__main__":
       SCOPES,
   )
   with open(args.alert_ids_file) as fh:
-    for alert_id in fh:
-      a_list = update_alert.update_alert(
-          auth_session,
-          args.project_id,
-          args.project_instance,
-          args.region,
-          alert_id.strip(),
-          args.confidence_score,
-          args.reason,
-          args.reputation,
-          args.priority,
-          args.status,
-          args.verdict,
-          args.risk_score,
-          args.disregarded,
-          args.severity,
-          args.comment,
-          args.root_cause,
-      )
-      print(json.dumps(a_list, indent=2))
+    summary = bulk_update_alerts(
+        auth_session,
+        args.project_id,
+        args.project_instance,
+        args.region,
+        fh,
+        {k: getattr(args, k) for k in FEEDBACK_ARGS},
+        args.checkpoint_file,
+        sys.stdout,
+        args.max_workers,
+        args.qps,
+        args.skip_unchanged,
+    )
+  print(json.dumps(summary), file=sys.stderr)
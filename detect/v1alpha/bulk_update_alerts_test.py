@@ -0,0 +1,151 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "bulk_update_alerts" module."""
+
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from common import retry
+from google.auth.transport import requests
+
+from . import bulk_update_alerts
+
+
+def _response(status_code, body=None):
+  response = mock.MagicMock()
+  response.status_code = status_code
+  response.text = ""
+  response.json.return_value = body or {}
+  if status_code >= 400:
+    response.raise_for_status.side_effect = (
+        requests.requests.exceptions.HTTPError(response=response))
+  return response
+
+
+class BulkUpdateAlertsTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.lock = threading.Lock()
+    self.updates = []  # Alert ID of each update request.
+    self.gets = []  # Alert ID of each get request.
+    # Alert ID -> list of status codes to return to update requests.
+    self.status_codes = {}
+    # Alert ID -> feedbackSummary returned by get requests.
+    self.summaries = {}
+    self.session = mock.MagicMock()
+    self.session.request.side_effect = self.fake_request
+    # Retry transient errors right away.
+    patcher = mock.patch.object(retry.random, "uniform", return_value=0)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(self.tmp_dir.cleanup)
+    self.checkpoint_file = os.path.join(self.tmp_dir.name, "checkpoint")
+
+  def fake_request(self, method, url, **kwargs):
+    del url  # Unused.
+    with self.lock:
+      if method == "GET":
+        alert_id = kwargs["params"]["alertId"]
+        self.gets.append(alert_id)
+        return _response(
+            200, {"id": alert_id,
+                  "feedbackSummary": self.summaries.get(alert_id, {})})
+      alert_id = kwargs["json"]["alert_id"]
+      self.updates.append(alert_id)
+      codes = self.status_codes.get(alert_id, [])
+      return _response(codes.pop(0) if codes else 200)
+
+  def run_bulk_update(self, alert_ids, **kwargs):
+    output = io.StringIO()
+    summary = bulk_update_alerts.bulk_update_alerts(
+        self.session, "p", "i", "us", alert_ids, {"status": "CLOSED"},
+        checkpoint_file=self.checkpoint_file, output=output, max_workers=3,
+        qps=1000, **kwargs)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    return summary, {r["alert_id"]: r for r in results}
+
+  def test_resume_from_partial_checkpoint(self):
+    with open(self.checkpoint_file, "w") as fh:
+      fh.write("de_1\nde_2\n")
+
+    summary, results = self.run_bulk_update(
+        ["de_1\n", "de_2\n", "de_3\n", "de_4\n", "de_3\n", "\n"])
+
+    self.assertCountEqual(self.updates, ["de_3", "de_4"])
+    self.assertEqual(summary["updated"], 2)
+    self.assertEqual(summary["skipped"], 2)
+    self.assertEqual(summary["failed"], 0)
+    self.assertEqual(results, {
+        "de_3": {"alert_id": "de_3", "status": "UPDATED"},
+        "de_4": {"alert_id": "de_4", "status": "UPDATED"},
+    })
+    self.assertEqual(bulk_update_alerts.load_checkpoint(self.checkpoint_file),
+                     {"de_1", "de_2", "de_3", "de_4"})
+
+    # Running again skips all of them.
+    self.updates = []
+    summary, results = self.run_bulk_update(["de_1", "de_3", "de_4"])
+    self.assertEqual(self.updates, [])
+    self.assertEqual(summary["skipped"], 3)
+    self.assertEqual(results, {})
+
+  def test_failures_after_retries(self):
+    self.status_codes = {
+        "de_1": [503, 429],  # Succeeds on the third attempt.
+        "de_2": [503] * retry.DEFAULT_MAX_ATTEMPTS,  # Fails after retries.
+        "de_3": [400],  # Fails without retries.
+    }
+
+    summary, results = self.run_bulk_update(["de_1", "de_2", "de_3", "de_4"])
+
+    self.assertEqual(self.updates.count("de_1"), 3)
+    self.assertEqual(self.updates.count("de_2"), retry.DEFAULT_MAX_ATTEMPTS)
+    self.assertEqual(self.updates.count("de_3"), 1)
+    self.assertEqual(summary["updated"], 2)
+    self.assertEqual(summary["failed"], 2)
+    self.assertEqual(results["de_1"]["status"], "UPDATED")
+    self.assertEqual(results["de_2"]["status"], "FAILED")
+    self.assertIn("error", results["de_2"])
+    self.assertEqual(results["de_3"]["status"], "FAILED")
+    # Only successful updates are checkpointed, so failures are retried when
+    # the command is run again.
+    self.assertEqual(bulk_update_alerts.load_checkpoint(self.checkpoint_file),
+                     {"de_1", "de_4"})
+
+  def test_skip_unchanged(self):
+    self.summaries = {"de_1": {"status": "CLOSED"}, "de_2": {"status": "OPEN"}}
+
+    summary, results = self.run_bulk_update(["de_1", "de_2"],
+                                            skip_unchanged=True)
+
+    self.assertCountEqual(self.gets, ["de_1", "de_2"])
+    self.assertEqual(self.updates, ["de_2"])
+    self.assertEqual(summary["unchanged"], 1)
+    self.assertEqual(summary["updated"], 1)
+    self.assertEqual(results["de_1"]["status"], "UNCHANGED")
+    # Unchanged alerts are checkpointed too.
+    self.assertEqual(bulk_update_alerts.load_checkpoint(self.checkpoint_file),
+                     {"de_1", "de_2"})
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+r"""Executable and reusable client for the v1alpha samples.
+
+A ChronicleV1Alpha object binds an authorized session to one Chronicle
+instance (project, region and instance ID), so library callers don't need to
+pass them to every call. Its methods call the single-purpose v1alpha modules.
+
+The client holds no mutable state, so one client can be used from many threads
+at the same time, and clients for different instances (or regions) can be
+used side by side in the same process.
+
+Sample Commands (run from api_samples_python dir):
+    python3 -m detect.v1alpha.client -r=<region> -p=<project_id> \
+        -i=<instance_id>
+"""
+import argparse
+import datetime
+import json
+from typing import Any, Iterable, Iterator, Mapping, Sequence, Tuple
+from common import chronicle_auth
+from common import project_id
+from common import project_instance
+from common import regions
+from google.auth.transport import requests
+
+from . import batch_update_curated_rule_set_deployments
+from . import bulk_get_alerts
+from . import create_retrohunt
+from . import create_rule
+from . import delete_rule
+from . import enable_rule
+from . import get_alert
+from . import get_retrohunt
+from . import get_rule
+from . import list_detections
+from . import list_errors
+from . import list_rules
+from . import operation_poller
+from . import search_rules_alerts
+from . import sync_rules
+from . import update_alert
+from . import update_rule
+
+SCOPES = [
+    "https://www.googleapis.com/auth/cloud-platform",
+]
+
+
+class ChronicleV1Alpha:
+  """Client for the v1alpha API of one Chronicle instance."""
+
+  def __init__(
+      self,
+      http_session: requests.AuthorizedSession,
+      proj_region: str,
+      proj_id: str,
+      proj_instance: str,
+  ):
+    """Initializes the client.
+
+    Args:
+      http_session: Authorized session for HTTP requests.
+      proj_region: region in which the target project is located
+      proj_id: GCP project id or number which the target instance belongs to
+      proj_instance: uuid of the instance (with dashes)
+    """
+    self._http_session = http_session
+    self._region = proj_region
+    self._project = proj_id
+    self._instance = proj_instance
+
+  @property
+  def region(self) -> str:
+    return self._region
+
+  def __repr__(self) -> str:
+    return (f"ChronicleV1Alpha(region={self._region!r}, "
+            f"project={self._project!r}, instance={self._instance!r})")
+
+  # Rules.
+
+  def list_rules(self, view: str | None = None) -> Mapping[str, Any]:
+    """See list_rules.list_rules."""
+    return list_rules.list_rules(self._http_session, self._project,
+                                 self._instance, self._region, view)
+
+  def list_all_rules(self,
+                     view: str | None = None) -> Sequence[Mapping[str, Any]]:
+    """See list_rules.list_all_rules."""
+    return list_rules.list_all_rules(self._http_session, self._project,
+                                     self._instance, self._region, view)
+
+  def get_rule(self, rule_id: str) -> Mapping[str, Any]:
+    """See get_rule.get_rule."""
+    return get_rule.get_rule(self._http_session, self._region, self._project,
+                             self._instance, rule_id)
+
+  def create_rule(self, rule_file_path: str) -> Mapping[str, Any]:
+    """See create_rule.create_rule."""
+    return create_rule.create_rule(self._http_session, self._project,
+                                   self._instance, self._region,
+                                   rule_file_path)
+
+  def update_rule(self, rule_id: str,
+                  rule_file_path: str) -> Mapping[str, Any]:
+    """See update_rule.update_rule."""
+    return update_rule.update_rule(self._http_session, self._region,
+                                   self._project, self._instance, rule_id,
+                                   rule_file_path)
+
+  def delete_rule(self, rule_id: str) -> Mapping[str, Any]:
+    """See delete_rule.delete_rule."""
+    return delete_rule.delete_rule(self._http_session, self._region,
+                                   self._project, self._instance, rule_id)
+
+  def enable_rule(self, rule_id: str,
+                  enabled: bool = True) -> Mapping[str, Any]:
+    """See enable_rule.enable_rule."""
+    return enable_rule.enable_rule(self._http_session, self._region,
+                                   self._project, self._instance, rule_id,
+                                   enabled)
+
+  def sync_rules(self, rules_dir: str,
+                 **kwargs) -> Sequence[Mapping[str, Any]]:
+    """See sync_rules.sync_rules."""
+    return sync_rules.sync_rules(self._http_session, self._project,
+                                 self._instance, self._region, rules_dir,
+                                 **kwargs)
+
+  def list_errors(self, rule_id: str) -> Mapping[str, Any]:
+    """See list_errors.list_errors."""
+    return list_errors.list_errors(self._http_session, self._region,
+                                   self._project, self._instance, rule_id)
+
+  def list_errors_for_rules(
+      self, rule_ids: Sequence[str],
+      **kwargs) -> Mapping[str, Sequence[Mapping[str, Any]]]:
+    """See list_errors.list_errors_for_rules."""
+    return list_errors.list_errors_for_rules(self._http_session, self._region,
+                                             self._project, self._instance,
+                                             rule_ids, **kwargs)
+
+  # Detections and alerts.
+
+  def list_detections(
+      self,
+      rule_id: str,
+      alert_state: str | None = None,
+      page_size: int | None = None,
+      page_token: str | None = None,
+  ) -> Mapping[str, Any]:
+    """See list_detections.list_detections."""
+    return list_detections.list_detections(self._http_session, self._region,
+                                           self._project, self._instance,
+                                           rule_id, alert_state, page_size,
+                                           page_token)
+
+  def search_rules_alerts(
+      self,
+      start_time: str,
+      end_time: str,
+      rule_status: str | None = None,
+      page_size: int | None = None,
+  ) -> Mapping[str, Any]:
+    """See search_rules_alerts.search_rules_alerts."""
+    return search_rules_alerts.search_rules_alerts(self._http_session,
+                                                   self._region, self._project,
+                                                   self._instance, start_time,
+                                                   end_time, rule_status,
+                                                   page_size)
+
+  def iter_all_rules_alerts(
+      self,
+      start_time: datetime.datetime,
+      end_time: datetime.datetime,
+      rule_status: str | None = None,
+      **kwargs,
+  ) -> Iterator[Tuple[Mapping[str, Any], Mapping[str, Any]]]:
+    """See search_rules_alerts.iter_all_rules_alerts."""
+    return search_rules_alerts.iter_all_rules_alerts(self._http_session,
+                                                     self._region,
+                                                     self._project,
+                                                     self._instance,
+                                                     start_time, end_time,
+                                                     rule_status, **kwargs)
+
+  def get_alert(self,
+                alert_id: str,
+                include_detections: bool = False) -> Mapping[str, Any]:
+    """See get_alert.get_alert."""
+    return get_alert.get_alert(self._http_session, self._project,
+                               self._instance, self._region, alert_id,
+                               include_detections)
+
+  def bulk_get_alerts(self, alert_ids: Iterable[str],
+                      **kwargs) -> Iterator[Mapping[str, Any]]:
+    """See bulk_get_alerts.bulk_get_alerts."""
+    return bulk_get_alerts.bulk_get_alerts(self._http_session, self._project,
+                                           self._instance, self._region,
+                                           alert_ids, **kwargs)
+
+  def update_alert(self, alert_id: str, **feedback) -> Mapping[str, Any]:
+    """See update_alert.update_alert (feedback fields are keyword arguments)."""
+    return update_alert.update_alert(self._http_session, self._project,
+                                     self._instance, self._region, alert_id,
+                                     **feedback)
+
+  # Retrohunts and operations.
+
+  def create_retrohunt(self, rule_id: str, start_time: datetime.datetime,
+                       end_time: datetime.datetime) -> Mapping[str, Any]:
+    """See create_retrohunt.create_retrohunt."""
+    return create_retrohunt.create_retrohunt(self._http_session, self._region,
+                                             self._project, self._instance,
+                                             rule_id, start_time, end_time)
+
+  def get_retrohunt(self, rule_id: str, op_id: str) -> Mapping[str, Any]:
+    """See get_retrohunt.get_retrohunt."""
+    return get_retrohunt.get_retrohunt(self._http_session, self._region,
+                                       self._project, self._instance, rule_id,
+                                       op_id)
+
+  def get_operation(self, operation_name: str) -> Mapping[str, Any]:
+    """See operation_poller.get_operation."""
+    return operation_poller.get_operation(self._http_session, self._region,
+                                          operation_name)
+
+  def operation_poller(self, **kwargs) -> operation_poller.OperationPoller:
+    """Returns a new OperationPoller (see its arguments) for this region."""
+    return operation_poller.OperationPoller(self._http_session, self._region,
+                                            **kwargs)
+
+  # Curated detections.
+
+  def batch_update_curated_rule_set_deployments(
+      self,
+      update_requests: Sequence[Mapping[str, Any]] | None = None,
+  ) -> Mapping[str, Any]:
+    """See batch_update_curated_rule_set_deployments."""
+    module = batch_update_curated_rule_set_deployments
+    return module.batch_update_curated_rule_set_deployments(
+        self._http_session, self._region, self._project, self._instance,
+        update_requests)
+
+  def apply_curated_rule_set_deployments_manifest(
+      self, manifest: Sequence[Mapping[str, Any]], **kwargs
+  ) -> Sequence[Mapping[str, Any]]:
+    """See batch_update_curated_rule_set_deployments.apply_manifest."""
+    module = batch_update_curated_rule_set_deployments
+    return module.apply_manifest(self._http_session, self._region,
+                                 self._project, self._instance, manifest,
+                                 **kwargs)
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  regions.add_argument_region(parser)
+  project_instance.add_argument_project_instance(parser)
+  project_id.add_argument_project_id(parser)
+  args = parser.parse_args()
+  auth_session = chronicle_auth.initialize_http_session(
+      args.credentials_file,
+      SCOPES
+  )
+  client = ChronicleV1Alpha(auth_session, args.region, args.project_id,
+                            args.project_instance)
+  print(json.dumps(client.list_rules(), indent=2))
@@ -0,0 +1,157 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "client" module."""
+
+import datetime
+import inspect
+import unittest
+from unittest import mock
+
+from . import batch_update_curated_rule_set_deployments
+from . import bulk_get_alerts
+from . import client
+from . import create_retrohunt
+from . import create_rule
+from . import delete_rule
+from . import enable_rule
+from . import get_alert
+from . import get_retrohunt
+from . import get_rule
+from . import list_detections
+from . import list_errors
+from . import list_rules
+from . import operation_poller
+from . import search_rules_alerts
+from . import sync_rules
+from . import update_alert
+from . import update_rule
+
+SESSION = object()
+REGION = "the-region"
+PROJECT = "the-project"
+INSTANCE = "the-instance"
+START = datetime.datetime(2024, 11, 1, tzinfo=datetime.timezone.utc)
+END = datetime.datetime(2024, 11, 2, tzinfo=datetime.timezone.utc)
+
+# (Client method, its arguments, module, module function, and the expected
+# arguments of the module function, besides the session and the instance).
+DELEGATIONS = (
+    ("list_rules", ("FULL",), {}, list_rules, "list_rules",
+     {"view": "FULL"}),
+    ("list_all_rules", ("BASIC",), {}, list_rules, "list_all_rules",
+     {"view": "BASIC"}),
+    ("get_rule", ("ru_1",), {}, get_rule, "get_rule", {"rule_id": "ru_1"}),
+    ("create_rule", ("r.yaral",), {}, create_rule, "create_rule",
+     {"rule_file_path": "r.yaral"}),
+    ("update_rule", ("ru_1", "r.yaral"), {}, update_rule, "update_rule",
+     {"rule_id": "ru_1", "rule_file_path": "r.yaral"}),
+    ("delete_rule", ("ru_1",), {}, delete_rule, "delete_rule",
+     {"rule_id": "ru_1"}),
+    ("enable_rule", ("ru_1", False), {}, enable_rule, "enable_rule",
+     {"rule_id": "ru_1", "enabled": False}),
+    ("sync_rules", ("dir",), {"dry_run": True}, sync_rules, "sync_rules",
+     {"rules_dir": "dir", "dry_run": True}),
+    ("list_errors", ("ru_1",), {}, list_errors, "list_errors",
+     {"rule_id": "ru_1"}),
+    ("list_errors_for_rules", (["ru_1"],), {"max_concurrency": 2},
+     list_errors, "list_errors_for_rules",
+     {"rule_ids": ["ru_1"], "max_concurrency": 2}),
+    ("list_detections", ("ru_1", "ALERTING", 10, "t"), {}, list_detections,
+     "list_detections",
+     {"rule_id": "ru_1", "alert_state": "ALERTING", "page_size": 10,
+      "page_token": "t"}),
+    ("search_rules_alerts", ("s", "e", "ALL", 10), {}, search_rules_alerts,
+     "search_rules_alerts",
+     {"start_time": "s", "end_time": "e", "rule_status": "ALL",
+      "page_size": 10}),
+    ("iter_all_rules_alerts", (START, END, "ALL"), {"max_alerts": 5},
+     search_rules_alerts, "iter_all_rules_alerts",
+     {"start_time": START, "end_time": END, "rule_status": "ALL",
+      "max_alerts": 5}),
+    ("get_alert", ("de_1", True), {}, get_alert, "get_alert",
+     {"alert_id": "de_1", "include_detections": True}),
+    ("bulk_get_alerts", (["de_1"],), {"ordered": False}, bulk_get_alerts,
+     "bulk_get_alerts", {"alert_ids": ["de_1"], "ordered": False}),
+    ("update_alert", ("de_1",), {"status": "CLOSED"}, update_alert,
+     "update_alert", {"alert_id": "de_1", "status": "CLOSED"}),
+    ("create_retrohunt", ("ru_1", START, END), {}, create_retrohunt,
+     "create_retrohunt",
+     {"rule_id": "ru_1", "start_time": START, "end_time": END}),
+    ("get_retrohunt", ("ru_1", "oh_1"), {}, get_retrohunt, "get_retrohunt",
+     {"rule_id": "ru_1", "op_id": "oh_1"}),
+    ("batch_update_curated_rule_set_deployments", ([{"x": 1}],), {},
+     batch_update_curated_rule_set_deployments,
+     "batch_update_curated_rule_set_deployments",
+     {"update_requests": [{"x": 1}]}),
+    ("apply_curated_rule_set_deployments_manifest", ([{"x": 1}],),
+     {"dry_run": True}, batch_update_curated_rule_set_deployments,
+     "apply_manifest", {"manifest": [{"x": 1}], "dry_run": True}),
+)
+
+
+class ChronicleV1AlphaTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.client = client.ChronicleV1Alpha(SESSION, REGION, PROJECT, INSTANCE)
+
+  def bound_arguments(self, func, call):
+    """Returns the arguments of a call by parameter name."""
+    bound = inspect.signature(func).bind(*call.args, **call.kwargs)
+    return dict(bound.arguments)
+
+  def test_delegation(self):
+    for (method, args, kwargs, module, func_name,
+         expected) in DELEGATIONS:
+      with self.subTest(method):
+        func = getattr(module, func_name)
+        with mock.patch.object(module, func_name, autospec=True) as mocked:
+          result = getattr(self.client, method)(*args, **kwargs)
+        self.assertIs(result, mocked.return_value)
+        arguments = self.bound_arguments(func, mocked.call_args)
+        # Keyword arguments that are passed through are collected in a
+        # parameter of their own, if the function has one.
+        arguments.update(arguments.pop("kwargs", {}))
+        self.assertEqual(
+            arguments, {
+                "http_session": SESSION,
+                "proj_region": REGION,
+                "proj_id": PROJECT,
+                "proj_instance": INSTANCE,
+                **expected,
+            })
+
+  def test_operations(self):
+    with mock.patch.object(operation_poller, "get_operation",
+                           autospec=True) as mocked:
+      self.client.get_operation("op")
+    mocked.assert_called_once_with(SESSION, REGION, "op")
+
+    poller = self.client.operation_poller(min_poll_seconds=1)
+    self.assertIsInstance(poller, operation_poller.OperationPoller)
+    # pylint: disable=protected-access
+    self.assertIs(poller._http_session, SESSION)
+    self.assertEqual(poller._proj_region, REGION)
+    self.assertEqual(poller._min_poll_seconds, 1)
+
+  def test_repr(self):
+    self.assertEqual(
+        repr(self.client),
+        "ChronicleV1Alpha(region='the-region', project='the-project', "
+        "instance='the-instance')")
+
+
+if __name__ == "__main__":
+  unittest.main()
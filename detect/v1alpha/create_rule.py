@@ -78,7 +78,7 @@ def create_rule(
   """
   base_url_with_region = regions.url_always_prepend_region(
       CHRONICLE_API_BASE_URL,
-      args.region
+      proj_region
   )
   # pylint: disable-next=line-too-long
   parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
@@ -47,6 +47,7 @@ def enable_rule(
     proj_id: str,
     proj_instance: str,
     rule_id: str,
+    enabled: bool = True,
 ) -> Mapping[str, Any]:
   """Enables a rule.
 
@@ -57,6 +58,7 @@ def enable_rule(
     proj_instance: uuid of the instance whose rules are being
       created (with dashes)
     rule_id: Unique ID of the detection rule to retrieve ("ru_<UUID>").
+    enabled: whether the rule should be enabled (False disables it)
 
   Returns:
     a rule deployment object containing relevant rule's deployment information
@@ -67,14 +69,13 @@ def enable_rule(
   """
   base_url_with_region = regions.url_always_prepend_region(
       CHRONICLE_API_BASE_URL,
-      args.region
+      proj_region
   )
   # pylint: disable-next=line-too-long
   parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
   url = f"{base_url_with_region}/v1alpha/{parent}/rules/{rule_id}/deployment"
   body = {
-      # You can set enabled to False to disable a rule.
-      "enabled": True,
+      "enabled": enabled,
   }
   params = {"update_mask": "enabled"}
 
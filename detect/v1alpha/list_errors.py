@@ -29,64 +29,138 @@ Sample Commands (run from api_samples_python dir):
         -p=<project_id> -i=<instance_id> \
         -rid=<rule_id>@-
 
+    python3 -m detect.v1alpha.list_errors -r=<region> \
+        -p=<project_id> -i=<instance_id> \
+        -f=<path_to_rule_ids_file>
+
+With --rule_ids_file (one rule ID per line), the errors of many rules are
+listed with a few queries: the rule names are packed into OR-combined filters
+of up to --max_filter_length characters each, the packed queries run
+concurrently (following page tokens, with retries of transient errors), and
+the errors are printed grouped by rule ID.
+
 API reference:
     https://cloud.google.com/chronicle/docs/reference/rest/v1alpha/projects.locations.instances.ruleExecutionErrors/list
     https://cloud.google.com/chronicle/docs/reference/rest/v1alpha/projects.locations.instances.ruleExecutionErrors/list#RuleExecutionError
 """
 import argparse
+import concurrent.futures
+import functools
 import json
-from typing import Any, Mapping
+import logging
+from typing import Any, Dict, List, Mapping, Sequence
 from common import chronicle_auth
 from common import project_id
 from common import project_instance
 from common import regions
+from common import retry
 from google.auth.transport import requests
 
+_LOGGER_ = logging.getLogger("list_errors")
+
 CHRONICLE_API_BASE_URL = "https://chronicle.googleapis.com"
 
 SCOPES = [
     "https://www.googleapis.com/auth/cloud-platform",
 ]
 
+# Maximum page size supported by the ListRuleExecutionErrors API.
+MAX_PAGE_SIZE = 1000
+# Filters are sent in the URL's query string, which is typically limited to
+# 8 KiB by servers and proxies. URL encoding expands a packed filter by
+# roughly a third, so this leaves ample headroom.
+DEFAULT_MAX_FILTER_LENGTH = 4000
+DEFAULT_MAX_CONCURRENCY = 4
 
-def list_errors(
+
+def rule_filter(parent: str, rule_id: str) -> str:
+  """Returns the filter expression that matches the errors of one rule.
+
+  Args:
+    parent: resource name of the instance ("projects/.../instances/<id>")
+    rule_id: rule ID, with an optional version suffix (see list_errors)
+
+  Returns:
+    The filter expression.
+  """
+  return f'rule = "{parent}/rules/{rule_id}"'
+
+
+def pack_rule_filters(
+    parent: str,
+    rule_ids: Sequence[str],
+    max_filter_length: int = DEFAULT_MAX_FILTER_LENGTH,
+) -> List[str]:
+  """Packs the filters of many rules into OR-combined filters.
+
+  Args:
+    parent: resource name of the instance ("projects/.../instances/<id>")
+    rule_ids: rule IDs, with optional version suffixes (see list_errors);
+      duplicates are packed once
+    max_filter_length: maximum length of each packed filter (a rule whose
+      filter is longer on its own still gets a filter of its own)
+
+  Returns:
+    Filters that together match the errors of all the rules, in order.
+  """
+  filters = []
+  terms = []
+  length = 0
+  for rule_id in dict.fromkeys(rule_ids):
+    term = rule_filter(parent, rule_id)
+    # Each additional term is joined with " OR ".
+    if terms and length + len(" OR ") + len(term) > max_filter_length:
+      filters.append(" OR ".join(terms))
+      terms = []
+      length = 0
+    length += len(term) + (len(" OR ") if terms else 0)
+    terms.append(term)
+  if terms:
+    filters.append(" OR ".join(terms))
+  return filters
+
+
+def list_errors_with_filter(
     http_session: requests.AuthorizedSession,
     proj_region: str,
     proj_id: str,
     proj_instance: str,
-    rule_id: str,
+    error_filter: str,
+    page_size: int | None = None,
+    page_token: str | None = None,
 ) -> Mapping[str, Any]:
-  """Listing errors for rules.
+  """Lists one page of rule execution errors that match a filter.
 
   Args:
     http_session: Authorized session for HTTP requests.
     proj_region: region in which the target project is located
     proj_id: GCP project id or number which the target instance belongs to
     proj_instance: uuid of the instance (with dashes)
-    rule_id: Unique id of the rule to retrieve errors for. Options are (1)
-      {rule_id} (2) {rule_id}@v_<seconds>_<nanoseconds> (3) {rule_id}@- which
-      matches on all versions.
+    error_filter: filter expression, e.g. from rule_filter or
+      pack_rule_filters
+    page_size: optional maximum number of errors to return
+    page_token: optional page token from a previous call's nextPageToken
 
   Returns:
-    a rule execution error object containing relevant error's information
+    a page of rule execution errors, and the nextPageToken if there are more
   Raises:
     requests.exceptions.HTTPError: HTTP request resulted in an error
       (response.status_code >= 400).
   """
   base_url_with_region = regions.url_always_prepend_region(
       CHRONICLE_API_BASE_URL,
-      args.region
+      proj_region
   )
   # pylint: disable-next=line-too-long
   parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
   url = f"{base_url_with_region}/v1alpha/{parent}/ruleExecutionErrors"
-  rule_filter = (
-      "rule ="
-      f' "projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}/rules/{rule_id}"'
-  )
   params = {
-      "filter": rule_filter,
+      "filter": error_filter,
   }
+  if page_size:
+    params["pageSize"] = page_size
+  if page_token:
+    params["pageToken"] = page_token
 
   # See API reference links at top of this file, for response format.
   response = http_session.request("GET", url, params=params)
@@ -96,37 +170,156 @@ def list_errors(
   return response.json()
 
 
+def list_errors(
+    http_session: requests.AuthorizedSession,
+    proj_region: str,
+    proj_id: str,
+    proj_instance: str,
+    rule_id: str,
+) -> Mapping[str, Any]:
+  """Listing errors for rules.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    proj_region: region in which the target project is located
+    proj_id: GCP project id or number which the target instance belongs to
+    proj_instance: uuid of the instance (with dashes)
+    rule_id: Unique id of the rule to retrieve errors for. Options are (1)
+      {rule_id} (2) {rule_id}@v_<seconds>_<nanoseconds> (3) {rule_id}@- which
+      matches on all versions.
+
+  Returns:
+    a rule execution error object containing relevant error's information
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  # pylint: disable-next=line-too-long
+  parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
+  return list_errors_with_filter(http_session, proj_region, proj_id,
+                                 proj_instance, rule_filter(parent, rule_id))
+
+
+def list_errors_for_rules(
+    http_session: requests.AuthorizedSession,
+    proj_region: str,
+    proj_id: str,
+    proj_instance: str,
+    rule_ids: Sequence[str],
+    max_filter_length: int = DEFAULT_MAX_FILTER_LENGTH,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> Dict[str, List[Mapping[str, Any]]]:
+  """Lists the errors of many rules, with a few packed queries.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    proj_region: region in which the target project is located
+    proj_id: GCP project id or number which the target instance belongs to
+    proj_instance: uuid of the instance (with dashes)
+    rule_ids: rule IDs, with optional version suffixes (see list_errors)
+    max_filter_length: maximum length of each packed filter
+    max_concurrency: maximum number of packed queries at the same time
+
+  Returns:
+    All the errors of each rule, by rule ID without the version suffix
+    ("ru_<UUID>"). Every requested rule has an entry, even without errors.
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400), after retries of transient errors.
+  """
+  # pylint: disable-next=line-too-long
+  parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
+  filters = pack_rule_filters(parent, rule_ids, max_filter_length)
+  _LOGGER_.info("Listing errors of %d rules with %d packed queries",
+                len(set(rule_ids)), len(filters))
+
+  def list_all(error_filter: str) -> List[Mapping[str, Any]]:
+    errors = []
+    page_token = None
+    while True:
+      page = retry.call_with_retry(
+          functools.partial(list_errors_with_filter, http_session, proj_region,
+                            proj_id, proj_instance, error_filter,
+                            MAX_PAGE_SIZE, page_token))
+      errors.extend(page.get("ruleExecutionErrors", []))
+      page_token = page.get("nextPageToken")
+      if not page_token:
+        return errors
+
+  errors_by_rule = {rule_id.split("@")[0]: [] for rule_id in rule_ids}
+  with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+    for future in concurrent.futures.as_completed(
+        [executor.submit(list_all, f) for f in filters]):
+      for error in future.result():
+        # Error rule names are ".../rules/<rule ID>[@<version>]".
+        rule_id = error.get("rule", "").split("/")[-1].split("@")[0]
+        errors_by_rule.setdefault(rule_id, []).append(error)
+  return errors_by_rule
+
+
 if __name__ == "__main__":
+  # Set up logger that will include timestamps.
+  logging.basicConfig(
+      level=logging.INFO,
+      format="%(asctime)s:%(levelname)s:%(name)s:%(message)s")
   parser = argparse.ArgumentParser()
   chronicle_auth.add_argument_credentials_file(parser)
   regions.add_argument_region(parser)
   project_instance.add_argument_project_instance(parser)
   project_id.add_argument_project_id(parser)
-  parser.add_argument(
+  rule_group = parser.add_mutually_exclusive_group(required=True)
+  rule_group.add_argument(
       "-rid",
       "--rule_id",
       type=str,
-      required=True,
       help=(
           "rule id to list errors for. Options are (1) rule_id (2)"
           " rule_id@v_<seconds>_<nanoseconds> (3) rule_id@- which matches on"
           " all versions."
       ),
   )
+  rule_group.add_argument(
+      "-f",
+      "--rule_ids_file",
+      type=argparse.FileType("r"),
+      help="path of a file with one rule id (in any form above) per line",
+  )
+  parser.add_argument(
+      "--max_filter_length",
+      type=int,
+      default=DEFAULT_MAX_FILTER_LENGTH,
+      help=("maximum length of each packed filter, with --rule_ids_file " +
+            f"(default = {DEFAULT_MAX_FILTER_LENGTH})"),
+  )
+  parser.add_argument(
+      "--max_concurrency",
+      type=int,
+      default=DEFAULT_MAX_CONCURRENCY,
+      help=("maximum number of concurrent queries, with --rule_ids_file " +
+            f"(default = {DEFAULT_MAX_CONCURRENCY})"),
+  )
   args = parser.parse_args()
   auth_session = chronicle_auth.initialize_http_session(
       args.credentials_file,
       SCOPES
   )
-  print(
-      json.dumps(
-          list_errors(
-              auth_session,
-              args.region,
-              args.project_id,
-              args.project_instance,
-              args.rule_id,
-          ),
-          indent=2,
-      )
-  )
+  if args.rule_ids_file:
+    ids = [line.strip() for line in args.rule_ids_file if line.strip()]
+    result = list_errors_for_rules(
+        auth_session,
+        args.region,
+        args.project_id,
+        args.project_instance,
+        ids,
+        args.max_filter_length,
+        args.max_concurrency,
+    )
+  else:
+    result = list_errors(
+        auth_session,
+        args.region,
+        args.project_id,
+        args.project_instance,
+        args.rule_id,
+    )
+  print(json.dumps(result, indent=2))
@@ -0,0 +1,109 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "list_errors" module."""
+
+import unittest
+from unittest import mock
+
+from . import list_errors
+
+PARENT = "projects/p/locations/us/instances/i"
+
+
+class PackRuleFiltersTest(unittest.TestCase):
+
+  def term(self, rule_id):
+    return list_errors.rule_filter(PARENT, rule_id)
+
+  def test_rule_filter(self):
+    self.assertEqual(self.term("ru_1@-"), f'rule = "{PARENT}/rules/ru_1@-"')
+
+  def test_exact_fit(self):
+    two_terms = f"{self.term('ru_1')} OR {self.term('ru_2')}"
+    filters = list_errors.pack_rule_filters(PARENT, ["ru_1", "ru_2", "ru_3"],
+                                            len(two_terms))
+    self.assertEqual(filters, [two_terms, self.term("ru_3")])
+
+  def test_one_character_short(self):
+    two_terms = f"{self.term('ru_1')} OR {self.term('ru_2')}"
+    filters = list_errors.pack_rule_filters(PARENT, ["ru_1", "ru_2"],
+                                            len(two_terms) - 1)
+    self.assertEqual(filters, [self.term("ru_1"), self.term("ru_2")])
+
+  def test_term_longer_than_max_length(self):
+    long_id = "ru_" + "x" * 100
+    filters = list_errors.pack_rule_filters(
+        PARENT, ["ru_1", long_id, "ru_2"], len(self.term("ru_1")))
+    # The long term gets a filter of its own, and doesn't absorb others.
+    self.assertEqual(
+        filters, [self.term("ru_1"), self.term(long_id), self.term("ru_2")])
+
+  def test_duplicate_ids(self):
+    filters = list_errors.pack_rule_filters(PARENT,
+                                            ["ru_1", "ru_2", "ru_1", "ru_2"])
+    self.assertEqual(filters, [f"{self.term('ru_1')} OR {self.term('ru_2')}"])
+
+  def test_no_ids(self):
+    self.assertEqual(list_errors.pack_rule_filters(PARENT, []), [])
+
+
+class ListErrorsForRulesTest(unittest.TestCase):
+
+  def test_errors_grouped_by_rule(self):
+    # Each filter has 2 pages of errors, for the rules it matches.
+    def list_page(http_session, proj_region, proj_id, proj_instance,
+                  error_filter, page_size, page_token):
+      del http_session, proj_region, proj_id, proj_instance  # Unused.
+      self.assertEqual(page_size, list_errors.MAX_PAGE_SIZE)
+      # Errors name the rule version, e.g. ".../rules/ru_1@v_1_2".
+      rule_names = [
+          t.split('"')[1].split("@")[0] for t in error_filter.split(" OR ")
+      ]
+      if page_token is None:
+        errors = [{"rule": f"{n}@v_1_1", "page": 1} for n in rule_names]
+        return {"ruleExecutionErrors": errors, "nextPageToken": "t"}
+      errors = [{"rule": f"{n}@v_1_2", "page": 2} for n in rule_names]
+      return {"ruleExecutionErrors": errors}
+
+    with mock.patch.object(list_errors, "list_errors_with_filter",
+                           side_effect=list_page) as list_page_mock:
+      errors_by_rule = list_errors.list_errors_for_rules(
+          None, "us", "p", "i", ["ru_1@-", "ru_2", "ru_1@-"],
+          max_filter_length=len(list_errors.rule_filter(PARENT, "ru_1@-")))
+
+    # One filter per unique rule, 2 pages each.
+    self.assertEqual(list_page_mock.call_count, 4)
+    self.assertEqual(
+        errors_by_rule, {
+            "ru_1": [
+                {"rule": f"{PARENT}/rules/ru_1@v_1_1", "page": 1},
+                {"rule": f"{PARENT}/rules/ru_1@v_1_2", "page": 2},
+            ],
+            "ru_2": [
+                {"rule": f"{PARENT}/rules/ru_2@v_1_1", "page": 1},
+                {"rule": f"{PARENT}/rules/ru_2@v_1_2", "page": 2},
+            ],
+        })
+
+  def test_rules_without_errors(self):
+    with mock.patch.object(list_errors, "list_errors_with_filter",
+                           return_value={}):
+      errors_by_rule = list_errors.list_errors_for_rules(
+          None, "us", "p", "i", ["ru_1", "ru_2@v_1_2"])
+    self.assertEqual(errors_by_rule, {"ru_1": [], "ru_2": []})
+
+
+if __name__ == "__main__":
+  unittest.main()
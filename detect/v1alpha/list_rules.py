@@ -27,7 +27,7 @@ API reference:
 
 import argparse
 import json
-from typing import Any, Mapping
+from typing import Any, List, Mapping
 
 from common import chronicle_auth
 from common import project_id
@@ -41,12 +41,18 @@ SCOPES = [
     "https://www.googleapis.com/auth/cloud-platform",
 ]
 
+# Maximum page size supported by the ListRules API.
+MAX_PAGE_SIZE = 1000
+
 
 def list_rules(
     http_session: requests.AuthorizedSession,
     proj_id: str,
     proj_instance: str,
     proj_region: str,
+    view: str | None = None,
+    page_size: int | None = None,
+    page_token: str | None = None,
     ) -> Mapping[str, Any]:
   """Gets a list of rules.
 
@@ -55,28 +61,73 @@ def list_rules(
     proj_id: GCP project id or number to which the target instance belongs.
     proj_instance: Customer ID (uuid with dashes) for the Chronicle instance.
     proj_region: region in which the target project is located.
+    view: optional scope of data to populate for each rule ("BASIC" or "FULL";
+      only the FULL view includes the rule text)
+    page_size: optional maximum number of rules to return
+    page_token: optional page token from a previous call's nextPageToken
   Returns:
-    Array containing information about rules.
+    Array containing information about rules, and the nextPageToken if there
+    are more rules.
   Raises:
     requests.exceptions.HTTPError: HTTP request resulted in an error
       (response.status_code >= 400).
   """
   base_url_with_region = regions.url_always_prepend_region(
       CHRONICLE_API_BASE_URL,
-      args.region
+      proj_region
   )
   # pylint: disable-next=line-too-long
   parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
   url = f"{base_url_with_region}/v1alpha/{parent}/rules"
 
+  params = {}
+  if view:
+    params["view"] = view
+  if page_size:
+    params["pageSize"] = page_size
+  if page_token:
+    params["pageToken"] = page_token
+
   # See API reference links at top of this file, for response format.
-  response = http_session.request("GET", url)
+  response = http_session.request("GET", url, params=params)
   if response.status_code >= 400:
     print(response.text)
   response.raise_for_status()
   return response.json()
 
 
+def list_all_rules(
+    http_session: requests.AuthorizedSession,
+    proj_id: str,
+    proj_instance: str,
+    proj_region: str,
+    view: str | None = None,
+    ) -> List[Mapping[str, Any]]:
+  """Gets all the rules, following page tokens until the last page.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    proj_id: GCP project id or number to which the target instance belongs.
+    proj_instance: Customer ID (uuid with dashes) for the Chronicle instance.
+    proj_region: region in which the target project is located.
+    view: optional scope of data to populate for each rule ("BASIC" or "FULL")
+  Returns:
+    All the rules.
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  rules = []
+  page_token = None
+  while True:
+    response = list_rules(http_session, proj_id, proj_instance, proj_region,
+                          view, MAX_PAGE_SIZE, page_token)
+    rules.extend(response.get("rules", []))
+    page_token = response.get("nextPageToken")
+    if not page_token:
+      return rules
+
+
 if __name__ == "__main__":
   parser = argparse.ArgumentParser()
   chronicle_auth.add_argument_credentials_file(parser)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+r"""Executable and reusable sample for waiting for long-running operations.
+
+A single OperationPoller tracks many operations (e.g. the ones returned by
+create_retrohunt), and polls each one at an interval based on the rate of
+change of its reported progress percentage, instead of a fixed interval. Each
+operation is tracked once, no matter how many times it's added, and completes
+a concurrent.futures.Future (which can be awaited in asyncio code with
+asyncio.wrap_future).
+
+Sample Commands (run from api_samples_python dir):
+    python3 -m detect.v1alpha.operation_poller -r=<region> \
+        -on=projects/<project_id>/locations/<region>/instances/<instance_id>/operations/<op_id>
+
+    python3 -m detect.v1alpha.operation_poller -r=<region> \
+        -onf=<path_to_file>
+
+API reference:
+    https://cloud.google.com/chronicle/docs/reference/rest/v1alpha/projects.locations.instances.operations/get
+    https://cloud.google.com/chronicle/docs/reference/rest/v1alpha/projects.locations.instances.operations#Operation
+"""
+import argparse
+import concurrent.futures
+import heapq
+import itertools
+import json
+import threading
+import time
+from typing import Any, Callable, Mapping
+from common import chronicle_auth
+from common import poll_schedule
+from common import regions
+from common import retry
+from google.auth.transport import requests
+
+CHRONICLE_API_BASE_URL = "https://chronicle.googleapis.com"
+
+SCOPES = [
+    "https://www.googleapis.com/auth/cloud-platform",
+]
+
+# Default minimum and maximum intervals between polls of each operation.
+DEFAULT_MIN_POLL_SECONDS = 5.0
+DEFAULT_MAX_POLL_SECONDS = 300.0
+
+
+class OperationError(Exception):
+  """A long-running operation completed with an error status."""
+
+  def __init__(self, operation: Mapping[str, Any]):
+    error = operation.get("error", {})
+    super().__init__(
+        f"{operation.get('name')}: {error.get('message', error)}")
+    self.operation = operation
+
+
+def get_operation(
+    http_session: requests.AuthorizedSession,
+    proj_region: str,
+    operation_name: str,
+) -> Mapping[str, Any]:
+  """Gets the latest state of a long-running operation.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    proj_region: region in which the target project is located
+    operation_name: full resource name of the operation
+      ("projects/<id>/locations/<region>/instances/<id>/operations/<id>")
+
+  Returns:
+    an Operation resource object
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  base_url_with_region = regions.url_always_prepend_region(
+      CHRONICLE_API_BASE_URL,
+      proj_region
+  )
+  url = f"{base_url_with_region}/v1alpha/{operation_name}"
+
+  # See API reference links at top of this file, for response format.
+  response = http_session.request("GET", url)
+  if response.status_code >= 400:
+    print(response.text)
+  response.raise_for_status()
+  return response.json()
+
+
+def progress_percentage(operation: Mapping[str, Any]) -> float:
+  """Returns the progress reported in an operation's metadata, if any."""
+  return float(operation.get("metadata", {}).get("progressPercentage", 0.0))
+
+
+class OperationPoller:
+  """Polls many long-running operations, each one at an adaptive interval."""
+
+  def __init__(
+      self,
+      http_session: requests.AuthorizedSession,
+      proj_region: str,
+      min_poll_seconds: float = DEFAULT_MIN_POLL_SECONDS,
+      max_poll_seconds: float = DEFAULT_MAX_POLL_SECONDS,
+      max_poll_errors: int = retry.DEFAULT_MAX_ATTEMPTS,
+      clock: Callable[[], float] = time.monotonic,
+      sleep: Callable[[float], None] = time.sleep,
+  ):
+    """Initializes the poller.
+
+    Args:
+      http_session: Authorized session for HTTP requests.
+      proj_region: region in which the target project is located
+      min_poll_seconds: minimum interval between polls of each operation
+      max_poll_seconds: maximum interval between polls of each operation
+      max_poll_errors: number of consecutive transient errors in polling an
+        operation, after which its future fails with the last one
+      clock: function that returns the current time in seconds
+      sleep: function that sleeps for a number of seconds
+    """
+    self._http_session = http_session
+    self._proj_region = proj_region
+    self._min_poll_seconds = min_poll_seconds
+    self._max_poll_seconds = max_poll_seconds
+    self._clock = clock
+    self._sleep = sleep
+    # Re-entrant, because future callbacks may add more operations.
+    self._lock = threading.RLock()
+    # Heap of (next poll time, sequence number, operation name).
+    self._heap = []
+    self._seq = itertools.count()
+    self._futures = {}
+    self._schedules = {}
+    # Operation name -> number of consecutive transient polling errors.
+    self._errors = {}
+    self._max_poll_errors = max_poll_errors
+    # Number of operations that are being polled (out of the heap).
+    self._polling = 0
+    self.num_polls = 0
+
+  def add(
+      self, operation: Mapping[str, Any] | str
+  ) -> concurrent.futures.Future:
+    """Starts tracking an operation, unless it's already tracked.
+
+    Args:
+      operation: an Operation resource object, or an operation name
+
+    Returns:
+      Future that will hold the completed operation, or an OperationError.
+      Adding the same operation again returns the same future.
+    """
+    if isinstance(operation, str):
+      operation = {"name": operation}
+    name = operation["name"]
+    with self._lock:
+      if name in self._futures:
+        return self._futures[name]
+      future = concurrent.futures.Future()
+      future.set_running_or_notify_cancel()
+      self._futures[name] = future
+      if operation.get("done"):
+        self._complete(operation)
+        return future
+      schedule = poll_schedule.PollSchedule(
+          self._min_poll_seconds, self._max_poll_seconds, self._clock)
+      self._schedules[name] = schedule
+      next_poll = self._clock()
+      if "metadata" in operation:
+        # We already know the initial progress, no need to poll it right away.
+        next_poll += schedule.next_interval(progress_percentage(operation))
+      heapq.heappush(self._heap, (next_poll, next(self._seq), name))
+      return future
+
+  def _complete(self, operation: Mapping[str, Any]):
+    name = operation["name"]
+    self._schedules.pop(name, None)
+    future = self._futures[name]
+    if "error" in operation:
+      future.set_exception(OperationError(operation))
+    else:
+      future.set_result(operation)
+
+  @property
+  def pending(self) -> int:
+    """Number of operations that are not done yet."""
+    with self._lock:
+      return len(self._heap) + self._polling
+
+  def poll_once(self) -> float | None:
+    """Polls all the operations that are due, and completes the done ones.
+
+    Operations are polled without holding the lock, so other threads can add
+    operations in the meantime. Transient errors in polling an operation (see
+    common.retry) reschedule it with exponential backoff, up to
+    max_poll_errors consecutive times; other errors (e.g. HTTP 404) complete
+    its future with that exception.
+
+    Returns:
+      Seconds until the next poll is due, or None if there's nothing to poll.
+    """
+    with self._lock:
+      now = self._clock()
+      due = []
+      while self._heap and self._heap[0][0] <= now:
+        due.append(heapq.heappop(self._heap)[2])
+      self.num_polls += len(due)
+      self._polling += len(due)
+
+    for name in due:
+      try:
+        operation = get_operation(self._http_session, self._proj_region, name)
+      except requests.requests.exceptions.RequestException as e:
+        self._poll_failed(name, e)
+        continue
+      with self._lock:
+        self._polling -= 1
+        self._errors.pop(name, None)
+        if operation.get("done"):
+          self._complete(operation)
+          continue
+        interval = self._schedules[name].next_interval(
+            progress_percentage(operation))
+        heapq.heappush(self._heap,
+                       (self._clock() + interval, next(self._seq), name))
+
+    with self._lock:
+      if not self._heap:
+        return None
+      return max(self._heap[0][0] - self._clock(), 0.0)
+
+  def _poll_failed(self, name: str, error: Exception):
+    with self._lock:
+      self._polling -= 1
+      errors = self._errors.get(name, 0) + 1
+      if not retry.is_retryable(error) or errors >= self._max_poll_errors:
+        self._errors.pop(name, None)
+        self._schedules.pop(name, None)
+        self._futures[name].set_exception(error)
+        return
+      self._errors[name] = errors
+      backoff = min(self._min_poll_seconds * 2**(errors - 1),
+                    self._max_poll_seconds)
+      heapq.heappush(self._heap,
+                     (self._clock() + backoff, next(self._seq), name))
+
+  def run(self, timeout: float | None = None) -> bool:
+    """Polls operations until all of them are done, or the timeout expires.
+
+    Args:
+      timeout: optional maximum number of seconds to poll for
+
+    Returns:
+      True if all the operations are done, False if the timeout expired.
+    """
+    deadline = None if timeout is None else self._clock() + timeout
+    while True:
+      delay = self.poll_once()
+      if delay is None:
+        return True
+      if deadline is not None:
+        if self._clock() + delay > deadline:
+          return False
+      self._sleep(delay)
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  regions.add_argument_region(parser)
+  group = parser.add_mutually_exclusive_group(required=True)
+  group.add_argument(
+      "-on",
+      "--operation_name",
+      type=str,
+      action="append",
+      help="full resource name of an operation to wait for (can be repeated)",
+  )
+  group.add_argument(
+      "-onf",
+      "--operation_names_file",
+      type=argparse.FileType("r"),
+      help="path of a file with one operation name per line, or - for STDIN",
+  )
+  parser.add_argument(
+      "-t",
+      "--timeout_seconds",
+      type=float,
+      help="maximum number of seconds to wait (default = no timeout)",
+  )
+  args = parser.parse_args()
+  auth_session = chronicle_auth.initialize_http_session(
+      args.credentials_file,
+      SCOPES
+  )
+  names = args.operation_name or [
+      line.strip() for line in args.operation_names_file if line.strip()
+  ]
+  poller = OperationPoller(auth_session, args.region)
+  futures = {name: poller.add(name) for name in names}
+  all_done = poller.run(args.timeout_seconds)
+  for op_name, op_future in futures.items():
+    if not op_future.done():
+      print(f"{op_name}: still running")
+    elif op_future.exception():
+      print(f"{op_name}: {op_future.exception()}")
+    else:
+      print(json.dumps(op_future.result(), indent=2))
+  print(f"Polled {poller.num_polls} times; all done: {all_done}")
@@ -0,0 +1,176 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "operation_poller" module."""
+
+import threading
+import unittest
+from unittest import mock
+
+from google.auth.transport import requests
+
+from . import operation_poller
+
+OP_1 = "projects/p/locations/us/instances/i/operations/1"
+OP_2 = "projects/p/locations/us/instances/i/operations/2"
+
+
+def http_error(status_code):
+  response = requests.requests.Response()
+  response.status_code = status_code
+  return requests.requests.exceptions.HTTPError(response=response)
+
+
+class OperationPollerTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.now = 0.0
+    self.polls = []  # (time, operation name) of each poll.
+    # Operation name -> list of responses (or errors) to return, in order.
+    self.responses = {}
+    patcher = mock.patch.object(operation_poller, "get_operation",
+                                side_effect=self.fake_get_operation)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+    self.poller = operation_poller.OperationPoller(
+        None, "us", min_poll_seconds=5, max_poll_seconds=300,
+        max_poll_errors=3, clock=lambda: self.now, sleep=self.sleep)
+
+  def sleep(self, seconds):
+    self.now += seconds
+
+  def fake_get_operation(self, http_session, proj_region, name):
+    del http_session, proj_region  # Unused.
+    self.polls.append((self.now, name))
+    response = self.responses[name].pop(0)
+    if isinstance(response, Exception):
+      raise response
+    return response
+
+  def running(self, name, progress):
+    return {"name": name, "metadata": {"progressPercentage": progress}}
+
+  def test_add_same_operation_returns_same_future(self):
+    future = self.poller.add(OP_1)
+    self.assertIs(self.poller.add({"name": OP_1}), future)
+    self.assertEqual(self.poller.pending, 1)
+
+  def test_add_done_operation(self):
+    future = self.poller.add({"name": OP_1, "done": True})
+    self.assertEqual(future.result(0), {"name": OP_1, "done": True})
+    self.assertEqual(self.poller.pending, 0)
+    self.assertIsNone(self.poller.poll_once())
+
+  def test_run_polls_each_operation_at_its_own_interval(self):
+    self.responses = {
+        OP_1: [
+            self.running(OP_1, 10),
+            {"name": OP_1, "done": True, "response": {}},
+        ],
+        OP_2: [
+            self.running(OP_2, 0),
+            self.running(OP_2, 0),
+            {"name": OP_2, "done": True, "error": {"message": "failed"}},
+        ],
+    }
+    future_1 = self.poller.add(OP_1)
+    # With a known initial progress, the first poll is delayed.
+    future_2 = self.poller.add(self.running(OP_2, 0))
+
+    self.assertTrue(self.poller.run())
+
+    self.assertEqual(future_1.result(0)["response"], {})
+    with self.assertRaisesRegex(operation_poller.OperationError, "failed"):
+      future_2.result(0)
+    # OP_1 progressed, OP_2 didn't, so its interval backed off.
+    self.assertEqual(self.polls, [
+        (0.0, OP_1),
+        (5.0, OP_2),
+        (5.0, OP_1),
+        (15.0, OP_2),
+        (35.0, OP_2),
+    ])
+    self.assertEqual(self.poller.num_polls, 5)
+    self.assertEqual(self.poller.pending, 0)
+
+  def test_run_timeout(self):
+    self.responses = {OP_1: [self.running(OP_1, 0)] * 10}
+    future = self.poller.add(OP_1)
+
+    self.assertFalse(self.poller.run(timeout=30))
+
+    self.assertFalse(future.done())
+    self.assertEqual(self.poller.pending, 1)
+    # Polls at 0, 5 and 15; the next one (at 35) is after the deadline.
+    self.assertEqual([t for t, _ in self.polls], [0.0, 5.0, 15.0])
+    self.assertLessEqual(self.now, 30)
+
+  def test_transient_errors_are_rescheduled(self):
+    self.responses = {
+        OP_1: [
+            http_error(503),
+            requests.requests.exceptions.ConnectionError(),
+            {"name": OP_1, "done": True},
+        ],
+    }
+    future = self.poller.add(OP_1)
+
+    self.assertTrue(self.poller.run())
+
+    self.assertEqual(future.result(0), {"name": OP_1, "done": True})
+    # Exponential backoff from min_poll_seconds.
+    self.assertEqual([t for t, _ in self.polls], [0.0, 5.0, 15.0])
+
+  def test_too_many_transient_errors(self):
+    self.responses = {OP_1: [http_error(429)] * 3}
+    future = self.poller.add(OP_1)
+
+    self.assertTrue(self.poller.run())
+
+    with self.assertRaises(requests.requests.exceptions.HTTPError):
+      future.result(0)
+    self.assertEqual(len(self.polls), 3)
+
+  def test_permanent_error(self):
+    self.responses = {OP_1: [http_error(404)], OP_2: [{"name": OP_2,
+                                                       "done": True}]}
+    future_1 = self.poller.add(OP_1)
+    future_2 = self.poller.add(OP_2)
+
+    self.assertIsNone(self.poller.poll_once())
+
+    with self.assertRaises(requests.requests.exceptions.HTTPError):
+      future_1.result(0)
+    self.assertTrue(future_2.result(0)["done"])
+
+  def test_add_while_polling(self):
+    # Other threads can add operations while others are polled.
+    def add_other_operation(*_):
+      thread = threading.Thread(target=self.poller.add, args=(OP_2,))
+      thread.start()
+      thread.join(timeout=5)
+      self.assertFalse(thread.is_alive())
+      self.assertEqual(self.poller.pending, 2)
+      return {"name": OP_1, "done": True}
+
+    operation_poller.get_operation.side_effect = add_other_operation
+    self.poller.add(OP_1)
+
+    self.assertEqual(self.poller.poll_once(), 0.0)
+    self.assertEqual(self.poller.pending, 1)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -27,19 +27,36 @@ Sample Command (run from api_samples_python dir):
       --rule_status=ALL \
       --page_size=10
 
+    # Collect all the alerts, splitting the time range as needed to work
+    # around the maximum number of alerts per request (one alert per line).
+    python3 -m detect.v1alpha.search_rules_alerts \
+      --region=$REGION \
+      --project_id=$PROJECT_ID \
+      --project_instance=$PROJECT_INSTANCE \
+      --credentials_file=$CREDENTIALS_FILE \
+      --start_time="2024-10-20T00:00:00Z" \
+      --end_time="2024-11-19T00:00:00Z" \
+      --all
+
 API reference:
     https://cloud.google.com/chronicle/docs/reference/rest/v1alpha/projects.locations.instances.legacy/legacySearchRulesAlerts
 """
 import argparse
+import concurrent.futures
 import datetime
 import json
-from typing import Any, Mapping
+import logging
+from typing import Any, Iterator, Mapping, Tuple
 from common import chronicle_auth
+from common import datetime_converter
 from common import project_id
 from common import project_instance
 from common import regions
+from common import time_ranges
 from google.auth.transport import requests
 
+_LOGGER_ = logging.getLogger("search_rules_alerts")
+
 CHRONICLE_API_BASE_URL = "https://chronicle.googleapis.com"
 
 SCOPES = [
@@ -52,6 +69,10 @@ RULE_STATUS = (
     "ALL",
 )
 
+# Default maximum number of alerts per request when collecting all alerts.
+DEFAULT_MAX_ALERTS = 1000
+DEFAULT_MAX_CONCURRENCY = 4
+
 
 def search_rules_alerts(
     http_session: requests.AuthorizedSession,
@@ -85,7 +106,7 @@ def search_rules_alerts(
       (response.status_code >= 400).
   """
   base_url_with_region = regions.url_always_prepend_region(
-      CHRONICLE_API_BASE_URL, args.region
+      CHRONICLE_API_BASE_URL, proj_region
   )
   # pylint: disable-next=line-too-long
   instance = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
@@ -108,7 +129,99 @@ def search_rules_alerts(
   return response.json()
 
 
+def _is_truncated(response: Mapping[str, Any], max_alerts: int) -> bool:
+  if response.get("tooManyAlerts"):
+    return True
+  num_alerts = sum(
+      len(rule_alerts.get("alerts", []))
+      for rule_alerts in response.get("ruleAlerts", []))
+  return num_alerts >= max_alerts
+
+
+def iter_all_rules_alerts(
+    http_session: requests.AuthorizedSession,
+    proj_region: str,
+    proj_id: str,
+    proj_instance: str,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    rule_status: str | None = None,
+    max_alerts: int = DEFAULT_MAX_ALERTS,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> Iterator[Tuple[Mapping[str, Any], Mapping[str, Any]]]:
+  """Yields all the alerts in a time range, beyond the per-request maximum.
+
+  Whenever a request returns the maximum number of alerts (or reports that
+  there are too many), its time range is split in half, and both halves are
+  searched instead, concurrently with the other time ranges. Alerts are
+  yielded as soon as their time range is complete, once per alert ID.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    proj_region: region in which the target project is located
+    proj_id: GCP project id or number which the target instance belongs to
+    proj_instance: uuid of the instance (with dashes)
+    start_time: start of the time range, inclusive
+    end_time: end of the time range, exclusive
+    rule_status: if provided, limit the alerts to ACTIVE | ARCHIVED | ALL
+    max_alerts: maximum number of alerts per request
+    max_concurrency: maximum number of requests at the same time
+
+  Yields:
+    (rule metadata, alert) for each alert.
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+
+  def search(time_range: time_ranges.TimeRange) -> Mapping[str, Any]:
+    return search_rules_alerts(
+        http_session,
+        proj_region,
+        proj_id,
+        proj_instance,
+        datetime_converter.strftime(time_range[0]),
+        datetime_converter.strftime(time_range[1]),
+        rule_status,
+        max_alerts,
+    )
+
+  seen_ids = set()
+  with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+    pending = {
+        executor.submit(search, (start_time, end_time)): (start_time, end_time)
+    }
+    while pending:
+      done, _ = concurrent.futures.wait(
+          pending, return_when=concurrent.futures.FIRST_COMPLETED)
+      for future in done:
+        time_range = pending.pop(future)
+        response = future.result()
+        if _is_truncated(response, max_alerts):
+          halves = time_ranges.split_time_range(*time_range, 2)
+          if len(halves) == 2:
+            for half in halves:
+              pending[executor.submit(search, half)] = half
+            continue
+          _LOGGER_.warning(
+              "Alerts from %s to %s may be incomplete, the time range can't " +
+              "be split further", *map(datetime_converter.strftime,
+                                       time_range))
+        for rule_alerts in response.get("ruleAlerts", []):
+          rule_metadata = rule_alerts.get("ruleMetadata", {})
+          for alert in rule_alerts.get("alerts", []):
+            # Alerts may be returned for adjacent time ranges.
+            if alert["id"] not in seen_ids:
+              seen_ids.add(alert["id"])
+              yield rule_metadata, alert
+
+
 if __name__ == "__main__":
+  # Set up logger that will include timestamps.
+  logging.basicConfig(
+      level=logging.INFO,
+      format="%(asctime)s:%(levelname)s:%(name)s:%(message)s")
   now = datetime.datetime.now()
   yesterday = now - datetime.timedelta(hours=24)
   # Format the datetime object into the desired string
@@ -143,22 +256,47 @@ if __name__ == "__main__":
       required=False,
       default=10,
   )
+  parser.add_argument(
+      "--all",
+      action="store_true",
+      help=("collect all the alerts, splitting the time range as needed, and "
+            "print one alert per line"),
+  )
+  parser.add_argument(
+      "--max_concurrency",
+      type=int,
+      required=False,
+      default=DEFAULT_MAX_CONCURRENCY,
+  )
   args = parser.parse_args()
   auth_session = chronicle_auth.initialize_http_session(
       args.credentials_file, SCOPES
   )
-  print(
-      json.dumps(
-          search_rules_alerts(
-              auth_session,
-              args.region,
-              args.project_id,
-              args.project_instance,
-              args.start_time,
-              args.end_time,
-              args.rule_status,
-              args.page_size,
-          ),
-          indent=2,
-      )
-  )
+  if args.all:
+    for metadata, rule_alert in iter_all_rules_alerts(
+        auth_session,
+        args.region,
+        args.project_id,
+        args.project_instance,
+        datetime_converter.iso8601_datetime_utc(args.start_time),
+        datetime_converter.iso8601_datetime_utc(args.end_time),
+        args.rule_status,
+        max_concurrency=args.max_concurrency,
+    ):
+      print(json.dumps({"ruleMetadata": metadata, "alert": rule_alert}))
+  else:
+    print(
+        json.dumps(
+            search_rules_alerts(
+                auth_session,
+                args.region,
+                args.project_id,
+                args.project_instance,
+                args.start_time,
+                args.end_time,
+                args.rule_status,
+                args.page_size,
+            ),
+            indent=2,
+        )
+    )
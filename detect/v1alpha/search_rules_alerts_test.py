@@ -0,0 +1,124 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "search_rules_alerts" module."""
+
+import datetime
+import threading
+import unittest
+from unittest import mock
+
+from common import datetime_converter
+
+from . import search_rules_alerts
+
+START = datetime.datetime(2024, 11, 1, tzinfo=datetime.timezone.utc)
+
+
+class IterAllRulesAlertsTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.lock = threading.Lock()
+    self.searched = []  # (start time, end time) of each request.
+    self.session = mock.MagicMock()
+    self.session.request.side_effect = self.fake_request
+
+  def fake_request(self, method, url, params):
+    del method, url  # Unused.
+    start = datetime_converter.iso8601_datetime_utc(
+        params["timeRange.start_time"])
+    end = datetime_converter.iso8601_datetime_utc(params["timeRange.end_time"])
+    with self.lock:
+      self.searched.append((start, end))
+    # Like the API, include alerts at the end time, so that adjacent time
+    # ranges overlap.
+    alerts = [a for t, a in self.alerts if start <= t <= end]
+    response = mock.MagicMock()
+    response.status_code = 200
+    response.json.return_value = {
+        "ruleAlerts": [{
+            "ruleMetadata": {"ruleId": "ru_1"},
+            "alerts": alerts[:params["maxNumAlertsToReturn"]],
+        }]
+    }
+    return response
+
+  def iter_all(self, end, max_alerts):
+    return list(
+        search_rules_alerts.iter_all_rules_alerts(
+            self.session, "us", "p", "i", START, end,
+            max_alerts=max_alerts, max_concurrency=2))
+
+  def test_not_truncated(self):
+    self.alerts = [(START, {"id": "a1"})]
+    end = START + datetime.timedelta(hours=1)
+
+    results = self.iter_all(end, max_alerts=10)
+
+    self.assertEqual(results, [({"ruleId": "ru_1"}, {"id": "a1"})])
+    self.assertEqual(self.searched, [(START, end)])
+
+  def test_capped_ranges_are_bisected_and_deduped(self):
+    # 8 alerts, one every 15 minutes, including one on the boundary between
+    # the halves of the time range (at 1 hour).
+    self.alerts = [
+        (START + datetime.timedelta(minutes=15 * i), {"id": f"a{i}"})
+        for i in range(8)
+    ]
+    end = START + datetime.timedelta(hours=2)
+
+    results = self.iter_all(end, max_alerts=4)
+
+    # Each alert is yielded once, although boundaries overlap.
+    self.assertCountEqual([a["id"] for _, a in results],
+                          [f"a{i}" for i in range(8)])
+    # The whole range and both halves were capped, so they were split again
+    # (a0 to a4 are in the first half, a4 to a7 in the second one).
+    hour = datetime.timedelta(hours=1)
+    half_hour = datetime.timedelta(minutes=30)
+    self.assertCountEqual(self.searched, [
+        (START, end),
+        (START, START + hour),
+        (START + hour, end),
+        (START, START + half_hour),
+        (START + half_hour, START + hour),
+        (START + hour, START + hour + half_hour),
+        (START + hour + half_hour, end),
+    ])
+
+  def test_too_many_alerts(self):
+    self.alerts = [(START, {"id": "a1"})]
+    end = START + datetime.timedelta(seconds=2)
+    responses = [{"tooManyAlerts": True}, {}, {}]
+    with mock.patch.object(search_rules_alerts, "search_rules_alerts",
+                           side_effect=responses) as search:
+      results = self.iter_all(end, max_alerts=10)
+    self.assertEqual(results, [])
+    self.assertEqual(search.call_count, 3)
+
+  def test_range_that_cannot_be_split(self):
+    self.alerts = [(START, {"id": f"a{i}"}) for i in range(5)]
+    end = START + datetime.timedelta(seconds=1)
+
+    with self.assertLogs("search_rules_alerts", "WARNING"):
+      results = self.iter_all(end, max_alerts=3)
+
+    # The alerts of a 1 second range are yielded, even if incomplete.
+    self.assertEqual([a["id"] for _, a in results], ["a0", "a1", "a2"])
+    self.assertEqual(self.searched, [(START, end)])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+r"""Executable and reusable sample for syncing a directory of rules.
+
+Makes the rules of an instance match the rule files in a directory (one YARA-L
+rule per file). Each file is matched by rule name to a rule in a single
+list_rules snapshot of the instance, and their (whitespace-normalized) texts
+are compared by hash. Missing rules are created with create_rule, changed ones
+are updated with update_rule, and the deployment state of each rule is set
+with enable_rule if it differs from the requested one. Rules are synced
+concurrently, under a rate limit, with retries of transient errors. With
+--dry_run, only the planned changes are printed.
+
+One compact JSON result per rule file is printed, followed by a summary (on
+STDERR). Rules that exist in the instance but not in the directory are left
+as they are.
+
+Sample Commands (run from api_samples_python dir):
+    python3 -m detect.v1alpha.sync_rules -r=<region> \
+        -p=<project_id> -i=<instance_id> \
+        -d=<rules_dir> [--enabled=true|false] [--dry_run]
+
+API reference:
+    https://cloud.google.com/chronicle/docs/reference/rest/v1alpha/projects.locations.instances.rules/list
+    https://cloud.google.com/chronicle/docs/reference/rest/v1alpha/projects.locations.instances.rules.deployments/list
+    https://cloud.google.com/chronicle/docs/reference/rest/v1alpha/RuleDeployment
+"""
+import argparse
+import collections
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from typing import Any, Dict, List, Mapping, Sequence
+from common import chronicle_auth
+from common import project_id
+from common import project_instance
+from common import rate_limiter
+from common import regions
+from common import retry
+from google.auth.transport import requests
+
+from . import create_rule
+from . import enable_rule
+from . import list_rules
+from . import update_rule
+
+_LOGGER_ = logging.getLogger("sync_rules")
+
+CHRONICLE_API_BASE_URL = "https://chronicle.googleapis.com"
+
+SCOPES = [
+    "https://www.googleapis.com/auth/cloud-platform",
+]
+
+DEFAULT_RULE_FILE_SUFFIX = ".yaral"
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_QPS = 5.0
+# Maximum page size supported by the ListRuleDeployments API.
+MAX_PAGE_SIZE = 1000
+
+# Per-rule actions.
+CREATE = "create"
+UPDATE = "update"
+ENABLE = "enable"
+DISABLE = "disable"
+
+# Per-rule statuses in the results.
+DONE = "DONE"
+UNCHANGED = "UNCHANGED"
+PLANNED = "PLANNED"  # Dry run.
+FAILED = "FAILED"
+
+_RULE_NAME_RE = re.compile(r"^\s*rule\s+([A-Za-z_][A-Za-z0-9_]*)\s*\{",
+                           re.MULTILINE)
+
+
+def rule_name_of(rule_text: str) -> str:
+  """Returns the name of the rule in a YARA-L text (or "" if there's none)."""
+  match = _RULE_NAME_RE.search(rule_text)
+  return match.group(1) if match else ""
+
+
+def rule_hash(rule_text: str) -> str:
+  """Returns the SHA-256 hex digest of a rule text.
+
+  Trailing whitespace, leading and trailing blank lines and line endings are
+  normalized first, so they don't cause needless updates.
+
+  Args:
+    rule_text: YARA-L text of the rule.
+
+  Returns:
+    The hash of the normalized rule text.
+  """
+  lines = [line.rstrip() for line in rule_text.strip().splitlines()]
+  return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def load_rule_files(
+    rules_dir: str,
+    suffix: str = DEFAULT_RULE_FILE_SUFFIX) -> Dict[str, Dict[str, str]]:
+  """Reads the rule files in a directory.
+
+  Args:
+    rules_dir: path of the directory (not searched recursively)
+    suffix: file name suffix of rule files
+
+  Returns:
+    The "path" and "hash" of each rule file, by rule name.
+
+  Raises:
+    ValueError: A file has no rule name, or two files have the same one.
+  """
+  rule_files = {}
+  for file_name in sorted(os.listdir(rules_dir)):
+    path = os.path.join(rules_dir, file_name)
+    if not file_name.endswith(suffix) or not os.path.isfile(path):
+      continue
+    with open(path) as f:
+      text = f.read()
+    name = rule_name_of(text)
+    if not name:
+      raise ValueError(f"no rule name found in {path}")
+    if name in rule_files:
+      raise ValueError(
+          f"rule {name} is in both {rule_files[name]['path']} and {path}")
+    rule_files[name] = {"path": path, "hash": rule_hash(text)}
+  return rule_files
+
+
+def list_rule_deployments(
+    http_session: requests.AuthorizedSession,
+    proj_id: str,
+    proj_instance: str,
+    proj_region: str,
+) -> Dict[str, Mapping[str, Any]]:
+  """Gets the deployments of all the rules.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    proj_id: GCP project id or number to which the target instance belongs.
+    proj_instance: Customer ID (uuid with dashes) for the Chronicle instance.
+    proj_region: region in which the target project is located.
+
+  Returns:
+    The deployment of each rule, by rule ID ("ru_<UUID>").
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  base_url_with_region = regions.url_always_prepend_region(
+      CHRONICLE_API_BASE_URL,
+      proj_region
+  )
+  # pylint: disable-next=line-too-long
+  parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
+  url = f"{base_url_with_region}/v1alpha/{parent}/rules/-/deployments"
+
+  deployments = {}
+  params = {"pageSize": MAX_PAGE_SIZE}
+  while True:
+    # See API reference links at top of this file, for response format.
+    response = http_session.request("GET", url, params=params)
+    if response.status_code >= 400:
+      print(response.text)
+    response.raise_for_status()
+    page = response.json()
+    for deployment in page.get("ruleDeployments", []):
+      # Deployment names are ".../rules/<rule ID>/deployment".
+      deployments[deployment["name"].split("/")[-2]] = deployment
+    if not page.get("nextPageToken"):
+      return deployments
+    params["pageToken"] = page["nextPageToken"]
+
+
+def plan_sync(
+    rule_files: Mapping[str, Mapping[str, str]],
+    rules: Sequence[Mapping[str, Any]],
+    deployments: Mapping[str, Mapping[str, Any]],
+    enabled: bool | None = None,
+) -> List[Dict[str, Any]]:
+  """Compares rule files to the rules in an instance.
+
+  Args:
+    rule_files: rule files by rule name, from load_rule_files
+    rules: all the rules in the instance, from list_rules with the FULL view
+    deployments: rule deployments by rule ID, from list_rule_deployments
+    enabled: requested deployment state of the rules in the directory (None
+      leaves it as it is)
+
+  Returns:
+    A result for each rule file, with its "ruleName", "path", "ruleId" (empty
+    for rules to create), and the "actions" to apply (CREATE, UPDATE, ENABLE
+    and/or DISABLE) in order.
+  """
+  rules_by_name = {}
+  for rule in rules:
+    name = rule.get("displayName") or rule_name_of(rule.get("text", ""))
+    if name in rules_by_name:
+      _LOGGER_.warning("Rule %s exists more than once, syncing only %s", name,
+                       rules_by_name[name]["name"])
+      continue
+    rules_by_name[name] = rule
+
+  results = []
+  for name, rule_file in rule_files.items():
+    rule = rules_by_name.get(name)
+    actions = []
+    rule_id = ""
+    currently_enabled = False
+    if rule is None:
+      actions.append(CREATE)
+    else:
+      rule_id = rule["name"].split("/")[-1]
+      currently_enabled = deployments.get(rule_id, {}).get("enabled", False)
+      if rule_hash(rule.get("text", "")) != rule_file["hash"]:
+        actions.append(UPDATE)
+    if enabled is not None and enabled != currently_enabled:
+      actions.append(ENABLE if enabled else DISABLE)
+    results.append({
+        "ruleName": name,
+        "path": rule_file["path"],
+        "ruleId": rule_id,
+        "actions": actions,
+    })
+  return results
+
+
+def sync_rules(
+    http_session: requests.AuthorizedSession,
+    proj_id: str,
+    proj_instance: str,
+    proj_region: str,
+    rules_dir: str,
+    enabled: bool | None = None,
+    suffix: str = DEFAULT_RULE_FILE_SUFFIX,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    qps: float = DEFAULT_QPS,
+    dry_run: bool = False,
+) -> List[Dict[str, Any]]:
+  """Syncs the rules in an instance to a directory of rule files.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    proj_id: GCP project id or number to which the target instance belongs.
+    proj_instance: Customer ID (uuid with dashes) for the Chronicle instance.
+    proj_region: region in which the target project is located.
+    rules_dir: path of the directory with one YARA-L rule per file
+    enabled: requested deployment state of the rules in the directory (None
+      leaves it as it is, and new rules are then left disabled)
+    suffix: file name suffix of rule files
+    max_workers: maximum number of rules to sync at the same time
+    qps: maximum number of API calls per second
+    dry_run: only plan the changes, without applying them
+
+  Returns:
+    A result for each rule file (see plan_sync), with its "status" (DONE,
+    UNCHANGED, PLANNED or FAILED), and the "error" if it failed after retries.
+
+  Raises:
+    ValueError: Invalid rule files (see load_rule_files).
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400) while listing the rules.
+  """
+  rule_files = load_rule_files(rules_dir, suffix)
+  rules = list_rules.list_all_rules(http_session, proj_id, proj_instance,
+                                    proj_region, "FULL")
+  deployments = list_rule_deployments(http_session, proj_id, proj_instance,
+                                      proj_region)
+  results = plan_sync(rule_files, rules, deployments, enabled)
+
+  to_sync = []
+  for result in results:
+    if not result["actions"]:
+      result["status"] = UNCHANGED
+    elif dry_run:
+      result["status"] = PLANNED
+    else:
+      to_sync.append(result)
+  _LOGGER_.info("Syncing %d of %d rule files (%d rules in the instance)",
+                len(to_sync), len(results), len(rules))
+
+  limiter = rate_limiter.RateLimiter(qps)
+
+  def call_with_limits(func, *func_args, **func_kwargs):
+    def call():
+      limiter.acquire()
+      return func(*func_args, **func_kwargs)
+    return retry.call_with_retry(call)
+
+  def read_and_call(func, path, *func_args):
+    # The rule file is reopened on each attempt, since it's read to the end.
+    with open(path) as f:
+      return func(*func_args, f)
+
+  def sync(result: Dict[str, Any]):
+    path = result["path"]
+    for action in result["actions"]:
+      if action == CREATE:
+        rule = call_with_limits(read_and_call, create_rule.create_rule, path,
+                                http_session, proj_id, proj_instance,
+                                proj_region)
+        result["ruleId"] = rule["name"].split("/")[-1]
+      elif action == UPDATE:
+        call_with_limits(read_and_call, update_rule.update_rule, path,
+                         http_session, proj_region, proj_id, proj_instance,
+                         result["ruleId"])
+      else:
+        call_with_limits(enable_rule.enable_rule, http_session, proj_region,
+                         proj_id, proj_instance, result["ruleId"],
+                         action == ENABLE)
+
+  with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+    futures = {executor.submit(sync, r): r for r in to_sync}
+    for future in concurrent.futures.as_completed(futures):
+      result = futures[future]
+      try:
+        future.result()
+        result["status"] = DONE
+      except requests.requests.exceptions.RequestException as e:
+        result["status"] = FAILED
+        result["error"] = str(e)
+        _LOGGER_.error("Failed to sync %s: %s", result["path"], e)
+  return results
+
+
+def _bool(value: str) -> bool:
+  if value.lower() not in ("true", "false"):
+    raise argparse.ArgumentTypeError(f"expected true or false: {value}")
+  return value.lower() == "true"
+
+
+if __name__ == "__main__":
+  # Set up logger that will include timestamps.
+  logging.basicConfig(
+      level=logging.INFO,
+      format="%(asctime)s:%(levelname)s:%(name)s:%(message)s")
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  project_instance.add_argument_project_instance(parser)
+  project_id.add_argument_project_id(parser)
+  regions.add_argument_region(parser)
+  parser.add_argument(
+      "-d",
+      "--rules_dir",
+      type=str,
+      required=True,
+      help="path of a directory with one YARA-L rule per file")
+  parser.add_argument(
+      "--suffix",
+      type=str,
+      default=DEFAULT_RULE_FILE_SUFFIX,
+      help=("file name suffix of rule files " +
+            f"(default = '{DEFAULT_RULE_FILE_SUFFIX}')"))
+  parser.add_argument(
+      "--enabled",
+      type=_bool,
+      help=("deployment state to set for the rules in the directory, true or " +
+            "false (default = leave it as it is)"))
+  parser.add_argument(
+      "--max_workers",
+      type=int,
+      default=DEFAULT_MAX_WORKERS,
+      help="maximum number of concurrent rules " +
+      f"(default = {DEFAULT_MAX_WORKERS})")
+  parser.add_argument(
+      "--qps",
+      type=float,
+      default=DEFAULT_QPS,
+      help=f"maximum API calls per second (default = {DEFAULT_QPS})")
+  parser.add_argument(
+      "--dry_run",
+      action="store_true",
+      help="only print the planned changes")
+  args = parser.parse_args()
+  auth_session = chronicle_auth.initialize_http_session(
+      args.credentials_file,
+      SCOPES
+  )
+  sync_results = sync_rules(auth_session, args.project_id,
+                            args.project_instance, args.region, args.rules_dir,
+                            args.enabled, args.suffix, args.max_workers,
+                            args.qps, args.dry_run)
+  for r in sync_results:
+    print(json.dumps(r, separators=(",", ":")))
+  counts = collections.Counter(r["status"] for r in sync_results)
+  print(json.dumps(dict(sorted(counts.items()))), file=sys.stderr)
+  if counts[FAILED]:
+    sys.exit(1)
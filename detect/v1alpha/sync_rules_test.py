@@ -0,0 +1,170 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "sync_rules" module."""
+
+import os
+import tempfile
+import unittest
+
+from . import sync_rules
+
+PARENT = "projects/p/locations/us/instances/i"
+RULE_1 = "rule rule_1 {\n  condition:\n    true\n}\n"
+RULE_2 = "rule rule_2 {\n  condition:\n    false\n}\n"
+
+
+class RuleHashTest(unittest.TestCase):
+
+  def test_rule_name_of(self):
+    self.assertEqual(sync_rules.rule_name_of("// c\n  rule my_rule {"),
+                     "my_rule")
+    self.assertEqual(sync_rules.rule_name_of("not a rule"), "")
+
+  def test_whitespace_is_normalized(self):
+    variants = [
+        RULE_1,
+        "\n\n" + RULE_1 + "\n\n",
+        RULE_1.replace("\n", "\r\n"),
+        RULE_1.replace("\n", "  \n"),
+    ]
+    self.assertEqual(len({sync_rules.rule_hash(v) for v in variants}), 1)
+
+  def test_other_changes_change_the_hash(self):
+    self.assertNotEqual(sync_rules.rule_hash(RULE_1),
+                        sync_rules.rule_hash(RULE_1.replace("  cond", "cond")))
+    self.assertNotEqual(sync_rules.rule_hash(RULE_1),
+                        sync_rules.rule_hash(RULE_2))
+
+
+class LoadRuleFilesTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(self.tmp_dir.cleanup)
+
+  def write(self, file_name, text):
+    path = os.path.join(self.tmp_dir.name, file_name)
+    with open(path, "w") as f:
+      f.write(text)
+    return path
+
+  def test_load(self):
+    path_1 = self.write("a.yaral", RULE_1)
+    path_2 = self.write("b.yaral", RULE_2)
+    self.write("README.md", "not a rule")
+    os.mkdir(os.path.join(self.tmp_dir.name, "c.yaral"))
+
+    self.assertEqual(
+        sync_rules.load_rule_files(self.tmp_dir.name), {
+            "rule_1": {"path": path_1, "hash": sync_rules.rule_hash(RULE_1)},
+            "rule_2": {"path": path_2, "hash": sync_rules.rule_hash(RULE_2)},
+        })
+
+  def test_duplicate_rule_name(self):
+    self.write("a.yaral", RULE_1)
+    self.write("b.yaral", RULE_1)
+    with self.assertRaisesRegex(ValueError, "rule_1 is in both"):
+      sync_rules.load_rule_files(self.tmp_dir.name)
+
+  def test_missing_rule_name(self):
+    self.write("a.yaral", "condition: true")
+    with self.assertRaisesRegex(ValueError, "no rule name"):
+      sync_rules.load_rule_files(self.tmp_dir.name)
+
+
+class PlanSyncTest(unittest.TestCase):
+
+  def rule_files(self, **texts):
+    return {
+        name: {"path": f"{name}.yaral", "hash": sync_rules.rule_hash(text)}
+        for name, text in texts.items()
+    }
+
+  def rule(self, rule_id, text, display_name=None):
+    rule = {"name": f"{PARENT}/rules/{rule_id}", "text": text}
+    if display_name:
+      rule["displayName"] = display_name
+    return rule
+
+  def actions(self, results):
+    return {r["ruleName"]: (r["ruleId"], r["actions"]) for r in results}
+
+  def test_create_update_and_unchanged(self):
+    rule_files = self.rule_files(rule_1=RULE_1, rule_2=RULE_2,
+                                 rule_3="rule rule_3 {}")
+    rules = [
+        # Matched by the name in the text, without a display name.
+        self.rule("ru_1", RULE_1 + "\n"),
+        self.rule("ru_2", RULE_2.replace("false", "true"), "rule_2"),
+        # Rules that aren't in the directory are left as they are.
+        self.rule("ru_4", "rule rule_4 {}", "rule_4"),
+    ]
+
+    results = sync_rules.plan_sync(rule_files, rules, {})
+
+    self.assertEqual(
+        self.actions(results), {
+            "rule_1": ("ru_1", []),
+            "rule_2": ("ru_2", [sync_rules.UPDATE]),
+            "rule_3": ("", [sync_rules.CREATE]),
+        })
+    self.assertEqual(results[0]["path"], "rule_1.yaral")
+
+  def test_enable_and_disable(self):
+    rule_files = self.rule_files(rule_1=RULE_1, rule_2=RULE_2,
+                                 rule_3="rule rule_3 {}")
+    rules = [self.rule("ru_1", RULE_1), self.rule("ru_2", RULE_2)]
+    deployments = {"ru_1": {"enabled": True}, "ru_2": {}}
+
+    self.assertEqual(
+        self.actions(sync_rules.plan_sync(rule_files, rules, deployments,
+                                          enabled=True)), {
+            "rule_1": ("ru_1", []),
+            "rule_2": ("ru_2", [sync_rules.ENABLE]),
+            "rule_3": ("", [sync_rules.CREATE, sync_rules.ENABLE]),
+        })
+    self.assertEqual(
+        self.actions(sync_rules.plan_sync(rule_files, rules, deployments,
+                                          enabled=False)), {
+            "rule_1": ("ru_1", [sync_rules.DISABLE]),
+            "rule_2": ("ru_2", []),
+            "rule_3": ("", [sync_rules.CREATE]),
+        })
+    # Without a requested state, deployments are left as they are.
+    self.assertEqual(
+        self.actions(sync_rules.plan_sync(rule_files, rules, deployments)), {
+            "rule_1": ("ru_1", []),
+            "rule_2": ("ru_2", []),
+            "rule_3": ("", [sync_rules.CREATE]),
+        })
+
+  def test_duplicate_display_names(self):
+    rule_files = self.rule_files(rule_1=RULE_1)
+    rules = [
+        self.rule("ru_1", RULE_1.replace("true", "false"), "rule_1"),
+        self.rule("ru_2", RULE_1, "rule_1"),
+    ]
+
+    with self.assertLogs("sync_rules", "WARNING"):
+      results = sync_rules.plan_sync(rule_files, rules, {})
+
+    # Only the first rule with the name is synced.
+    self.assertEqual(self.actions(results),
+                     {"rule_1": ("ru_1", [sync_rules.UPDATE])})
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -95,6 +95,15 @@ VERDICT_ENUM = (
     "FALSE_POSITIVE",
 )
 
+# Feedback fields that the feedbackSummary of an Alert (as returned by
+# get_alert) echoes back under the same names, and that feedback_changes
+# compares to skip no-op updates.
+NOOP_CHECK_FIELDS = (
+    "priority",
+    "status",
+    "verdict",
+)
+
 
 def get_update_parser():
   """Returns an argparse.ArgumentParser for the update_alert command."""
@@ -220,6 +229,90 @@ def check_args(
                  "is required.")
 
 
+def build_feedback(
+    confidence_score: int | None = None,
+    reason: str | None = None,
+    reputation: str | None = None,
+    priority: str | None = None,
+    status: str | None = None,
+    verdict: str | None = None,
+    risk_score: int | None = None,
+    disregarded: bool | None = None,
+    severity: int | None = None,
+    comment: str | Literal[""] | None = None,
+    root_cause: str | Literal[""] | None = None,
+    ) -> dict[str, Any]:
+  """Returns the feedback of an update request, with only the set fields.
+
+  See update_alert for the arguments.
+  """
+  feedback = {}
+  if confidence_score or confidence_score == 0:
+    feedback["confidence_score"] = confidence_score
+  if reason:
+    feedback["reason"] = reason
+  if reputation:
+    feedback["reputation"] = reputation
+  if priority:
+    feedback["priority"] = priority
+  if status:
+    feedback["status"] = status
+  if verdict:
+    feedback["verdict"] = verdict
+  if risk_score or risk_score == 0:
+    feedback["risk_score"] = risk_score
+  if disregarded:
+    feedback["disregarded"] = disregarded
+  if severity or severity == 0:
+    feedback["severity"] = severity
+  if comment or comment == "":  # pylint: disable=g-explicit-bool-comparison
+    feedback["comment"] = comment
+  if root_cause or root_cause == "":  # pylint: disable=g-explicit-bool-comparison
+    feedback["root_cause"] = root_cause
+  return feedback
+
+
+def _is_default(value: Any) -> bool:
+  # Fields with default values are omitted from API responses.
+  return (value in (None, "") or
+          (isinstance(value, str) and value.endswith("_UNSPECIFIED")))
+
+
+def feedback_changes(
+    alert: Mapping[str, Any],
+    feedback: Mapping[str, Any],
+    ) -> dict[str, Any]:
+  """Returns the feedback fields that would change an Alert.
+
+  Only the NOOP_CHECK_FIELDS (priority, status and verdict) are compared with
+  the Alert's feedbackSummary, where a "*_UNSPECIFIED" value is the same as
+  an omitted one. The other fields (e.g. comment, reason or root_cause) are
+  not compared: they're written only along with a change of those fields. An
+  update without any of those fields always writes all of its fields.
+
+  Args:
+    alert: Dictionary representation of the Alert (see get_alert).
+    feedback: Feedback of an update request (see build_feedback).
+
+  Returns:
+    The fields of the feedback whose values differ from the Alert's current
+    feedbackSummary (an empty dictionary if updating the Alert is a no-op).
+  """
+  if not any(field in feedback for field in NOOP_CHECK_FIELDS):
+    return dict(feedback)
+  summary = alert.get("feedbackSummary", {})
+  changes = {}
+  for field in NOOP_CHECK_FIELDS:
+    if field not in feedback:
+      continue
+    value, current = feedback[field], summary.get(field)
+    if _is_default(value) and _is_default(current):
+      continue
+    if value != current:
+      changes[field] = value
+  return changes
+
+
 def update_alert(
     http_session: requests.AuthorizedSession,
     proj_id: str,
@@ -273,29 +366,19 @@ def update_alert(
   parent = f"projects/{proj_id}/locations/{proj_region}/instances/{proj_instance}"
   url = f"{base_url_with_region}/v1alpha/{parent}/legacy:legacyUpdateAlert/"
 
-  feedback = {}
-  if confidence_score or confidence_score == 0:
-    feedback["confidence_score"] = confidence_score
-  if reason:
-    feedback["reason"] = reason
-  if reputation:
-    feedback["reputation"] = reputation
-  if priority:
-    feedback["priority"] = priority
-  if status:
-    feedback["status"] = status
-  if verdict:
-    feedback["verdict"] = verdict
-  if risk_score or risk_score == 0:
-    feedback["risk_score"] = risk_score
-  if disregarded:
-    feedback["disregarded"] = disregarded
-  if severity or severity == 0:
-    feedback["severity"] = severity
-  if comment or comment == "":  # pylint: disable=g-explicit-bool-comparison
-    feedback["comment"] = comment
-  if root_cause or root_cause == "":  # pylint: disable=g-explicit-bool-comparison
-    feedback["root_cause"] = root_cause
+  feedback = build_feedback(
+      confidence_score,
+      reason,
+      reputation,
+      priority,
+      status,
+      verdict,
+      risk_score,
+      disregarded,
+      severity,
+      comment,
+      root_cause,
+  )
 
   payload = {
       "alert_id": alert_id,
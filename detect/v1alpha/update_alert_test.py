@@ -0,0 +1,87 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "update_alert" module."""
+
+import unittest
+
+from . import update_alert
+
+
+class BuildFeedbackTest(unittest.TestCase):
+
+  def test_only_set_fields(self):
+    self.assertEqual(
+        update_alert.build_feedback(status="CLOSED", priority=None),
+        {"status": "CLOSED"})
+
+  def test_zero_and_empty_values_are_set(self):
+    self.assertEqual(
+        update_alert.build_feedback(
+            confidence_score=0, risk_score=0, severity=0, comment="",
+            root_cause=""),
+        {"confidence_score": 0, "risk_score": 0, "severity": 0,
+         "comment": "", "root_cause": ""})
+
+
+class FeedbackChangesTest(unittest.TestCase):
+
+  def changes(self, summary, **feedback):
+    alert = {"id": "de_1"}
+    if summary is not None:
+      alert["feedbackSummary"] = summary
+    return update_alert.feedback_changes(alert, feedback)
+
+  def test_same_values(self):
+    summary = {"status": "CLOSED", "verdict": "TRUE_POSITIVE",
+               "priority": "PRIORITY_HIGH"}
+    self.assertEqual(
+        self.changes(summary, status="CLOSED", verdict="TRUE_POSITIVE",
+                     priority="PRIORITY_HIGH"), {})
+
+  def test_different_values(self):
+    summary = {"status": "OPEN", "verdict": "TRUE_POSITIVE"}
+    self.assertEqual(
+        self.changes(summary, status="CLOSED", verdict="TRUE_POSITIVE"),
+        {"status": "CLOSED"})
+
+  def test_unspecified_is_same_as_absent(self):
+    self.assertEqual(
+        self.changes({"status": "CLOSED"}, status="CLOSED",
+                     verdict="VERDICT_UNSPECIFIED",
+                     priority="PRIORITY_UNSPECIFIED"), {})
+    self.assertEqual(self.changes(None, verdict="VERDICT_UNSPECIFIED"), {})
+    self.assertEqual(
+        self.changes({"verdict": "FALSE_POSITIVE"},
+                     verdict="VERDICT_UNSPECIFIED"),
+        {"verdict": "VERDICT_UNSPECIFIED"})
+
+  def test_other_fields_are_not_compared(self):
+    # The comment, reason, root cause and scores don't prevent skipping an
+    # alert that already has the requested status.
+    summary = {"status": "CLOSED", "comment": "old", "confidenceScore": 10}
+    self.assertEqual(
+        self.changes(summary, status="CLOSED", comment="new",
+                     reason="REASON_MAINTENANCE", root_cause="Other",
+                     confidence_score=0), {})
+
+  def test_update_without_compared_fields_always_writes(self):
+    self.assertEqual(
+        self.changes({"comment": ""}, comment=""), {"comment": ""})
+    self.assertEqual(
+        self.changes(None, confidence_score=0), {"confidence_score": 0})
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Executable and reusable sample for analyzing detection rule errors.
+
+This module demonstrates combining multiple single-purpose modules into a larger
+workflow: the errors in a time range are listed with list_errors concurrently,
+one time shard at a time, and only their counts per rule, rule version, error
+category and hour are kept. The counts are saved in a state file together with
+a watermark, so each run only lists the errors since the previous run, and then
+reports the rules with the most errors and the change in their error rates.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import datetime
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.auth.transport import requests
+
+from common import chronicle_auth
+from common import datetime_converter
+from common import regions
+from common import time_ranges
+from . import list_errors
+
+# Set up logger that will include timestamps.
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s:%(levelname)s:%(name)s:%(message)s")
+_LOGGER_ = logging.getLogger("analyze_errors")
+
+# Maximum page size supported by the ListErrors API.
+MAX_PAGE_SIZE = 1000
+DEFAULT_SHARD_DURATION = datetime.timedelta(hours=6)
+DEFAULT_MAX_CONCURRENCY = 4
+# Counts of errors older than this are dropped from the state file.
+DEFAULT_RETENTION = datetime.timedelta(days=30)
+DEFAULT_WINDOW_HOURS = 24
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_HOUR = datetime.timedelta(hours=1)
+
+# (rule ID, version ID, error category, hours since the epoch).
+ErrorKey = Tuple[str, str, str, int]
+ErrorCounts = collections.Counter
+
+
+def hour_of(t: datetime.datetime) -> int:
+  """Returns the number of whole hours between the epoch and a time."""
+  return (t - _EPOCH) // _HOUR
+
+
+def count_errors(http_session: requests.AuthorizedSession,
+                 start_time: datetime.datetime,
+                 end_time: datetime.datetime,
+                 error_category: str = "",
+                 version_id: str = "") -> ErrorCounts:
+  """Lists all the errors in a time range, and counts them.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    start_time: The time to start listing errors from, inclusive.
+    end_time: The time to end listing errors to, exclusive.
+    error_category: Optional error category to filter by (see list_errors).
+    version_id: Optional rule or rule version ID to filter by (see
+      list_errors).
+
+  Returns:
+    Number of errors per (rule ID, version ID, error category, hour).
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  counts = ErrorCounts()
+  page_token = ""
+  while True:
+    errors, page_token = list_errors.list_errors(
+        http_session,
+        error_category,
+        start_time,
+        end_time,
+        version_id,
+        page_size=MAX_PAGE_SIZE,
+        page_token=page_token)
+    for error in errors:
+      rule_execution = error.get("ruleExecution", {})
+      hour = hour_of(datetime_converter.iso8601_datetime_utc(
+          error["errorTime"]))
+      # Interned, because the same few IDs repeat in many keys.
+      counts[(sys.intern(rule_execution.get("ruleId", "")),
+              sys.intern(rule_execution.get("versionId", "")),
+              sys.intern(error.get("category", "")), hour)] += 1
+    if not page_token:
+      return counts
+
+
+def crawl_errors(http_session: requests.AuthorizedSession,
+                 start_time: datetime.datetime,
+                 end_time: datetime.datetime,
+                 error_category: str = "",
+                 version_id: str = "",
+                 shard_duration: datetime.timedelta = DEFAULT_SHARD_DURATION,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+                ) -> ErrorCounts:
+  """Counts all the errors in a time range, listing time shards concurrently.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    start_time: The time to start listing errors from, inclusive.
+    end_time: The time to end listing errors to, exclusive.
+    error_category: Optional error category to filter by (see list_errors).
+    version_id: Optional rule or rule version ID to filter by (see
+      list_errors).
+    shard_duration: Maximum duration of the time range of each list_errors
+      crawl.
+    max_concurrency: Maximum number of time shards to list at the same time.
+
+  Returns:
+    Number of errors per (rule ID, version ID, error category, hour).
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  shards = time_ranges.split_time_range_by_duration(start_time, end_time,
+                                                    shard_duration)
+  counts = ErrorCounts()
+  with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+    futures = [
+        executor.submit(count_errors, http_session, shard_start, shard_end,
+                        error_category, version_id)
+        for shard_start, shard_end in shards
+    ]
+    for i, future in enumerate(concurrent.futures.as_completed(futures), 1):
+      counts.update(future.result())
+      _LOGGER_.info("Listed %d of %d time shards", i, len(shards))
+  return counts
+
+
+def _filters(error_category: str, version_id: str) -> Dict[str, str]:
+  return {"errorCategory": error_category, "versionId": version_id}
+
+
+def load_state(
+    state_file: str,
+    error_category: str = "",
+    version_id: str = "") -> Tuple[Optional[datetime.datetime], ErrorCounts]:
+  """Loads the watermark and the error counts of previous runs, if any.
+
+  Args:
+    state_file: Path of the JSON state file (see save_state).
+    error_category: Error category that the runs filtered by.
+    version_id: Rule or rule version ID that the runs filtered by.
+
+  Returns:
+    The watermark (or None if the file doesn't exist) and the error counts.
+
+  Raises:
+    ValueError: The state file was saved by runs with different filters, so
+      its watermark and counts don't apply to these ones.
+  """
+  if not os.path.exists(state_file):
+    return None, ErrorCounts()
+  with open(state_file) as f:
+    state = json.load(f)
+  filters = state.get("filters", _filters("", ""))
+  if filters != _filters(error_category, version_id):
+    raise ValueError(
+        f"state file {state_file} was saved with the filters {filters}, not "
+        f"{_filters(error_category, version_id)}; use another state file")
+  counts = ErrorCounts({tuple(row[:4]): row[4] for row in state["counts"]})
+  return datetime_converter.iso8601_datetime_utc(state["watermark"]), counts
+
+
+def save_state(state_file: str,
+               watermark: datetime.datetime,
+               counts: ErrorCounts,
+               error_category: str = "",
+               version_id: str = ""):
+  """Saves the watermark, the error counts, and their filters atomically."""
+  state = {
+      "filters": _filters(error_category, version_id),
+      "watermark": datetime_converter.strftime(watermark),
+      # Rows instead of objects, to keep the file compact.
+      "counts": [list(key) + [n] for key, n in sorted(counts.items())],
+  }
+  with open(state_file + ".tmp", "w") as f:
+    json.dump(state, f, separators=(",", ":"))
+  os.replace(state_file + ".tmp", state_file)
+
+
+def analyze_errors(http_session: requests.AuthorizedSession,
+                   state_file: str,
+                   initial_start_time: datetime.datetime,
+                   end_time: Optional[datetime.datetime] = None,
+                   error_category: str = "",
+                   version_id: str = "",
+                   retention: datetime.timedelta = DEFAULT_RETENTION,
+                   max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+                  ) -> ErrorCounts:
+  """Updates the error counts in a state file with the errors since last run.
+
+  The watermark is advanced only after all the errors up to it were counted,
+  so an interrupted run is simply repeated by the next one.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    state_file: Path of a JSON file with the watermark and the error counts of
+      previous runs (created if it doesn't exist).
+    initial_start_time: The time to start counting errors from, if the state
+      file doesn't exist.
+    end_time: The time to count errors up to, exclusive (default = now).
+    error_category: Optional error category to filter by (see list_errors).
+      All the runs with the same state file must use the same filters.
+    version_id: Optional rule or rule version ID to filter by (see
+      list_errors).
+    retention: Counts of errors that are older than this (relative to the end
+      time) are dropped.
+    max_concurrency: Maximum number of time shards to list at the same time.
+
+  Returns:
+    Number of errors per (rule ID, version ID, error category, hour), including
+    the previous runs.
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+    ValueError: The state file was saved with different filters.
+  """
+  watermark, counts = load_state(state_file, error_category, version_id)
+  start_time = watermark or initial_start_time
+  if end_time is None:
+    end_time = datetime.datetime.now(datetime.timezone.utc)
+  # Sub-seconds are truncated by list_errors, and would be skipped.
+  end_time = end_time.replace(microsecond=0)
+
+  if start_time < end_time:
+    counts.update(
+        crawl_errors(
+            http_session,
+            start_time,
+            end_time,
+            error_category,
+            version_id,
+            max_concurrency=max_concurrency))
+  else:
+    end_time = start_time
+
+  min_hour = hour_of(end_time - retention)
+  counts = ErrorCounts({k: n for k, n in counts.items() if k[3] >= min_hour})
+  save_state(state_file, end_time, counts, error_category, version_id)
+  return counts
+
+
+def top_offenders(counts: ErrorCounts,
+                  limit: int = 10,
+                  since_hour: int = 0) -> List[Dict[str, Any]]:
+  """Returns the rules with the most errors.
+
+  Args:
+    counts: Number of errors per (rule ID, version ID, error category, hour).
+    limit: Maximum number of rules to return.
+    since_hour: Only count errors since this hour (see hour_of).
+
+  Returns:
+    Summary of each rule, with its "ruleId", number of "errors", the number of
+    errors per "category", and the version ID with the most errors
+    ("topVersionId"), sorted by descending number of errors.
+  """
+  totals = collections.Counter()
+  categories = collections.defaultdict(collections.Counter)
+  versions = collections.defaultdict(collections.Counter)
+  for (rule_id, version_id, category, hour), n in counts.items():
+    if hour < since_hour:
+      continue
+    totals[rule_id] += n
+    categories[rule_id][category] += n
+    versions[rule_id][version_id] += n
+  return [{
+      "ruleId": rule_id,
+      "errors": n,
+      "categories": dict(categories[rule_id]),
+      "topVersionId": versions[rule_id].most_common(1)[0][0],
+  } for rule_id, n in totals.most_common(limit)]
+
+
+def error_trends(counts: ErrorCounts, end_hour: int,
+                 window_hours: int = DEFAULT_WINDOW_HOURS
+                ) -> List[Dict[str, Any]]:
+  """Compares each rule's errors in the latest window to the previous one.
+
+  Args:
+    counts: Number of errors per (rule ID, version ID, error category, hour).
+    end_hour: The hour at which the latest window ends, exclusive (see
+      hour_of).
+    window_hours: Duration of each window, in hours.
+
+  Returns:
+    Trend of each rule with errors in either window, with its "ruleId", the
+    number of errors in the "current" and "previous" windows, and the "change"
+    between them (as a ratio, or None if there were no previous errors),
+    sorted by descending increase in the number of errors.
+  """
+  current = collections.Counter()
+  previous = collections.Counter()
+  for (rule_id, _, _, hour), n in counts.items():
+    if end_hour - window_hours <= hour < end_hour:
+      current[rule_id] += n
+    elif end_hour - 2 * window_hours <= hour < end_hour - window_hours:
+      previous[rule_id] += n
+  trends = [{
+      "ruleId": rule_id,
+      "current": current[rule_id],
+      "previous": previous[rule_id],
+      "change": ((current[rule_id] - previous[rule_id]) / previous[rule_id]
+                 if previous[rule_id] else None),
+  } for rule_id in set(current) | set(previous)]
+  trends.sort(key=lambda t: (t["previous"] - t["current"], t["ruleId"]))
+  return trends
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  regions.add_argument_region(parser)
+  parser.add_argument(
+      "-sf",
+      "--state_file",
+      type=str,
+      required=True,
+      help="path of the JSON file with the watermark and the error counts")
+  parser.add_argument(
+      "-st",
+      "--start_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      help=("initial error start time in UTC ('yyyy-mm-ddThh:mm:ssZ'), if the "
+            "state file doesn't exist (default = the retention period)"))
+  parser.add_argument(
+      "-ec",
+      "--error_category",
+      type=str,
+      default="",
+      help="error category (i.e. 'RULES_EXECUTION_ERROR')")
+  parser.add_argument(
+      "-vi",
+      "--version_id",
+      type=str,
+      default="",
+      help="version ID of the detection rule to analyze errors for " +
+      "('ru_<UUID>[@v_<seconds>_<nanoseconds>]')")
+  parser.add_argument(
+      "-rd",
+      "--retention_days",
+      type=int,
+      default=DEFAULT_RETENTION.days,
+      help=("number of days to keep error counts for " +
+            f"(default = {DEFAULT_RETENTION.days})"))
+  parser.add_argument(
+      "-n",
+      "--top",
+      type=int,
+      default=10,
+      help="number of rules with the most errors to report (default = 10)")
+  parser.add_argument(
+      "-w",
+      "--window_hours",
+      type=int,
+      default=DEFAULT_WINDOW_HOURS,
+      help=("duration in hours of the windows to compare error rates in " +
+            f"(default = {DEFAULT_WINDOW_HOURS})"))
+  parser.add_argument(
+      "-mc",
+      "--max_concurrency",
+      type=int,
+      default=DEFAULT_MAX_CONCURRENCY,
+      help="maximum number of concurrent time shards " +
+      f"(default = {DEFAULT_MAX_CONCURRENCY})")
+
+  args = parser.parse_args()
+  list_errors.CHRONICLE_API_BASE_URL = regions.url(
+      list_errors.CHRONICLE_API_BASE_URL, args.region)
+  session = chronicle_auth.initialize_http_session(args.credentials_file)
+  now = datetime.datetime.now(datetime.timezone.utc)
+  retention_period = datetime.timedelta(days=args.retention_days)
+  error_counts = analyze_errors(session, args.state_file, args.start_time or
+                                now - retention_period, now,
+                                args.error_category, args.version_id,
+                                retention_period, args.max_concurrency)
+  now_hour = hour_of(now) + 1
+  print(json.dumps({
+      "topOffenders": top_offenders(error_counts, args.top,
+                                    now_hour - args.window_hours),
+      "trends": error_trends(error_counts, now_hour,
+                             args.window_hours)[:args.top],
+  }, indent=2))
@@ -0,0 +1,214 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "analyze_errors" module."""
+
+import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from common import datetime_converter
+from . import analyze_errors
+from . import list_errors
+
+START = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+ERRORS = [
+    ("2026-01-01T00:10:00Z", "ru_1", "ru_1@v_1_1"),
+    ("2026-01-01T00:20:00.123Z", "ru_1", "ru_1@v_1_1"),
+    ("2026-01-01T01:00:00Z", "ru_1", "ru_1@v_2_2"),
+    ("2026-01-01T07:00:00Z", "ru_2", "ru_2@v_1_1"),
+    ("2026-01-02T03:00:00Z", "ru_2", "ru_2@v_1_1"),
+]
+
+
+def fake_list_errors(http_session, error_category, error_start_time,
+                     error_end_time, version_id, page_size, page_token):
+  del http_session, version_id, page_size  # Unused.
+  errors = []
+  for error_time, rule_id, version_id in ERRORS:
+    t = datetime_converter.iso8601_datetime_utc(error_time)
+    if error_start_time <= t < error_end_time:
+      errors.append({
+          "category": error_category or "RULES_EXECUTION_ERROR",
+          "errorTime": error_time,
+          "ruleExecution": {
+              "ruleId": rule_id,
+              "versionId": version_id
+          },
+      })
+  # Return one error per page.
+  offset = int(page_token or 0)
+  next_token = str(offset + 1) if offset + 1 < len(errors) else ""
+  return errors[offset:offset + 1], next_token
+
+
+class AnalyzeErrorsTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    self.state_file = os.path.join(self.tmp_dir.name, "state.json")
+
+  def tearDown(self):
+    self.tmp_dir.cleanup()
+    super().tearDown()
+
+  @mock.patch.object(list_errors, "list_errors", autospec=True)
+  def test_crawl_errors(self, mock_list_errors):
+    mock_list_errors.side_effect = fake_list_errors
+    hour = analyze_errors.hour_of(START)
+
+    counts = analyze_errors.crawl_errors(None, START,
+                                         START + datetime.timedelta(days=2))
+
+    self.assertEqual(
+        counts, {
+            ("ru_1", "ru_1@v_1_1", "RULES_EXECUTION_ERROR", hour): 2,
+            ("ru_1", "ru_1@v_2_2", "RULES_EXECUTION_ERROR", hour + 1): 1,
+            ("ru_2", "ru_2@v_1_1", "RULES_EXECUTION_ERROR", hour + 7): 1,
+            ("ru_2", "ru_2@v_1_1", "RULES_EXECUTION_ERROR", hour + 27): 1,
+        })
+    # 8 shards of 6 hours, and extra pages in 2 of them.
+    self.assertEqual(mock_list_errors.call_count, 8 + 2)
+
+  @mock.patch.object(list_errors, "list_errors", autospec=True)
+  def test_analyze_errors_incrementally(self, mock_list_errors):
+    mock_list_errors.side_effect = fake_list_errors
+    end_time = START + datetime.timedelta(days=1)
+
+    counts = analyze_errors.analyze_errors(None, self.state_file, START,
+                                           end_time)
+    self.assertEqual(sum(counts.values()), 4)
+    self.assertEqual(mock_list_errors.call_count, 4 + 2)
+
+    # The next run only lists errors since the watermark.
+    mock_list_errors.reset_mock()
+    counts = analyze_errors.analyze_errors(
+        None, self.state_file, START, end_time + datetime.timedelta(hours=6))
+    self.assertEqual(sum(counts.values()), 5)
+    self.assertEqual(mock_list_errors.call_count, 1)
+    args, kwargs = mock_list_errors.call_args
+    self.assertEqual(args[2], end_time)
+    self.assertEqual(kwargs["page_size"], analyze_errors.MAX_PAGE_SIZE)
+
+    watermark, saved_counts = analyze_errors.load_state(self.state_file)
+    self.assertEqual(watermark, end_time + datetime.timedelta(hours=6))
+    self.assertEqual(saved_counts, counts)
+
+  @mock.patch.object(list_errors, "list_errors", autospec=True)
+  def test_analyze_errors_rejects_other_filters(self, mock_list_errors):
+    mock_list_errors.side_effect = fake_list_errors
+    end_time = START + datetime.timedelta(days=1)
+    analyze_errors.analyze_errors(
+        None, self.state_file, START, end_time, version_id="ru_1")
+
+    with self.assertRaises(ValueError):
+      analyze_errors.analyze_errors(
+          None, self.state_file, START, end_time, version_id="ru_2")
+    with self.assertRaises(ValueError):
+      analyze_errors.analyze_errors(
+          None,
+          self.state_file,
+          START,
+          end_time,
+          error_category="RULES_EXECUTION_ERROR",
+          version_id="ru_1")
+    watermark, _ = analyze_errors.load_state(
+        self.state_file, version_id="ru_1")
+    self.assertEqual(watermark, end_time)
+
+  @mock.patch.object(list_errors, "list_errors", autospec=True)
+  def test_analyze_errors_drops_old_counts(self, mock_list_errors):
+    mock_list_errors.side_effect = fake_list_errors
+
+    counts = analyze_errors.analyze_errors(
+        None,
+        self.state_file,
+        START,
+        START + datetime.timedelta(days=2),
+        retention=datetime.timedelta(hours=24))
+
+    self.assertEqual(list(counts.values()), [1])
+
+  def test_top_offenders(self):
+    hour = analyze_errors.hour_of(START)
+    counts = analyze_errors.ErrorCounts({
+        ("ru_1", "ru_1@v_1_1", "RULES_EXECUTION_ERROR", hour): 2,
+        ("ru_1", "ru_1@v_2_2", "RULES_EXECUTION_ERROR", hour + 1): 3,
+        ("ru_1", "ru_1@v_2_2", "OTHER_ERROR", hour + 2): 1,
+        ("ru_2", "ru_2@v_1_1", "RULES_EXECUTION_ERROR", hour + 2): 5,
+        ("ru_3", "ru_3@v_1_1", "RULES_EXECUTION_ERROR", hour): 1,
+    })
+
+    self.assertEqual(
+        analyze_errors.top_offenders(counts, limit=2), [
+            {
+                "ruleId": "ru_1",
+                "errors": 6,
+                "categories": {
+                    "RULES_EXECUTION_ERROR": 5,
+                    "OTHER_ERROR": 1
+                },
+                "topVersionId": "ru_1@v_2_2",
+            },
+            {
+                "ruleId": "ru_2",
+                "errors": 5,
+                "categories": {
+                    "RULES_EXECUTION_ERROR": 5
+                },
+                "topVersionId": "ru_2@v_1_1",
+            },
+        ])
+    self.assertEqual(
+        [t["ruleId"] for t in analyze_errors.top_offenders(
+            counts, since_hour=hour + 2)], ["ru_2", "ru_1"])
+
+  def test_error_trends(self):
+    counts = analyze_errors.ErrorCounts({
+        ("ru_1", "v", "C", 10): 4,  # Previous window.
+        ("ru_1", "v", "C", 12): 1,
+        ("ru_2", "v", "C", 13): 3,
+        ("ru_3", "v", "C", 11): 2,
+        ("ru_3", "v", "C", 13): 2,
+        ("ru_4", "v", "C", 9): 7,  # Too old.
+    })
+
+    self.assertEqual(
+        analyze_errors.error_trends(counts, end_hour=14, window_hours=2), [
+            {
+                "ruleId": "ru_2",
+                "current": 3,
+                "previous": 0,
+                "change": None
+            },
+            {
+                "ruleId": "ru_3",
+                "current": 2,
+                "previous": 2,
+                "change": 0.0
+            },
+            {
+                "ruleId": "ru_1",
+                "current": 1,
+                "previous": 4,
+                "change": -0.75
+            },
+        ])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Executable and reusable sample for rule lifecycle operations in bulk.
+
+This module demonstrates combining multiple single-purpose modules into a larger
+workflow: rules are selected by ID and/or by name from a single list_rules
+crawl, rules that are already in the target state are skipped, and the
+operation (e.g. enable_live_rule) is applied to the rest concurrently, under a
+rate limit, with retries of transient errors.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import logging
+import re
+import sys
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from google.auth.transport import requests
+
+from common import chronicle_auth
+from common import rate_limiter
+from common import regions
+from common import retry
+from . import archive_rule
+from . import delete_rule
+from . import disable_alerting
+from . import disable_live_rule
+from . import enable_alerting
+from . import enable_live_rule
+from . import list_rules
+from . import unarchive_rule
+
+# Set up logger that will include timestamps.
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s:%(levelname)s:%(name)s:%(message)s")
+_LOGGER_ = logging.getLogger("bulk_rule_operations")
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_QPS = 10.0
+
+Rule = Mapping[str, Any]
+
+# Operation name -> (module, function that checks whether a rule from
+# list_rules is already in the operation's target state).
+OPERATIONS: Dict[str, Any] = {
+    "enable_live_rule": (enable_live_rule,
+                         lambda r: r.get("liveRuleEnabled", False)),
+    "disable_live_rule": (disable_live_rule,
+                          lambda r: not r.get("liveRuleEnabled", False)),
+    "enable_alerting": (enable_alerting,
+                        lambda r: r.get("alertingEnabled", False)),
+    "disable_alerting": (disable_alerting,
+                         lambda r: not r.get("alertingEnabled", False)),
+    "archive_rule": (archive_rule, lambda r: "archivedTime" in r),
+    "unarchive_rule": (unarchive_rule, lambda r: "archivedTime" not in r),
+    "delete_rule": (delete_rule, lambda r: False),
+}
+
+# Per-rule statuses in the report.
+DONE = "DONE"
+SKIPPED = "SKIPPED"  # Already in the target state.
+NOT_FOUND = "NOT_FOUND"
+FAILED = "FAILED"
+DRY_RUN = "DRY_RUN"
+
+
+def select_rules(rules: Sequence[Rule],
+                 rule_ids: Sequence[str] = (),
+                 name_pattern: str = "") -> List[Dict[str, Any]]:
+  """Selects rules by ID and/or by name.
+
+  Args:
+    rules: All the rules, from list_rules.
+    rule_ids: IDs of rules to select ("ru_<UUID>").
+    name_pattern: Regular expression to select rules whose names match.
+
+  Returns:
+    Report entries for the selected rules, with their "ruleId" and "ruleName".
+    Requested rule IDs that weren't listed have the status NOT_FOUND.
+  """
+  rules_by_id = {r["ruleId"]: r for r in rules}
+  selected = {rule_id: None for rule_id in rule_ids}
+  if name_pattern:
+    regex = re.compile(name_pattern)
+    for rule in rules:
+      if regex.search(rule.get("ruleName", "")):
+        selected[rule["ruleId"]] = None
+
+  entries = []
+  for rule_id in selected:
+    rule = rules_by_id.get(rule_id)
+    entry = {"ruleId": rule_id, "ruleName": (rule or {}).get("ruleName", "")}
+    if rule is None:
+      entry["status"] = NOT_FOUND
+    entries.append(entry)
+  return entries
+
+
+def run_bulk_operation(http_session: requests.AuthorizedSession,
+                       operation: str,
+                       rules: Sequence[Rule],
+                       rule_ids: Sequence[str] = (),
+                       name_pattern: str = "",
+                       max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                       qps: float = DEFAULT_QPS,
+                       dry_run: bool = False,
+                       sleep: Optional[Callable[[float], None]] = None
+                      ) -> List[Dict[str, Any]]:
+  """Applies a rule lifecycle operation to many rules concurrently.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    operation: Name of the operation (one of OPERATIONS).
+    rules: All the rules, from list_rules (with the archive state 'ALL', to
+      find archived rules too).
+    rule_ids: IDs of rules to apply the operation to ("ru_<UUID>").
+    name_pattern: Regular expression of rule names to apply the operation to.
+    max_concurrency: Maximum number of operations at the same time.
+    qps: Maximum number of operations per second.
+    dry_run: Only report the rules that would be changed.
+    sleep: Optional function that sleeps between retries (for testing).
+
+  Returns:
+    Report entry for each selected rule, with its "ruleId", "ruleName",
+    "status" (DONE, SKIPPED, NOT_FOUND, FAILED, or DRY_RUN), and "error" if
+    it failed after retries.
+
+  Raises:
+    ValueError: Unknown operation.
+  """
+  if operation not in OPERATIONS:
+    raise ValueError(f"unknown operation: {operation}")
+  module, in_target_state = OPERATIONS[operation]
+  func = getattr(module, operation)
+  rules_by_id = {r["ruleId"]: r for r in rules}
+
+  entries = select_rules(rules, rule_ids, name_pattern)
+  to_run = []
+  for entry in entries:
+    if "status" in entry:
+      continue
+    if in_target_state(rules_by_id[entry["ruleId"]]):
+      entry["status"] = SKIPPED
+    elif dry_run:
+      entry["status"] = DRY_RUN
+    else:
+      to_run.append(entry)
+  _LOGGER_.info("Running %s on %d of %d selected rules", operation,
+                len(to_run), len(entries))
+
+  limiter = rate_limiter.RateLimiter(qps)
+  retry_kwargs = {"sleep": sleep} if sleep else {}
+
+  def run(entry: Dict[str, Any]):
+    def call():
+      limiter.acquire()
+      func(http_session, entry["ruleId"])
+
+    try:
+      retry.call_with_retry(call, **retry_kwargs)
+      entry["status"] = DONE
+    except requests.requests.exceptions.RequestException as e:
+      entry["status"] = FAILED
+      entry["error"] = str(e)
+
+  with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+    for future in concurrent.futures.as_completed(
+        [executor.submit(run, entry) for entry in to_run]):
+      future.result()
+  return entries
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  regions.add_argument_region(parser)
+  parser.add_argument(
+      "-op",
+      "--operation",
+      type=str,
+      choices=sorted(OPERATIONS),
+      required=True,
+      help="rule lifecycle operation to apply")
+  parser.add_argument(
+      "-f",
+      "--rule_ids_file",
+      type=argparse.FileType("r"),
+      help="path of a file with one rule ID ('ru_<UUID>') per line")
+  parser.add_argument(
+      "-n",
+      "--name_pattern",
+      type=str,
+      default="",
+      help="regular expression of rule names to apply the operation to")
+  parser.add_argument(
+      "-mc",
+      "--max_concurrency",
+      type=int,
+      default=DEFAULT_MAX_CONCURRENCY,
+      help="maximum number of concurrent operations " +
+      f"(default = {DEFAULT_MAX_CONCURRENCY})")
+  parser.add_argument(
+      "-q",
+      "--qps",
+      type=float,
+      default=DEFAULT_QPS,
+      help=f"maximum operations per second (default = {DEFAULT_QPS})")
+  parser.add_argument(
+      "-o",
+      "--report_file",
+      type=argparse.FileType("w"),
+      default=sys.stdout,
+      help="file to write the per-rule report to, in JSON (default = STDOUT)")
+  parser.add_argument(
+      "-dr",
+      "--dry_run",
+      action="store_true",
+      help="only report the rules that would be changed")
+
+  args = parser.parse_args()
+  if not args.rule_ids_file and not args.name_pattern:
+    parser.error("either --rule_ids_file or --name_pattern is required")
+
+  for m in [list_rules] + [m for m, _ in OPERATIONS.values()]:
+    m.CHRONICLE_API_BASE_URL = regions.url(m.CHRONICLE_API_BASE_URL,
+                                           args.region)
+  session = chronicle_auth.initialize_http_session(args.credentials_file)
+  ids = []
+  if args.rule_ids_file:
+    ids = [line.strip() for line in args.rule_ids_file if line.strip()]
+  report = run_bulk_operation(
+      session,
+      args.operation,
+      list_rules.list_all_rules(session, "ALL"),
+      ids,
+      args.name_pattern,
+      args.max_concurrency,
+      args.qps,
+      args.dry_run)
+  json.dump(report, args.report_file, indent=2)
+  args.report_file.write("\n")
+  failures = [e for e in report if e["status"] in (FAILED, NOT_FOUND)]
+  _LOGGER_.info("%d rules selected, %d failed or not found", len(report),
+                len(failures))
+  if failures:
+    sys.exit(1)
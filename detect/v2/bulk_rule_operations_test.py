@@ -0,0 +1,130 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "bulk_rule_operations" module."""
+
+import unittest
+from unittest import mock
+
+from google.auth.transport import requests
+
+from . import bulk_rule_operations
+from . import enable_live_rule
+
+RULES = [
+    {
+        "ruleId": "ru_1",
+        "ruleName": "incident_a"
+    },
+    {
+        "ruleId": "ru_2",
+        "ruleName": "incident_b",
+        "liveRuleEnabled": True
+    },
+    {
+        "ruleId": "ru_3",
+        "ruleName": "other"
+    },
+    {
+        "ruleId": "ru_4",
+        "ruleName": "incident_c"
+    },
+]
+
+
+def http_error(status_code):
+  response = requests.requests.Response()
+  response.status_code = status_code
+  return requests.requests.exceptions.HTTPError(response=response)
+
+
+class BulkRuleOperationsTest(unittest.TestCase):
+
+  def test_select_rules(self):
+    entries = bulk_rule_operations.select_rules(RULES, ["ru_3", "ru_9"],
+                                                "^incident_")
+    self.assertEqual(entries, [
+        {
+            "ruleId": "ru_3",
+            "ruleName": "other"
+        },
+        {
+            "ruleId": "ru_9",
+            "ruleName": "",
+            "status": bulk_rule_operations.NOT_FOUND
+        },
+        {
+            "ruleId": "ru_1",
+            "ruleName": "incident_a"
+        },
+        {
+            "ruleId": "ru_2",
+            "ruleName": "incident_b"
+        },
+        {
+            "ruleId": "ru_4",
+            "ruleName": "incident_c"
+        },
+    ])
+
+  @mock.patch.object(enable_live_rule, "enable_live_rule", autospec=True)
+  def test_run_bulk_operation(self, mock_enable_live_rule):
+    # ru_4 fails transiently once, and then succeeds.
+    errors = {"ru_4": [http_error(503)]}
+
+    def fake_enable_live_rule(http_session, rule_id):
+      del http_session  # Unused.
+      if errors.get(rule_id):
+        raise errors[rule_id].pop()
+
+    mock_enable_live_rule.side_effect = fake_enable_live_rule
+
+    report = bulk_rule_operations.run_bulk_operation(
+        None,
+        "enable_live_rule",
+        RULES,
+        name_pattern="^incident_",
+        qps=1000,
+        sleep=lambda _: None)
+
+    self.assertEqual({e["ruleId"]: e["status"] for e in report}, {
+        "ru_1": bulk_rule_operations.DONE,
+        "ru_2": bulk_rule_operations.SKIPPED,
+        "ru_4": bulk_rule_operations.DONE,
+    })
+    self.assertEqual(mock_enable_live_rule.call_count, 3)
+
+  @mock.patch.object(enable_live_rule, "enable_live_rule", autospec=True)
+  def test_run_bulk_operation_failure(self, mock_enable_live_rule):
+    mock_enable_live_rule.side_effect = http_error(403)
+
+    report = bulk_rule_operations.run_bulk_operation(
+        None, "enable_live_rule", RULES, ["ru_1"], qps=1000)
+
+    self.assertEqual(report[0]["status"], bulk_rule_operations.FAILED)
+    self.assertEqual(mock_enable_live_rule.call_count, 1)
+
+  @mock.patch.object(enable_live_rule, "enable_live_rule", autospec=True)
+  def test_dry_run(self, mock_enable_live_rule):
+    report = bulk_rule_operations.run_bulk_operation(
+        None, "enable_live_rule", RULES, ["ru_1", "ru_2"], dry_run=True)
+
+    self.assertEqual([e["status"] for e in report], [
+        bulk_rule_operations.DRY_RUN, bulk_rule_operations.SKIPPED
+    ])
+    mock_enable_live_rule.assert_not_called()
+
+
+if __name__ == "__main__":
+  unittest.main()
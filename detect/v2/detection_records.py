@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Executable and reusable sample for holding many detections in memory.
+
+Detections from the API are nested dictionaries, which take a lot of memory
+per detection. A DetectionRecord keeps only the frequently used fields as
+attributes (with interned rule IDs and names, and times as integers of
+nanoseconds since the epoch), and the rest of the detection (most notably the
+collection elements) as compact JSON bytes that are decoded only on access.
+
+Records can be converted from the outputs of list_detections,
+stream_detection_alerts, iter_test_rule_results, and NDJSON files written by
+export_detections.
+"""
+
+import argparse
+import collections
+import datetime
+import json
+import sys
+from typing import (Any, Dict, Iterable, Iterator, List, Mapping, Sequence,
+                    TextIO, Tuple)
+
+from common import datetime_converter
+from . import stream_test_rule
+
+Detection = Mapping[str, Any]
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+# Top-level and "detection" fields that are stored as attributes.
+_DETECTION_FIELDS = ("id", "type", "detectionTime", "timeWindow",
+                     "collectionElements", "detection")
+_RULE_FIELDS = ("ruleId", "ruleName", "ruleVersion", "alertState")
+
+
+def timestamp_ns(timestamp: str) -> int:
+  """Converts an ISO 8601 UTC timestamp to nanoseconds since the epoch.
+
+  Unlike datetime_converter.iso8601_datetime_utc, sub-microsecond digits are
+  kept.
+
+  Args:
+    timestamp: Timestamp in the format "yyyy-mm-ddThh:mm:ss[.fffffffff]Z".
+
+  Returns:
+    Number of nanoseconds since the epoch.
+
+  Raises:
+    ValueError: Invalid input value.
+  """
+  seconds, _, fraction = timestamp.rstrip("Zz").partition(".")
+  t = datetime_converter.iso8601_datetime_utc(seconds)
+  return ((t - _EPOCH) // datetime.timedelta(seconds=1) * 1_000_000_000 +
+          int(fraction[:9].ljust(9, "0")))
+
+
+def format_timestamp_ns(ns: int) -> str:
+  """Converts nanoseconds since the epoch to an ISO 8601 UTC timestamp."""
+  seconds, fraction = divmod(ns, 1_000_000_000)
+  t = datetime_converter.strftime(_EPOCH + datetime.timedelta(seconds=seconds))
+  if fraction:
+    t = t[:-1] + "." + f"{fraction:09d}".rstrip("0") + "Z"
+  return t
+
+
+def _intern(s: str) -> str:
+  return sys.intern(s) if s else ""
+
+
+def _encode(value: Any) -> bytes:
+  return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+class DetectionRecord:
+  """Compact, read-only representation of a detection."""
+
+  __slots__ = ("id", "type", "rule_id", "rule_name", "rule_version",
+               "alert_state", "detection_time_ns", "window_start_ns",
+               "window_end_ns", "_collection_elements", "_other_fields")
+
+  def __init__(self, detection: Detection):
+    """Initializes the record from a detection.
+
+    Args:
+      detection: A detection, in the format of the list_detections API.
+    """
+    rule_detection = (detection.get("detection") or [{}])[0]
+    time_window = detection.get("timeWindow", {})
+    self.id = detection["id"]
+    self.type = _intern(detection.get("type", ""))
+    self.rule_id = _intern(rule_detection.get("ruleId", ""))
+    self.rule_name = _intern(rule_detection.get("ruleName", ""))
+    # ruleVersion is only populated for RULE_DETECTION type detections.
+    self.rule_version = _intern(rule_detection.get("ruleVersion", ""))
+    self.alert_state = _intern(rule_detection.get("alertState", ""))
+    self.detection_time_ns = timestamp_ns(detection["detectionTime"])
+    self.window_start_ns = (
+        timestamp_ns(time_window["startTime"])
+        if "startTime" in time_window else None)
+    self.window_end_ns = (
+        timestamp_ns(time_window["endTime"])
+        if "endTime" in time_window else None)
+    self._collection_elements = _encode(
+        detection.get("collectionElements", []))
+    other_fields = {
+        k: v for k, v in detection.items() if k not in _DETECTION_FIELDS
+    }
+    other_rule_fields = {
+        k: v for k, v in rule_detection.items() if k not in _RULE_FIELDS
+    }
+    if other_rule_fields:
+      other_fields["detection"] = other_rule_fields
+    self._other_fields = _encode(other_fields) if other_fields else b""
+
+  @property
+  def collection_elements(self) -> List[Dict[str, Any]]:
+    """The detection's collection elements (decoded on each access)."""
+    return json.loads(self._collection_elements)
+
+  @property
+  def detection_fields(self) -> Dict[str, str]:
+    """The outcome and match variables of the detection, by name."""
+    fields = self._decode_other_fields().get("detection", {})
+    return {
+        f["key"]: f.get("value", "")
+        for f in fields.get("detectionFields", [])
+    }
+
+  def _decode_other_fields(self) -> Dict[str, Any]:
+    return json.loads(self._other_fields) if self._other_fields else {}
+
+  def to_dict(self) -> Dict[str, Any]:
+    """Converts the record back to a detection, in the API format.
+
+    Timestamps are formatted with only as many sub-second digits as needed.
+    """
+    detection = self._decode_other_fields()
+    rule_detection = detection.pop("detection", {})
+    for key, value in (("ruleId", self.rule_id), ("ruleName", self.rule_name),
+                       ("ruleVersion", self.rule_version),
+                       ("alertState", self.alert_state)):
+      if value:
+        rule_detection[key] = value
+    detection.update({
+        "id": self.id,
+        "detectionTime": format_timestamp_ns(self.detection_time_ns),
+        "collectionElements": self.collection_elements,
+        "detection": [rule_detection],
+    })
+    if self.type:
+      detection["type"] = self.type
+    time_window = {}
+    if self.window_start_ns is not None:
+      time_window["startTime"] = format_timestamp_ns(self.window_start_ns)
+    if self.window_end_ns is not None:
+      time_window["endTime"] = format_timestamp_ns(self.window_end_ns)
+    if time_window:
+      detection["timeWindow"] = time_window
+    return detection
+
+  def __repr__(self) -> str:
+    return (f"DetectionRecord({self.id}, {self.rule_id}, "
+            f"{format_timestamp_ns(self.detection_time_ns)})")
+
+
+def from_detections(
+    detections: Iterable[Detection]) -> Iterator[DetectionRecord]:
+  """Converts detections (e.g. a page from list_detections) to records."""
+  for detection in detections:
+    yield DetectionRecord(detection)
+
+
+def from_detection_batch(
+    detection_batch: Tuple[Sequence[Detection], str]) -> List[DetectionRecord]:
+  """Converts a detection batch from stream_detection_alerts to records."""
+  detections, _ = detection_batch
+  return list(from_detections(detections))
+
+
+def from_test_rule_results(
+    results: Iterable[Tuple[str, Mapping[str, Any]]]
+) -> Iterator[DetectionRecord]:
+  """Converts the detections from iter_test_rule_results to records.
+
+  Rule execution errors are skipped.
+  """
+  for kind, result in results:
+    if kind == stream_test_rule.DETECTION:
+      yield DetectionRecord(result)
+
+
+def read_ndjson(f: TextIO) -> Iterator[DetectionRecord]:
+  """Reads records from a file with one detection in JSON per line."""
+  for line in f:
+    if line.strip():
+      yield DetectionRecord(json.loads(line))
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  parser.add_argument(
+      "-i",
+      "--input_file",
+      type=argparse.FileType("r"),
+      default=sys.stdin,
+      help=("NDJSON file of detections, e.g. from export_detections " +
+            "(default = STDIN)"))
+
+  args = parser.parse_args()
+  records = list(read_ndjson(args.input_file))
+  per_rule = collections.Counter((r.rule_id, r.rule_name) for r in records)
+  print(f"Loaded {len(records)} detections of {len(per_rule)} rules")
+  for (rule_id, rule_name), count in per_rule.most_common():
+    print(f"{count}\t{rule_id}\t{rule_name}")
@@ -0,0 +1,130 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "detection_records" module."""
+
+import io
+import json
+import unittest
+
+from . import detection_records
+from . import stream_test_rule
+
+DETECTION = {
+    "id": "de_1",
+    "type": "RULE_DETECTION",
+    "createdTime": "2026-01-01T00:00:05Z",
+    "detectionTime": "2026-01-01T00:00:00.123456789Z",
+    "timeWindow": {
+        "startTime": "2025-12-31T23:00:00Z",
+        "endTime": "2026-01-01T00:00:00.5Z",
+    },
+    "collectionElements": [{
+        "label": "e1",
+        "references": [{
+            "event": {
+                "metadata": {
+                    "eventType": "USER_LOGIN"
+                }
+            }
+        }],
+    }],
+    "detection": [{
+        "ruleId": "ru_1",
+        "ruleName": "rule_1",
+        "ruleVersion": "ru_1@v_1_1",
+        "alertState": "ALERTING",
+        "ruleType": "SINGLE_EVENT",
+        "detectionFields": [{
+            "key": "user",
+            "value": "alice"
+        }],
+    }],
+}
+
+
+class DetectionRecordsTest(unittest.TestCase):
+
+  def test_timestamp_ns(self):
+    self.assertEqual(
+        detection_records.timestamp_ns("1970-01-01T00:00:01Z"), 1_000_000_000)
+    self.assertEqual(
+        detection_records.timestamp_ns("1970-01-01T00:00:01.000000002Z"),
+        1_000_000_002)
+    self.assertEqual(
+        detection_records.timestamp_ns("1970-01-01T00:00:00.25Z"),
+        250_000_000)
+    self.assertEqual(
+        detection_records.format_timestamp_ns(1_250_000_000),
+        "1970-01-01T00:00:01.25Z")
+    self.assertEqual(
+        detection_records.format_timestamp_ns(1_000_000_000),
+        "1970-01-01T00:00:01Z")
+
+  def test_detection_record(self):
+    record = detection_records.DetectionRecord(DETECTION)
+
+    self.assertEqual(record.id, "de_1")
+    self.assertEqual(record.type, "RULE_DETECTION")
+    self.assertEqual(record.rule_id, "ru_1")
+    self.assertEqual(record.rule_name, "rule_1")
+    self.assertEqual(record.rule_version, "ru_1@v_1_1")
+    self.assertEqual(record.alert_state, "ALERTING")
+    self.assertEqual(record.detection_time_ns % 1_000_000_000, 123456789)
+    self.assertEqual(record.window_end_ns - record.window_start_ns,
+                     3600_500_000_000)
+    self.assertEqual(record.collection_elements,
+                     DETECTION["collectionElements"])
+    self.assertEqual(record.detection_fields, {"user": "alice"})
+    self.assertEqual(record.to_dict(), DETECTION)
+    with self.assertRaises(AttributeError):
+      record.extra = 1
+
+  def test_interned_strings(self):
+    # Strings that are parsed separately are distinct objects, unless interned.
+    first, second = detection_records.read_ndjson(
+        io.StringIO(json.dumps(DETECTION) + "\n\n" + json.dumps(DETECTION)))
+
+    self.assertIs(first.rule_id, second.rule_id)
+    self.assertIs(first.rule_name, second.rule_name)
+
+  def test_from_stream_outputs(self):
+    gcti_finding = {
+        "id": "de_2",
+        "type": "GCTI_FINDING",
+        "detectionTime": "2026-01-01T00:00:00Z",
+        "detection": [{
+            "ruleId": "ur_1",
+            "ruleName": "curated",
+            "ruleSet": "rs_1"
+        }],
+        "tags": ["t"],
+    }
+
+    batch = detection_records.from_detection_batch(
+        ([DETECTION, gcti_finding], "2026-01-01T00:00:00Z"))
+    self.assertEqual([r.id for r in batch], ["de_1", "de_2"])
+    self.assertEqual(batch[1].rule_version, "")
+    self.assertEqual(batch[1].to_dict(), dict(gcti_finding,
+                                               collectionElements=[]))
+
+    results = [(stream_test_rule.DETECTION, DETECTION),
+               (stream_test_rule.EXECUTION_ERROR, {"errorId": "ed_1"})]
+    self.assertEqual(
+        [r.id for r in detection_records.from_test_rule_results(results)],
+        ["de_1"])
+
+
+if __name__ == "__main__":
+  unittest.main()
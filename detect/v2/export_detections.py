@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Executable and reusable sample for exporting detections in bulk.
+
+This module demonstrates combining multiple single-purpose modules into a larger
+workflow: the time range is split into shards, the pages of each shard are
+crawled concurrently with list_detections, and all the detections are written
+to a single NDJSON or CSV file as they arrive.
+
+Shards that turn out to be dense (i.e. have more than one page) are split in
+half before they are crawled, down to a minimum shard duration. The progress of
+each shard is saved in a cursor file, so an interrupted export can be resumed.
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import datetime
+import json
+import logging
+import os
+import queue
+from typing import Any, Dict, IO, Mapping, Optional, Sequence
+
+from google.auth.transport import requests
+
+from common import chronicle_auth
+from common import datetime_converter
+from common import regions
+from common import time_ranges
+from . import list_detections
+
+# Set up logger that will include timestamps.
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s:%(levelname)s:%(name)s:%(message)s")
+_LOGGER_ = logging.getLogger("export_detections")
+
+# Maximum page size supported by the ListDetections API.
+MAX_PAGE_SIZE = 1000
+DEFAULT_NUM_SHARDS = 8
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MIN_SHARD_DURATION = datetime.timedelta(minutes=10)
+
+NDJSON = "ndjson"
+CSV = "csv"
+CSV_COLUMNS = (
+    "id",
+    "type",
+    "detectionTime",
+    "createdTime",
+    "ruleId",
+    "ruleName",
+    "ruleVersion",
+    "ruleType",
+    "alertState",
+    "urlBackToProduct",
+    "detectionFields",
+)
+
+Detection = Mapping[str, Any]
+Cursor = Dict[str, Any]
+
+
+def _shard_key(start: datetime.datetime, end: datetime.datetime) -> str:
+  return (f"{datetime_converter.strftime(start)}/"
+          f"{datetime_converter.strftime(end)}")
+
+
+def _parse_shard_key(key: str) -> time_ranges.TimeRange:
+  start, end = key.split("/")
+  return (datetime_converter.iso8601_datetime_utc(start),
+          datetime_converter.iso8601_datetime_utc(end))
+
+
+def load_cursors(cursor_file: str) -> Dict[str, Cursor]:
+  """Loads the progress of all the shards from a cursor file, if it exists.
+
+  Args:
+    cursor_file: Path of the cursor file.
+
+  Returns:
+    Dictionary of shard keys ("<start time>/<end time>") to shard cursors, each
+    with a "page_token" (to continue from) and a "done" flag. Empty if the
+    cursor file doesn't exist.
+  """
+  if not os.path.exists(cursor_file):
+    return {}
+  with open(cursor_file) as f:
+    return json.load(f)["shards"]
+
+
+def save_cursors(cursor_file: str, cursors: Mapping[str, Cursor]):
+  """Saves the progress of all the shards atomically in a cursor file."""
+  tmp_file = cursor_file + ".tmp"
+  with open(tmp_file, "w") as f:
+    json.dump({"shards": cursors}, f, indent=2, sort_keys=True)
+  os.replace(tmp_file, cursor_file)
+
+
+def detection_to_row(detection: Detection) -> Dict[str, str]:
+  """Flattens a detection into a CSV row (without its collection elements)."""
+  row = {k: detection.get(k, "") for k in CSV_COLUMNS[:4]}
+  rule_detection = (detection.get("detection") or [{}])[0]
+  for k in CSV_COLUMNS[4:-1]:
+    row[k] = rule_detection.get(k, "")
+  row["detectionFields"] = json.dumps(
+      {f["key"]: f.get("value", "")
+       for f in rule_detection.get("detectionFields", [])})
+  return row
+
+
+class DetectionWriter:
+  """Streaming writer of detections, in NDJSON or CSV format."""
+
+  def __init__(self, output: IO[str], output_format: str, header: bool = True):
+    self._output = output
+    self._csv_writer = None
+    if output_format == CSV:
+      self._csv_writer = csv.DictWriter(output, fieldnames=CSV_COLUMNS)
+      if header:
+        self._csv_writer.writeheader()
+    self.count = 0
+
+  def write(self, detections: Sequence[Detection]):
+    for detection in detections:
+      if self._csv_writer:
+        self._csv_writer.writerow(detection_to_row(detection))
+      else:
+        self._output.write(json.dumps(detection, separators=(",", ":")) + "\n")
+    self.count += len(detections)
+    # Make sure that the output is persisted before the cursor is.
+    self._output.flush()
+
+
+def export_detections(http_session: requests.AuthorizedSession,
+                      version_id: str,
+                      start_time: datetime.datetime,
+                      end_time: datetime.datetime,
+                      writer: DetectionWriter,
+                      list_basis: str = "",
+                      alert_state: str = "",
+                      num_shards: int = DEFAULT_NUM_SHARDS,
+                      max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                      min_shard_duration: datetime.timedelta = (
+                          DEFAULT_MIN_SHARD_DURATION),
+                      cursor_file: Optional[str] = None) -> int:
+  """Exports all the detections of a rule version within a time range.
+
+  Pages are fetched by worker threads, and written by the calling thread in
+  the order they arrive, so detections are not sorted across shards.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    version_id: Version ID of the rule(s) to export detections for (see the
+      list_detections module).
+    start_time: The time to start exporting detections from, inclusive.
+    end_time: The time to end exporting detections to, exclusive.
+    writer: Output writer for the detections.
+    list_basis: Whether the time range refers to the detection time
+      (DETECTION_TIME) or the creation time (CREATED_TIME) of detections.
+    alert_state: Optional alert state to filter detections by.
+    num_shards: Initial number of time shards to split the time range into.
+    max_concurrency: Maximum number of shards to crawl at the same time.
+    min_shard_duration: Shards with more than one page of detections are split
+      in half, unless their duration is shorter than twice this value.
+    cursor_file: Optional path of a file to save the progress of each shard
+      in. If it already exists, the export is resumed from it (and the time
+      range and number of shards arguments are ignored). Resuming may write
+      again up to one page for each shard that was interrupted.
+
+  Returns:
+    Number of detections exported.
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+    ValueError: Invalid time range, number of shards, or min shard duration.
+  """
+  # Dense shards would otherwise keep splitting into empty time ranges.
+  if min_shard_duration <= datetime.timedelta(0):
+    raise ValueError(
+        f"min_shard_duration must be positive, got {min_shard_duration}")
+  cursors = load_cursors(cursor_file) if cursor_file else {}
+  if cursors:
+    _LOGGER_.info("Resuming %d unfinished shard(s) from %s",
+                  sum(not c["done"] for c in cursors.values()), cursor_file)
+  else:
+    cursors = {
+        _shard_key(s, e): {
+            "page_token": "",
+            "done": False
+        } for s, e in time_ranges.split_time_range(start_time, end_time,
+                                                   num_shards)
+    }
+
+  # Worker threads only fetch pages; all the writes (to the output and to the
+  # cursor file) happen in this thread, in the order they arrive.
+  pages = queue.Queue()
+
+  def crawl_shard(key: str, page_token: str, may_split: bool):
+    shard_start, shard_end = _parse_shard_key(key)
+    while True:
+      detections, page_token = list_detections.list_detections(
+          http_session, version_id, MAX_PAGE_SIZE, page_token, shard_start,
+          shard_end, list_basis, alert_state)
+      if may_split and page_token:
+        # Discard the first page: its detections will be fetched again by
+        # the two halves of this shard.
+        pages.put((key, None, None))
+        return
+      may_split = False
+      pages.put((key, detections, page_token))
+      if not page_token:
+        return
+
+  def submit(executor: concurrent.futures.Executor, key: str):
+    shard_start, shard_end = _parse_shard_key(key)
+    page_token = cursors[key]["page_token"]
+    may_split = (not page_token and
+                 shard_end - shard_start >= 2 * min_shard_duration)
+    return executor.submit(crawl_shard, key, page_token, may_split)
+
+  with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+    futures = [submit(executor, k) for k, c in cursors.items() if not c["done"]]
+    unfinished = len(futures)
+    while unfinished:
+      try:
+        key, detections, page_token = pages.get(timeout=1)
+      except queue.Empty:
+        # Surface errors of worker threads.
+        for f in futures:
+          if f.done() and f.exception():
+            raise f.exception()
+        continue
+
+      if detections is None:
+        shard_start, shard_end = _parse_shard_key(key)
+        halves = time_ranges.split_time_range(shard_start, shard_end, 2)
+        _LOGGER_.info("Splitting dense shard %s", key)
+        del cursors[key]
+        for s, e in halves:
+          cursors[_shard_key(s, e)] = {"page_token": "", "done": False}
+        futures.extend(submit(executor, _shard_key(s, e)) for s, e in halves)
+        unfinished += len(halves) - 1
+      else:
+        writer.write(detections)
+        cursors[key] = {"page_token": page_token, "done": not page_token}
+        if not page_token:
+          unfinished -= 1
+          _LOGGER_.info("Finished shard %s (%d detections exported so far)",
+                        key, writer.count)
+
+      if cursor_file:
+        save_cursors(cursor_file, cursors)
+
+  return writer.count
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  regions.add_argument_region(parser)
+  parser.add_argument(
+      "-vi",
+      "--version_id",
+      type=str,
+      required=True,
+      help=("version ID of the rule to export detections for "
+            "('- | ru_<UUID>@- | ru_<UUID>[@v_<seconds>_<nanoseconds>]')"))
+  parser.add_argument(
+      "-st",
+      "--start_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      required=True,
+      help="start time in UTC ('yyyy-mm-ddThh:mm:ssZ')")
+  parser.add_argument(
+      "-et",
+      "--end_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      required=True,
+      help="end time in UTC ('yyyy-mm-ddThh:mm:ssZ')")
+  parser.add_argument(
+      "-lb",
+      "--list_basis",
+      type=str,
+      choices=("DETECTION_TIME", "CREATED_TIME"),
+      default="",
+      help="list basis (default = DETECTION_TIME)")
+  parser.add_argument(
+      "-a",
+      "--alert_state",
+      type=str,
+      choices=("ALERTING", "NOT_ALERTING"),
+      default="",
+      help="alert state (default = no filtering)")
+  parser.add_argument(
+      "-o", "--output_file", type=str, required=True, help="output file path")
+  parser.add_argument(
+      "-of",
+      "--output_format",
+      type=str,
+      choices=(NDJSON, CSV),
+      default=NDJSON,
+      help=f"output format (default = {NDJSON})")
+  parser.add_argument(
+      "-ns",
+      "--num_shards",
+      type=int,
+      default=DEFAULT_NUM_SHARDS,
+      help=f"initial number of time shards (default = {DEFAULT_NUM_SHARDS})")
+  parser.add_argument(
+      "-mc",
+      "--max_concurrency",
+      type=int,
+      default=DEFAULT_MAX_CONCURRENCY,
+      help="maximum number of concurrent shards " +
+      f"(default = {DEFAULT_MAX_CONCURRENCY})")
+  parser.add_argument(
+      "-msm",
+      "--min_shard_minutes",
+      type=float,
+      default=DEFAULT_MIN_SHARD_DURATION.total_seconds() / 60,
+      help=("minimum duration in minutes of shards that dense shards are "
+            "split into (default = "
+            f"{DEFAULT_MIN_SHARD_DURATION.total_seconds() / 60:g})"))
+  parser.add_argument(
+      "-cf",
+      "--cursor_file",
+      type=str,
+      help="file to save the progress in, and resume from if it exists")
+
+  args = parser.parse_args()
+  list_detections.CHRONICLE_API_BASE_URL = regions.url(
+      list_detections.CHRONICLE_API_BASE_URL, args.region)
+  session = chronicle_auth.initialize_http_session(args.credentials_file)
+  resume = bool(args.cursor_file and os.path.exists(args.cursor_file))
+  with open(args.output_file, "a" if resume else "w", newline="") as out:
+    count = export_detections(
+        session,
+        args.version_id,
+        args.start_time,
+        args.end_time,
+        DetectionWriter(out, args.output_format, header=not resume),
+        list_basis=args.list_basis,
+        alert_state=args.alert_state,
+        num_shards=args.num_shards,
+        max_concurrency=args.max_concurrency,
+        min_shard_duration=datetime.timedelta(minutes=args.min_shard_minutes),
+        cursor_file=args.cursor_file)
+  print(f"Exported {count} detections to {args.output_file}")
@@ -0,0 +1,173 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "export_detections" module."""
+
+import datetime
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from common import datetime_converter
+from . import export_detections
+from . import list_detections
+
+
+class ExportDetectionsTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.start_time = datetime.datetime(
+        2021, 1, 1, tzinfo=datetime.timezone.utc)
+    self.end_time = datetime.datetime(2021, 1, 3, tzinfo=datetime.timezone.utc)
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    self.cursor_file = os.path.join(self.tmp_dir.name, "cursors.json")
+
+  def tearDown(self):
+    self.tmp_dir.cleanup()
+    super().tearDown()
+
+  @staticmethod
+  def fake_list_detections(pages):
+    """Returns a fake list_detections function, based on shard time ranges.
+
+    Pages are looked up either by shard start time, or by the full shard key.
+    """
+
+    def list_detections_func(http_session, version_id, page_size, page_token,
+                             start_time, end_time, list_basis, alert_state):
+      del http_session, version_id, page_size, list_basis, alert_state
+      start = datetime_converter.strftime(start_time)
+      key = f"{start}/{datetime_converter.strftime(end_time)}"
+      shard_pages = pages.get(key) or pages[start]
+      index = int(page_token or 0)
+      next_page_token = str(index + 1) if index + 1 < len(shard_pages) else ""
+      return [{"id": i} for i in shard_pages[index]], next_page_token
+
+    return list_detections_func
+
+  def export(self, output, pages, **kwargs):
+    with mock.patch.object(list_detections, "list_detections",
+                           self.fake_list_detections(pages)):
+      return export_detections.export_detections(
+          None, "-", self.start_time, self.end_time,
+          export_detections.DetectionWriter(output, export_detections.NDJSON),
+          **kwargs)
+
+  @staticmethod
+  def exported_ids(output):
+    return sorted(json.loads(line)["id"] for line in output.getvalue().split())
+
+  def test_export_all_shards(self):
+    output = io.StringIO()
+    pages = {
+        "2021-01-01T00:00:00Z": [["a", "b"], ["c"]],
+        "2021-01-02T00:00:00Z": [["d"]],
+    }
+
+    count = self.export(
+        output,
+        pages,
+        num_shards=2,
+        min_shard_duration=datetime.timedelta(days=1),
+        cursor_file=self.cursor_file)
+
+    self.assertEqual(count, 4)
+    self.assertEqual(self.exported_ids(output), ["a", "b", "c", "d"])
+    cursors = export_detections.load_cursors(self.cursor_file)
+    self.assertEqual(len(cursors), 2)
+    self.assertTrue(all(c["done"] for c in cursors.values()))
+
+  def test_dense_shard_is_split(self):
+    output = io.StringIO()
+    pages = {
+        # Only the whole time range is dense enough to be split.
+        "2021-01-01T00:00:00Z/2021-01-03T00:00:00Z": [["a", "b"], ["c"]],
+        "2021-01-01T00:00:00Z/2021-01-02T00:00:00Z": [["a", "b"]],
+        "2021-01-02T00:00:00Z/2021-01-03T00:00:00Z": [["c"], ["d"]],
+    }
+
+    count = self.export(
+        output,
+        pages,
+        num_shards=1,
+        min_shard_duration=datetime.timedelta(days=1),
+        cursor_file=self.cursor_file)
+
+    self.assertEqual(count, 4)
+    self.assertEqual(self.exported_ids(output), ["a", "b", "c", "d"])
+    self.assertCountEqual(
+        export_detections.load_cursors(self.cursor_file), [
+            "2021-01-01T00:00:00Z/2021-01-02T00:00:00Z",
+            "2021-01-02T00:00:00Z/2021-01-03T00:00:00Z",
+        ])
+
+  def test_min_shard_duration_must_be_positive(self):
+    with self.assertRaises(ValueError):
+      self.export(
+          io.StringIO(), {}, min_shard_duration=datetime.timedelta(0))
+
+  def test_resume_from_cursor_file(self):
+    export_detections.save_cursors(
+        self.cursor_file, {
+            "2021-01-01T00:00:00Z/2021-01-02T00:00:00Z": {
+                "page_token": "",
+                "done": True
+            },
+            "2021-01-02T00:00:00Z/2021-01-03T00:00:00Z": {
+                "page_token": "1",
+                "done": False
+            },
+        })
+    output = io.StringIO()
+    pages = {
+        "2021-01-01T00:00:00Z": [["a"]],
+        "2021-01-02T00:00:00Z": [["b"], ["c"], ["d"]],
+    }
+
+    count = self.export(output, pages, cursor_file=self.cursor_file)
+
+    self.assertEqual(count, 2)
+    self.assertEqual(self.exported_ids(output), ["c", "d"])
+
+  def test_detection_to_row(self):
+    detection = {
+        "id": "de_1",
+        "detectionTime": "2021-01-01T00:00:00Z",
+        "collectionElements": [],
+        "detection": [{
+            "ruleId": "ru_1",
+            "alertState": "ALERTING",
+            "detectionFields": [{
+                "key": "hostname",
+                "value": "host1"
+            }],
+        }],
+    }
+
+    row = export_detections.detection_to_row(detection)
+
+    self.assertEqual(row["id"], "de_1")
+    self.assertEqual(row["ruleId"], "ru_1")
+    self.assertEqual(row["alertState"], "ALERTING")
+    self.assertEqual(row["ruleName"], "")
+    self.assertEqual(row["detectionFields"], '{"hostname": "host1"}')
+    self.assertCountEqual(row, export_detections.CSV_COLUMNS)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -21,14 +21,20 @@ workflow.
 """
 
 import argparse
+import concurrent.futures
+import datetime
+import functools
 import json
 import time
-from typing import Any, List, Mapping, Sequence, Tuple
+from typing import Any, Iterator, List, Mapping, Optional, Sequence, Tuple
 
 from google.auth.transport import requests
 
 from common import chronicle_auth
+from common import datetime_converter
+from common import rate_limiter
 from common import regions
+from common import retry
 from . import list_curated_rule_detections
 from . import list_curated_rules
 
@@ -36,6 +42,9 @@ _chronicle_api_base_url = "https://backstory.googleapis.com"
 
 # Sleep duration to ensure we don't exceed QPM limit.
 _DEFAULT_SLEEP_SECONDS = 6
+# The same QPM limit, as a budget shared by concurrent requests.
+_DEFAULT_QPS = 1 / _DEFAULT_SLEEP_SECONDS
+_DEFAULT_MAX_CONCURRENCY = 4
 
 
 def list_curated_rules_and_detections(
@@ -87,6 +96,80 @@ def list_curated_rules_and_detections(
   return all_detections_and_tokens
 
 
+def crawl_curated_rules_and_detections(
+    http_session: requests.AuthorizedSession,
+    page_size: int = 10,
+    all_pages: bool = False,
+    start_time: Optional[datetime.datetime] = None,
+    end_time: Optional[datetime.datetime] = None,
+    alert_state: str = "",
+    list_basis: str = "",
+    qps: float = _DEFAULT_QPS,
+    max_concurrency: int = _DEFAULT_MAX_CONCURRENCY
+) -> Iterator[Tuple[str, Sequence[Mapping[str, Any]], str]]:
+  """Retrieves the detections of all curated rules concurrently.
+
+  Unlike list_curated_rules_and_detections, rules are crawled concurrently,
+  ListCuratedRuleDetections calls share a QPS budget (instead of sleeping after
+  each rule), transient errors are retried, and the results of each rule are
+  yielded as soon as the rule is done (i.e. not in the order of the rules).
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    page_size: The maximum number of detections to retrieve per page.
+    all_pages: Whether to retrieve all the pages of detections of each rule,
+      or only the first one.
+    start_time: The time to start listing detections from, inclusive.
+    end_time: The time to end listing detections to, exclusive.
+    alert_state: Optional alert state to filter detections by.
+    list_basis: Whether the time range refers to the detection time
+      (DETECTION_TIME) or the creation time (CREATED_TIME) of detections.
+    qps: Maximum number of ListCuratedRuleDetections calls per second.
+    max_concurrency: Maximum number of rules to crawl at the same time.
+
+  Yields:
+    The curated rule ID, its detections ordered by descending detection_time,
+    and a Base64 token for getting the detections of the next page (always
+    empty if all_pages is True).
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400), and retries didn't help.
+  """
+  rule_ids = []
+  page_token = ""
+  while True:
+    curated_rules, page_token = list_curated_rules.list_curated_rules(
+        http_session, page_token=page_token)
+    rule_ids.extend(rule["ruleId"] for rule in curated_rules)
+    if not page_token:
+      break
+
+  limiter = rate_limiter.RateLimiter(qps)
+
+  def list_page(rule_id: str, token: str):
+    limiter.acquire()
+    return list_curated_rule_detections.list_curated_rule_detections(
+        http_session, rule_id, alert_state, start_time, end_time, list_basis,
+        page_size, token)
+
+  def crawl_rule(rule_id: str) -> Tuple[Sequence[Mapping[str, Any]], str]:
+    detections = []
+    token = ""
+    while True:
+      page, token = retry.call_with_retry(
+          functools.partial(list_page, rule_id, token))
+      detections.extend(page)
+      if not all_pages or not token:
+        return detections, token
+
+  with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+    futures = {executor.submit(crawl_rule, r): r for r in rule_ids}
+    for future in concurrent.futures.as_completed(futures):
+      detections, next_page_token = future.result()
+      yield futures[future], detections, next_page_token
+
+
 if __name__ == "__main__":
   parser = argparse.ArgumentParser()
   chronicle_auth.add_argument_credentials_file(parser)
@@ -96,18 +179,59 @@ if __name__ == "__main__":
       "--page_size",
       type=int,
       required=False,
-      help="maximum number of detections to return in the first page per curated rule"
+      default=10,
+      help="maximum number of detections to return per page per curated rule"
   )
+  parser.add_argument(
+      "-a",
+      "--all_pages",
+      action="store_true",
+      help="retrieve all the pages of detections, not only the first one")
+  parser.add_argument(
+      "-st",
+      "--start_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      required=False,
+      help="detection start time in UTC ('yyyy-mm-ddThh:mm:ssZ')")
+  parser.add_argument(
+      "-et",
+      "--end_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      required=False,
+      help="detection end time in UTC ('yyyy-mm-ddThh:mm:ssZ')")
+  parser.add_argument(
+      "-q",
+      "--qps",
+      type=float,
+      default=_DEFAULT_QPS,
+      help="maximum ListCuratedRuleDetections calls per second " +
+      f"(default = {_DEFAULT_QPS:.3f})")
+  parser.add_argument(
+      "-mc",
+      "--max_concurrency",
+      type=int,
+      default=_DEFAULT_MAX_CONCURRENCY,
+      help="maximum number of curated rules to crawl at the same time " +
+      f"(default = {_DEFAULT_MAX_CONCURRENCY})")
 
   args = parser.parse_args()
-  _chronicle_api_base_url = regions.url(_chronicle_api_base_url, args.region)
+  # pylint: disable=protected-access
+  for m in (list_curated_rules, list_curated_rule_detections):
+    m._chronicle_api_base_url = regions.url(m._chronicle_api_base_url,
+                                            args.region)
+  # pylint: enable=protected-access
   session = chronicle_auth.initialize_http_session(args.credentials_file)
-  responses = list_curated_rules_and_detections(session, args.page_size)
+  responses = crawl_curated_rules_and_detections(
+      session,
+      args.page_size,
+      args.all_pages,
+      args.start_time,
+      args.end_time,
+      qps=args.qps,
+      max_concurrency=args.max_concurrency)
 
   for response in responses:
     print("====================================")
-    print(
-        f"Displaying detections for the first page of detections for rule ID {response[0]}"
-    )
+    print(f"Displaying detections for rule ID {response[0]}")
     print(json.dumps(response[1], indent=2))
     print(f"Next page token: {response[2]}")
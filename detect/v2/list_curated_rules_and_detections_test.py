@@ -19,6 +19,8 @@ from unittest import mock
 
 from google.auth.transport import requests
 
+from . import list_curated_rule_detections
+from . import list_curated_rules
 from . import list_curated_rules_and_detections
 
 
@@ -149,5 +151,52 @@ class ListCuratedRulesAndDetectionsTest(unittest.TestCase):
           mock_session)
 
 
+  @mock.patch.object(
+      list_curated_rule_detections,
+      "list_curated_rule_detections",
+      autospec=True)
+  @mock.patch.object(list_curated_rules, "list_curated_rules", autospec=True)
+  def test_crawl_all_pages(self, mock_list_curated_rules,
+                           mock_list_curated_rule_detections):
+    mock_list_curated_rules.side_effect = [
+        ([{"ruleId": "ur_1"}], "token"),
+        ([{"ruleId": "ur_2"}], ""),
+    ]
+    pages = {
+        ("ur_1", ""): ([{"id": "de_1"}], "ur_1_token"),
+        ("ur_1", "ur_1_token"): ([{"id": "de_2"}], ""),
+        ("ur_2", ""): ([{"id": "de_3"}], ""),
+    }
+    mock_list_curated_rule_detections.side_effect = (
+        lambda session, rule_id, alert_state, start_time, end_time, list_basis,
+        page_size, page_token: pages[(rule_id, page_token)])
+
+    crawl = list_curated_rules_and_detections.crawl_curated_rules_and_detections
+    results = crawl(None, all_pages=True, qps=1000)
+
+    self.assertEqual(
+        {rule_id: [d["id"] for d in dets] for rule_id, dets, _ in results}, {
+            "ur_1": ["de_1", "de_2"],
+            "ur_2": ["de_3"],
+        })
+    self.assertEqual(mock_list_curated_rule_detections.call_count, 3)
+
+  @mock.patch.object(
+      list_curated_rule_detections,
+      "list_curated_rule_detections",
+      autospec=True)
+  @mock.patch.object(list_curated_rules, "list_curated_rules", autospec=True)
+  def test_crawl_first_pages(self, mock_list_curated_rules,
+                             mock_list_curated_rule_detections):
+    mock_list_curated_rules.return_value = ([{"ruleId": "ur_1"}], "")
+    mock_list_curated_rule_detections.return_value = ([{"id": "de_1"}], "t")
+
+    crawl = list_curated_rules_and_detections.crawl_curated_rules_and_detections
+    results = list(crawl(None, qps=1000))
+
+    self.assertEqual(results, [("ur_1", [{"id": "de_1"}], "t")])
+    self.assertEqual(mock_list_curated_rule_detections.call_count, 1)
+
+
 if __name__ == "__main__":
   unittest.main()
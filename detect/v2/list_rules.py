@@ -22,7 +22,7 @@ https://cloud.google.com/chronicle/docs/reference/detection-engine-api#listrules
 
 import argparse
 import json
-from typing import Any, Mapping, Sequence, Tuple
+from typing import Any, List, Mapping, Sequence, Tuple
 
 from google.auth.transport import requests
 
@@ -31,6 +31,9 @@ from common import regions
 
 CHRONICLE_API_BASE_URL = "https://backstory.googleapis.com"
 
+# Maximum page size supported by the ListRules API.
+MAX_PAGE_SIZE = 1000
+
 
 def list_rules(
     http_session: requests.AuthorizedSession,
@@ -98,6 +101,32 @@ def list_rules(
   return j.get("rules", []), j.get("nextPageToken", "")
 
 
+def list_all_rules(http_session: requests.AuthorizedSession,
+                   archive_state: str = "") -> List[Mapping[str, Any]]:
+  """List all the detection rules, from all the pages.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    archive_state: The archive state to filter rules by (i.e. 'ARCHIVED').
+      Optional - if unspecified, only rules with ACTIVE state are returned.
+
+  Returns:
+    List of all the rules.
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  rules = []
+  page_token = ""
+  while True:
+    page, page_token = list_rules(http_session, MAX_PAGE_SIZE, page_token,
+                                  archive_state)
+    rules.extend(page)
+    if not page_token:
+      return rules
+
+
 if __name__ == "__main__":
   parser = argparse.ArgumentParser()
   chronicle_auth.add_argument_credentials_file(parser)
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Executable and reusable sample for mirroring detection rules locally.
+
+This module demonstrates combining multiple single-purpose modules into a larger
+workflow: a single list_rules crawl finds which rules changed since the previous
+refresh (based on their latest version ID), and only those rules' versions are
+fetched with list_rule_versions, concurrently.
+
+The mirror is a directory with a content-addressed store of rule texts
+("objects/<SHA-256>"), and an index of rules and versions ("index.json"), so
+searching and diffing rules are local operations.
+"""
+
+import argparse
+import concurrent.futures
+import difflib
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
+
+from google.auth.transport import requests
+
+from common import chronicle_auth
+from common import regions
+from . import list_rule_versions
+from . import list_rules
+
+# Set up logger that will include timestamps.
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s:%(levelname)s:%(name)s:%(message)s")
+_LOGGER_ = logging.getLogger("mirror_rules")
+
+# Maximum page size supported by the ListRuleVersions API.
+MAX_PAGE_SIZE = 1000
+DEFAULT_MAX_CONCURRENCY = 8
+INDEX_FILE = "index.json"
+OBJECTS_DIR = "objects"
+
+# Rule fields that are stored in the index (the rule text is stored separately).
+_VERSION_FIELDS = ("versionId", "versionCreateTime", "ruleName",
+                   "compilationState")
+
+Rule = Mapping[str, Any]
+
+
+class RuleMirror:
+  """Local mirror of the rules and rule versions of a Chronicle instance."""
+
+  def __init__(self, mirror_dir: str):
+    self.mirror_dir = mirror_dir
+    os.makedirs(os.path.join(mirror_dir, OBJECTS_DIR), exist_ok=True)
+    self.rules: Dict[str, Dict[str, Any]] = {}
+    index_path = os.path.join(mirror_dir, INDEX_FILE)
+    if os.path.exists(index_path):
+      with open(index_path) as f:
+        self.rules = json.load(f)["rules"]
+
+  def save(self):
+    """Saves the index atomically (rule texts are saved as they're added)."""
+    index_path = os.path.join(self.mirror_dir, INDEX_FILE)
+    with open(index_path + ".tmp", "w") as f:
+      json.dump({"rules": self.rules}, f, indent=2, sort_keys=True)
+    os.replace(index_path + ".tmp", index_path)
+
+  def _object_path(self, text_hash: str) -> str:
+    return os.path.join(self.mirror_dir, OBJECTS_DIR, text_hash)
+
+  def put_text(self, text: str) -> str:
+    """Stores a rule text (unless it's already stored), and returns its hash."""
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    path = self._object_path(text_hash)
+    if not os.path.exists(path):
+      with open(path + ".tmp", "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+      os.replace(path + ".tmp", path)
+    return text_hash
+
+  def get_text(self, text_hash: str) -> str:
+    with open(self._object_path(text_hash), encoding="utf-8", newline="") as f:
+      return f.read()
+
+  def version_entry(self, rule: Rule) -> Dict[str, Any]:
+    """Stores a rule version's text, and returns its index entry."""
+    entry = {k: rule[k] for k in _VERSION_FIELDS if k in rule}
+    entry["textHash"] = self.put_text(rule.get("ruleText", ""))
+    return entry
+
+  def versions(self, rule_id: str) -> List[Dict[str, Any]]:
+    """Returns the versions of a rule, from the newest to the oldest."""
+    return self.rules[rule_id]["versions"]
+
+  def collect_garbage(self) -> int:
+    """Deletes the rule texts that no rule version refers to anymore."""
+    referenced = {
+        v["textHash"] for r in self.rules.values() for v in r["versions"]
+    }
+    deleted = 0
+    objects_dir = os.path.join(self.mirror_dir, OBJECTS_DIR)
+    for name in os.listdir(objects_dir):
+      if name not in referenced:
+        os.remove(os.path.join(objects_dir, name))
+        deleted += 1
+    return deleted
+
+
+def _list_all_rule_versions(http_session: requests.AuthorizedSession,
+                            rule_id: str) -> List[Rule]:
+  versions = []
+  page_token = ""
+  while True:
+    page, page_token = list_rule_versions.list_rule_versions(
+        http_session, rule_id, MAX_PAGE_SIZE, page_token)
+    versions.extend(page)
+    if not page_token:
+      return versions
+
+
+def refresh_mirror(http_session: requests.AuthorizedSession,
+                   mirror: RuleMirror,
+                   archive_state: str = "",
+                   max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+                  ) -> Tuple[List[str], List[str], List[str]]:
+  """Refreshes a local rule mirror incrementally.
+
+  Rules whose latest version ID and version creation time didn't change since
+  the previous refresh aren't fetched again.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    mirror: Local rule mirror to refresh (and save).
+    archive_state: The archive state to filter rules by (see list_rules).
+    max_concurrency: Maximum number of rules to fetch versions for at the same
+      time.
+
+  Returns:
+    Rule IDs that were (added, updated, removed).
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  rules = list_rules.list_all_rules(http_session, archive_state)
+  _LOGGER_.info("Listed %d rules", len(rules))
+
+  added, updated = [], []
+  for rule in rules:
+    known = mirror.rules.get(rule["ruleId"])
+    if known is None:
+      added.append(rule["ruleId"])
+    elif (known["versionId"], known.get("versionCreateTime")) != (
+        rule["versionId"], rule.get("versionCreateTime")):
+      updated.append(rule["ruleId"])
+
+  rules_by_id = {rule["ruleId"]: rule for rule in rules}
+  with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+    futures = {
+        executor.submit(_list_all_rule_versions, http_session, rule_id): rule_id
+        for rule_id in added + updated
+    }
+    for future in concurrent.futures.as_completed(futures):
+      rule_id = futures[future]
+      rule = rules_by_id[rule_id]
+      versions = [mirror.version_entry(v) for v in future.result()]
+      if not versions:
+        versions = [mirror.version_entry(rule)]
+      # Timestamps have a fixed number of sub-second digits, so they sort
+      # lexicographically.
+      versions.sort(key=lambda v: v.get("versionCreateTime", ""), reverse=True)
+      mirror.rules[rule_id] = {
+          "ruleId": rule_id,
+          "versionId": rule["versionId"],
+          "versionCreateTime": rule.get("versionCreateTime"),
+          "ruleName": rule.get("ruleName"),
+          "versions": versions,
+      }
+
+  listed = {rule["ruleId"] for rule in rules}
+  removed = [rule_id for rule_id in mirror.rules if rule_id not in listed]
+  for rule_id in removed:
+    del mirror.rules[rule_id]
+  mirror.save()
+  return added, updated, removed
+
+
+def grep_rules(mirror: RuleMirror,
+               pattern: str,
+               all_versions: bool = False) -> Iterator[Tuple[str, int, str]]:
+  """Searches the rule texts in a local mirror.
+
+  Args:
+    mirror: Local rule mirror.
+    pattern: Regular expression to search for in each line.
+    all_versions: Whether to search all the versions of each rule, or only the
+      latest one.
+
+  Yields:
+    (version ID, line number, line) for each matching line.
+  """
+  regex = re.compile(pattern)
+  for rule_id in sorted(mirror.rules):
+    versions = mirror.versions(rule_id)
+    for version in versions if all_versions else versions[:1]:
+      text = mirror.get_text(version["textHash"])
+      for line_number, line in enumerate(text.splitlines(), start=1):
+        if regex.search(line):
+          yield version["versionId"], line_number, line
+
+
+def diff_rule(mirror: RuleMirror, rule_id: str) -> str:
+  """Returns a unified diff between the two latest versions of a rule."""
+  versions = mirror.versions(rule_id)
+  if len(versions) < 2:
+    return ""
+  new, old = versions[0], versions[1]
+  return "".join(
+      difflib.unified_diff(
+          mirror.get_text(old["textHash"]).splitlines(keepends=True),
+          mirror.get_text(new["textHash"]).splitlines(keepends=True),
+          fromfile=old["versionId"],
+          tofile=new["versionId"]))
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  regions.add_argument_region(parser)
+  parser.add_argument(
+      "-m",
+      "--mirror_dir",
+      type=str,
+      required=True,
+      help="directory of the local rule mirror")
+  parser.add_argument(
+      "-as",
+      "--archive_state",
+      type=str,
+      required=False,
+      default="",
+      help="archive state of rules (i.e. 'ACTIVE', 'ARCHIVED', 'ALL')")
+  parser.add_argument(
+      "-g",
+      "--grep",
+      type=str,
+      help="search the local mirror for a regex, without refreshing it")
+  parser.add_argument(
+      "-av",
+      "--all_versions",
+      action="store_true",
+      help="search all the versions of each rule, not only the latest one")
+  parser.add_argument(
+      "-d",
+      "--diff",
+      type=str,
+      help=("show the changes in the latest version of a rule ('ru_<UUID>'), "
+            "without refreshing"))
+  parser.add_argument(
+      "-gc",
+      "--collect_garbage",
+      action="store_true",
+      help="delete rule texts that are not referenced anymore after refreshing")
+
+  args = parser.parse_args()
+  local_mirror = RuleMirror(args.mirror_dir)
+  if args.grep:
+    for version_id, line_no, matching_line in grep_rules(
+        local_mirror, args.grep, args.all_versions):
+      print(f"{version_id}:{line_no}: {matching_line}")
+  elif args.diff:
+    print(diff_rule(local_mirror, args.diff))
+  else:
+    list_rules.CHRONICLE_API_BASE_URL = regions.url(
+        list_rules.CHRONICLE_API_BASE_URL, args.region)
+    list_rule_versions.CHRONICLE_API_BASE_URL = regions.url(
+        list_rule_versions.CHRONICLE_API_BASE_URL, args.region)
+    session = chronicle_auth.initialize_http_session(args.credentials_file)
+    new_rules, changed_rules, removed_rules = refresh_mirror(
+        session, local_mirror, args.archive_state)
+    print(f"Added {len(new_rules)}, updated {len(changed_rules)} and removed " +
+          f"{len(removed_rules)} rules")
+    if args.collect_garbage:
+      print(f"Deleted {local_mirror.collect_garbage()} unreferenced rule texts")
@@ -0,0 +1,107 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "mirror_rules" module."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from . import list_rule_versions
+from . import list_rules
+from . import mirror_rules
+
+
+def make_rule(rule_id, version, text):
+  return {
+      "ruleId": rule_id,
+      "versionId": f"{rule_id}@v_{version}_0",
+      "versionCreateTime": f"2021-01-0{version}T00:00:00.000000Z",
+      "ruleName": rule_id,
+      "ruleText": text,
+  }
+
+
+class MirrorRulesTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    self.mirror_dir = self.tmp_dir.name
+
+  def tearDown(self):
+    self.tmp_dir.cleanup()
+    super().tearDown()
+
+  @mock.patch.object(list_rule_versions, "list_rule_versions", autospec=True)
+  @mock.patch.object(list_rules, "list_rules", autospec=True)
+  def test_refresh_is_incremental(self, mock_list_rules,
+                                  mock_list_rule_versions):
+    rule_1_v1 = make_rule("ru_1", 1, "rule one {\n  events: $e\n}\n")
+    rule_2_v1 = make_rule("ru_2", 1, "rule two {\n  events: $e\n}\n")
+    rule_2_v2 = make_rule("ru_2", 2, "rule two {\n  events: $e2\n}\n")
+    rule_3_v1 = make_rule("ru_3", 1, "rule three {\n  events: $e\n}\n")
+    versions = {
+        "ru_1": [rule_1_v1],
+        "ru_2": [rule_2_v1],
+        "ru_3": [rule_3_v1],
+    }
+    mock_list_rule_versions.side_effect = (
+        lambda session, rule_id, page_size, page_token: (versions[rule_id], ""))
+
+    mock_list_rules.side_effect = [([rule_1_v1], "token"), ([rule_2_v1], "")]
+    mirror = mirror_rules.RuleMirror(self.mirror_dir)
+    added, updated, removed = mirror_rules.refresh_mirror(None, mirror)
+    self.assertEqual((sorted(added), updated, removed), (["ru_1", "ru_2"], [],
+                                                         []))
+    self.assertEqual(mock_list_rule_versions.call_count, 2)
+
+    # Only the updated and new rules are fetched again.
+    mock_list_rules.side_effect = [([rule_2_v2, rule_3_v1], "")]
+    versions["ru_2"] = [rule_2_v1, rule_2_v2]
+    mirror = mirror_rules.RuleMirror(self.mirror_dir)
+    added, updated, removed = mirror_rules.refresh_mirror(None, mirror)
+    self.assertEqual((added, updated, removed), (["ru_3"], ["ru_2"], ["ru_1"]))
+    self.assertEqual(mock_list_rule_versions.call_count, 4)
+
+    mirror = mirror_rules.RuleMirror(self.mirror_dir)
+    self.assertEqual(sorted(mirror.rules), ["ru_2", "ru_3"])
+    self.assertEqual([v["versionId"] for v in mirror.versions("ru_2")],
+                     ["ru_2@v_2_0", "ru_2@v_1_0"])
+    self.assertEqual(
+        list(mirror_rules.grep_rules(mirror, r"\$e2")),
+        [("ru_2@v_2_0", 2, "  events: $e2")])
+    self.assertEqual(
+        len(list(mirror_rules.grep_rules(mirror, "events", all_versions=True))),
+        3)
+    diff = mirror_rules.diff_rule(mirror, "ru_2")
+    self.assertIn("-  events: $e\n+  events: $e2\n", diff)
+    self.assertEqual(mirror_rules.diff_rule(mirror, "ru_3"), "")
+
+    # The text of ru_1 isn't referenced anymore.
+    self.assertEqual(mirror.collect_garbage(), 1)
+    objects_dir = os.path.join(self.mirror_dir, mirror_rules.OBJECTS_DIR)
+    self.assertEqual(len(os.listdir(objects_dir)), 3)
+
+  def test_identical_texts_are_stored_once(self):
+    mirror = mirror_rules.RuleMirror(self.mirror_dir)
+    first = mirror.put_text("rule r {}")
+    second = mirror.put_text("rule r {}")
+    self.assertEqual(first, second)
+    self.assertEqual(mirror.get_text(first), "rule r {}")
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Executable and reusable sample for finding the noisiest detection rules.
+
+This module demonstrates combining multiple single-purpose modules into a larger
+workflow: the detections of all the rules in a time range are listed with
+list_detections concurrently, one time shard at a time, and only their counts
+per rule and time bucket are kept. The counts are then ranked by rule, with
+detection rates, peaks, and week-over-week changes.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import csv
+import datetime
+import logging
+from typing import Any, Dict, List, Sequence, TextIO
+
+from google.auth.transport import requests
+
+from common import chronicle_auth
+from common import datetime_converter
+from common import regions
+from common import time_ranges
+from . import list_detections
+
+# Set up logger that will include timestamps.
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s:%(levelname)s:%(name)s:%(message)s")
+_LOGGER_ = logging.getLogger("profile_detection_volume")
+
+# Maximum page size supported by the ListDetections API.
+MAX_PAGE_SIZE = 1000
+DEFAULT_BUCKET_DURATION = datetime.timedelta(hours=1)
+DEFAULT_SHARD_DURATION = datetime.timedelta(days=1)
+DEFAULT_MAX_CONCURRENCY = 4
+_WEEK = datetime.timedelta(days=7)
+
+CSV_COLUMNS = ("ruleId", "ruleName", "detections", "detectionsPerHour",
+               "peakBucketStart", "peakDetections", "lastWeek", "previousWeek",
+               "weekOverWeekChange")
+
+
+class VolumeProfile:
+  """Number of detections per rule and time bucket."""
+
+  def __init__(self, start_time: datetime.datetime,
+               end_time: datetime.datetime,
+               bucket_duration: datetime.timedelta = DEFAULT_BUCKET_DURATION):
+    """Initializes an empty profile.
+
+    Args:
+      start_time: Start of the profiled time range, inclusive.
+      end_time: End of the profiled time range, exclusive.
+      bucket_duration: Duration of each time bucket.
+    """
+    self.start_time = start_time
+    self.end_time = end_time
+    self.bucket_duration = bucket_duration
+    # (rule ID, bucket number) -> number of detections.
+    self.counts = collections.Counter()
+    self.rule_names: Dict[str, str] = {}
+
+  def bucket_of(self, t: datetime.datetime) -> int:
+    return (t - self.start_time) // self.bucket_duration
+
+  def bucket_start(self, bucket: int) -> datetime.datetime:
+    return self.start_time + bucket * self.bucket_duration
+
+  def add(self, detections: Sequence[Dict[str, Any]]):
+    """Counts detections (e.g. a page from list_detections)."""
+    for detection in detections:
+      rule_detection = (detection.get("detection") or [{}])[0]
+      rule_id = rule_detection.get("ruleId", "")
+      self.rule_names.setdefault(rule_id, rule_detection.get("ruleName", ""))
+      t = datetime_converter.iso8601_datetime_utc(detection["detectionTime"])
+      self.counts[(rule_id, self.bucket_of(t))] += 1
+
+  def update(self, other: "VolumeProfile"):
+    """Adds the counts of another profile with the same buckets."""
+    self.counts.update(other.counts)
+    for rule_id, rule_name in other.rule_names.items():
+      self.rule_names.setdefault(rule_id, rule_name)
+
+  def rank(self, limit: int = 0) -> List[Dict[str, Any]]:
+    """Returns a summary of each rule, from the noisiest to the quietest.
+
+    Week-over-week changes compare the last 7 days before the end time to the
+    7 days before them. Buckets are attributed to a week by their start time.
+
+    Args:
+      limit: Maximum number of rules to return (default = no limit).
+
+    Returns:
+      Summary of each rule, with the columns in CSV_COLUMNS.
+      weekOverWeekChange is a ratio, or None if there were no detections in the
+      previous week.
+    """
+    totals = collections.Counter()
+    peaks = {}
+    last_week = collections.Counter()
+    previous_week = collections.Counter()
+    for (rule_id, bucket), n in self.counts.items():
+      totals[rule_id] += n
+      # The peak is the bucket with the most detections (the earliest one, if
+      # there's a tie).
+      if rule_id not in peaks or (n, -bucket) > (peaks[rule_id][1],
+                                                 -peaks[rule_id][0]):
+        peaks[rule_id] = (bucket, n)
+      bucket_start = self.bucket_start(bucket)
+      if bucket_start >= self.end_time - _WEEK:
+        last_week[rule_id] += n
+      elif bucket_start >= self.end_time - 2 * _WEEK:
+        previous_week[rule_id] += n
+
+    hours = (self.end_time - self.start_time) / datetime.timedelta(hours=1)
+    rows = []
+    for rule_id, n in totals.most_common(limit or None):
+      peak_bucket, peak_count = peaks[rule_id]
+      previous = previous_week[rule_id]
+      rows.append({
+          "ruleId": rule_id,
+          "ruleName": self.rule_names.get(rule_id, ""),
+          "detections": n,
+          "detectionsPerHour": n / hours,
+          "peakBucketStart": datetime_converter.strftime(
+              self.bucket_start(peak_bucket)),
+          "peakDetections": peak_count,
+          "lastWeek": last_week[rule_id],
+          "previousWeek": previous,
+          "weekOverWeekChange": ((last_week[rule_id] - previous) / previous
+                                 if previous else None),
+      })
+    return rows
+
+
+def profile_detection_volume(
+    http_session: requests.AuthorizedSession,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    bucket_duration: datetime.timedelta = DEFAULT_BUCKET_DURATION,
+    alert_state: str = "",
+    shard_duration: datetime.timedelta = DEFAULT_SHARD_DURATION,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> VolumeProfile:
+  """Counts the detections of all the rules, per rule and time bucket.
+
+  Detections are counted as each page is listed, and aren't kept in memory.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    start_time: The detection time to start counting from, inclusive.
+    end_time: The detection time to count up to, exclusive.
+    bucket_duration: Duration of each time bucket.
+    alert_state: Optional alert state to filter by ("ALERTING" or
+      "NOT_ALERTING").
+    shard_duration: Maximum duration of the time range of each list_detections
+      crawl.
+    max_concurrency: Maximum number of time shards to list at the same time.
+
+  Returns:
+    The volume profile.
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+
+  def profile_shard(shard_start: datetime.datetime,
+                    shard_end: datetime.datetime) -> VolumeProfile:
+    profile = VolumeProfile(start_time, end_time, bucket_duration)
+    page_token = ""
+    while True:
+      detections, page_token = list_detections.list_detections(
+          http_session,
+          "-",
+          page_size=MAX_PAGE_SIZE,
+          page_token=page_token,
+          start_time=shard_start,
+          end_time=shard_end,
+          alert_state=alert_state)
+      profile.add(detections)
+      if not page_token:
+        return profile
+
+  shards = time_ranges.split_time_range_by_duration(start_time, end_time,
+                                                    shard_duration)
+  profile = VolumeProfile(start_time, end_time, bucket_duration)
+  with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+    futures = [executor.submit(profile_shard, s, e) for s, e in shards]
+    for i, future in enumerate(concurrent.futures.as_completed(futures), 1):
+      profile.update(future.result())
+      _LOGGER_.info("Listed %d of %d time shards", i, len(shards))
+  return profile
+
+
+def write_csv(rows: Sequence[Dict[str, Any]], f: TextIO):
+  """Writes ranked rules (see VolumeProfile.rank) in CSV format."""
+  writer = csv.DictWriter(f, CSV_COLUMNS)
+  writer.writeheader()
+  writer.writerows(rows)
+
+
+def format_table(rows: Sequence[Dict[str, Any]]) -> str:
+  """Formats ranked rules (see VolumeProfile.rank) as a text table."""
+  lines = [
+      f"{'DETECTIONS':>10} {'PER HOUR':>10} {'PEAK':>8} {'WOW':>8}  RULE"
+  ]
+  for row in rows:
+    change = row["weekOverWeekChange"]
+    wow = "-" if change is None else f"{change:+.0%}"
+    lines.append(f"{row['detections']:>10} {row['detectionsPerHour']:>10.2f} "
+                 f"{row['peakDetections']:>8} {wow:>8}  "
+                 f"{row['ruleName']} ({row['ruleId']})")
+  return "\n".join(lines)
+
+
+def _duration_hours(hours: str) -> datetime.timedelta:
+  return datetime.timedelta(hours=float(hours))
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  regions.add_argument_region(parser)
+  parser.add_argument(
+      "-st",
+      "--start_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      help=("detection start time in UTC ('yyyy-mm-ddThh:mm:ssZ') " +
+            "(default = 14 days before the end time)"))
+  parser.add_argument(
+      "-et",
+      "--end_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      help="detection end time in UTC ('yyyy-mm-ddThh:mm:ssZ') (default = now)")
+  parser.add_argument(
+      "-b",
+      "--bucket_hours",
+      type=_duration_hours,
+      default=DEFAULT_BUCKET_DURATION,
+      help="duration of each time bucket in hours (default = 1)")
+  parser.add_argument(
+      "-a",
+      "--alert_state",
+      type=str,
+      choices=("ALERTING", "NOT_ALERTING"),
+      default="",
+      help="alert state to filter by (default = all the detections)")
+  parser.add_argument(
+      "-n",
+      "--top",
+      type=int,
+      default=20,
+      help="number of the noisiest rules to print (default = 20)")
+  parser.add_argument(
+      "-o",
+      "--csv_file",
+      type=argparse.FileType("w"),
+      help="file to write all the ranked rules to, in CSV format")
+  parser.add_argument(
+      "-mc",
+      "--max_concurrency",
+      type=int,
+      default=DEFAULT_MAX_CONCURRENCY,
+      help="maximum number of concurrent time shards " +
+      f"(default = {DEFAULT_MAX_CONCURRENCY})")
+
+  args = parser.parse_args()
+  end = args.end_time or datetime.datetime.now(
+      datetime.timezone.utc).replace(microsecond=0)
+  start = args.start_time or end - 2 * _WEEK
+  list_detections.CHRONICLE_API_BASE_URL = regions.url(
+      list_detections.CHRONICLE_API_BASE_URL, args.region)
+  session = chronicle_auth.initialize_http_session(args.credentials_file)
+  ranked = profile_detection_volume(session, start, end, args.bucket_hours,
+                                    args.alert_state,
+                                    max_concurrency=args.max_concurrency).rank()
+  print(format_table(ranked[:args.top]))
+  if args.csv_file:
+    write_csv(ranked, args.csv_file)
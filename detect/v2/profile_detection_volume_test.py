@@ -0,0 +1,116 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "profile_detection_volume" module."""
+
+import datetime
+import io
+import unittest
+from unittest import mock
+
+from common import datetime_converter
+from . import list_detections
+from . import profile_detection_volume
+
+START = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+END = START + datetime.timedelta(days=14)
+
+
+def detection(rule_id, t):
+  return {
+      "id": f"de_{rule_id}_{t}",
+      "detectionTime": datetime_converter.strftime(t),
+      "detection": [{
+          "ruleId": rule_id,
+          "ruleName": f"name_{rule_id}"
+      }],
+  }
+
+
+# ru_noisy: 2 detections per day in the first week, 4 per day in the second.
+# ru_quiet: 1 detection, in the second week.
+DETECTIONS = sorted(
+    [
+        detection("ru_noisy", START + datetime.timedelta(days=d, hours=h))
+        for d in range(14)
+        for h in ((1, 2) if d < 7 else (1, 2, 3, 4))
+    ] + [detection("ru_quiet", START + datetime.timedelta(days=10))],
+    key=lambda d: d["detectionTime"],
+    reverse=True)
+
+
+def fake_list_detections(http_session, version_id, page_size, page_token,
+                         start_time, end_time, alert_state):
+  del http_session, page_size, alert_state  # Unused.
+  assert version_id == "-"
+  detections = [
+      d for d in DETECTIONS if start_time <=
+      datetime_converter.iso8601_datetime_utc(d["detectionTime"]) < end_time
+  ]
+  # Return 3 detections per page.
+  offset = int(page_token or 0)
+  next_token = str(offset + 3) if offset + 3 < len(detections) else ""
+  return detections[offset:offset + 3], next_token
+
+
+class ProfileDetectionVolumeTest(unittest.TestCase):
+
+  @mock.patch.object(list_detections, "list_detections", autospec=True)
+  def test_profile_detection_volume(self, mock_list_detections):
+    mock_list_detections.side_effect = fake_list_detections
+
+    profile = profile_detection_volume.profile_detection_volume(
+        None, START, END, bucket_duration=datetime.timedelta(days=1))
+
+    self.assertEqual(profile.counts[("ru_noisy", 0)], 2)
+    self.assertEqual(profile.counts[("ru_noisy", 13)], 4)
+    self.assertEqual(profile.counts[("ru_quiet", 10)], 1)
+    # 14 daily shards, and 2 pages in the shards with 4 detections.
+    self.assertEqual(mock_list_detections.call_count, 14 + 7)
+
+    rows = profile.rank()
+    self.assertEqual(rows[0], {
+        "ruleId": "ru_noisy",
+        "ruleName": "name_ru_noisy",
+        "detections": 42,
+        "detectionsPerHour": 42 / (14 * 24),
+        "peakBucketStart": "2026-01-08T00:00:00Z",
+        "peakDetections": 4,
+        "lastWeek": 28,
+        "previousWeek": 14,
+        "weekOverWeekChange": 1.0,
+    })
+    self.assertEqual(rows[1]["ruleId"], "ru_quiet")
+    self.assertIsNone(rows[1]["weekOverWeekChange"])
+    self.assertEqual(len(profile.rank(limit=1)), 1)
+
+  def test_output_formats(self):
+    profile = profile_detection_volume.VolumeProfile(START, END)
+    profile.add([detection("ru_1", START), detection("ru_1", START)])
+    rows = profile.rank()
+
+    f = io.StringIO()
+    profile_detection_volume.write_csv(rows, f)
+    lines = f.getvalue().splitlines()
+    self.assertEqual(lines[0],
+                     ",".join(profile_detection_volume.CSV_COLUMNS))
+    self.assertTrue(lines[1].startswith("ru_1,name_ru_1,2,"))
+
+    table = profile_detection_volume.format_table(rows).splitlines()
+    self.assertEqual(len(table), 2)
+    self.assertIn("name_ru_1 (ru_1)", table[1])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Executable and reusable sample for running many retrohunts concurrently.
+
+This module demonstrates combining multiple single-purpose modules into a larger
+workflow: up to a maximum number of retrohunts are kept running at the same
+time, all of them are polled in a single loop (each one at an interval based on
+its rate of progress), retrohunts that exceed their deadline are cancelled, and
+completed retrohunts are handed over to a detection collector.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import time
+from typing import Any, Callable, Iterator, Mapping, Optional, Sequence
+
+from google.auth.transport import requests
+
+from common import chronicle_auth
+from common import datetime_converter
+from common import poll_schedule
+from common import regions
+from . import cancel_retrohunt
+from . import get_retrohunt
+from . import list_detections
+from . import run_retrohunt
+
+# Set up logger that will include timestamps.
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s:%(levelname)s:%(name)s:%(message)s")
+_LOGGER_ = logging.getLogger("retrohunt_orchestrator")
+
+# Default maximum number of retrohunts running at the same time.
+DEFAULT_MAX_RUNNING = 10
+# Default minimum and maximum intervals between polls of each retrohunt.
+DEFAULT_MIN_POLL_SECONDS = 5.0
+DEFAULT_MAX_POLL_SECONDS = 300.0
+# Maximum page size supported by the ListDetections API.
+MAX_PAGE_SIZE = 1000
+
+# Job states, in addition to the retrohunt states ("RUNNING", "DONE",
+# "CANCELLED").
+PENDING = "PENDING"
+FAILED = "FAILED"
+TIMED_OUT = "TIMED_OUT"
+_FINAL_STATES = ("DONE", "CANCELLED", FAILED, TIMED_OUT)
+
+
+class RetrohuntJob:
+  """A retrohunt to run, and its latest known status."""
+
+  def __init__(self,
+               version_id: str,
+               start_time: datetime.datetime,
+               end_time: datetime.datetime,
+               timeout: Optional[datetime.timedelta] = None):
+    """Initializes the job.
+
+    Args:
+      version_id: Unique ID of the detection rule to run the retrohunt for
+        ("ru_<UUID>" or "ru_<UUID>@v_<seconds>_<nanoseconds>").
+      start_time: The start time of the time range the retrohunt will process.
+      end_time: The end time of the time range the retrohunt will process.
+      timeout: Optional maximum running time, after which the retrohunt is
+        cancelled.
+    """
+    self.version_id = version_id
+    self.start_time = start_time
+    self.end_time = end_time
+    self.timeout = timeout
+    self.retrohunt_id = ""
+    self.state = PENDING
+    self.progress_percentage = 0.0
+    self.error = ""
+    self.deadline: Optional[float] = None
+    self.next_poll = 0.0
+    self.schedule: Optional[poll_schedule.PollSchedule] = None
+
+  def update(self, retrohunt: Mapping[str, Any]):
+    """Updates the job's status based on a retrohunt from the API."""
+    # The retrohunt's version ID is resolved, even if the job's isn't.
+    self.version_id = retrohunt.get("versionId", self.version_id)
+    self.retrohunt_id = retrohunt.get("retrohuntId", self.retrohunt_id)
+    self.state = retrohunt.get("state", "STATE_UNSPECIFIED")
+    self.progress_percentage = float(retrohunt.get("progressPercentage", 0.0))
+
+  def __repr__(self) -> str:
+    return (f"RetrohuntJob({self.version_id}, {self.retrohunt_id or '-'}, "
+            f"{self.state}, {self.progress_percentage}%)")
+
+
+def run_retrohunts(
+    http_session: requests.AuthorizedSession,
+    jobs: Sequence[RetrohuntJob],
+    collector: Optional[Callable[[RetrohuntJob], None]] = None,
+    max_running: int = DEFAULT_MAX_RUNNING,
+    min_poll_seconds: float = DEFAULT_MIN_POLL_SECONDS,
+    max_poll_seconds: float = DEFAULT_MAX_POLL_SECONDS,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep) -> Sequence[RetrohuntJob]:
+  """Runs retrohunts concurrently, and waits for all of them to finish.
+
+  Jobs are started in order, as long as there are fewer than max_running
+  retrohunts running. A job that fails to start or to be polled (e.g. due to
+  an HTTP or connection error) is marked as FAILED, without affecting the
+  other jobs.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    jobs: Retrohunts to run.
+    collector: Optional function to call with each job whose retrohunt is DONE
+      (e.g. to list its detections), as soon as it's done.
+    max_running: Maximum number of retrohunts running at the same time.
+    min_poll_seconds: Minimum interval between polls of each retrohunt.
+    max_poll_seconds: Maximum interval between polls of each retrohunt.
+    clock: Function that returns the current time in seconds.
+    sleep: Function that sleeps for a number of seconds.
+
+  Returns:
+    The same jobs, in their final states: DONE, CANCELLED (by someone else),
+    TIMED_OUT (cancelled by us), or FAILED (with an error message).
+  """
+  pending = list(reversed(jobs))
+  running = []
+
+  def finish(job: RetrohuntJob):
+    running.remove(job)
+    _LOGGER_.info("Finished %s", job)
+    if job.state == "DONE" and collector:
+      collector(job)
+
+  def schedule_poll(job: RetrohuntJob):
+    interval = job.schedule.next_interval(job.progress_percentage)
+    job.next_poll = clock() + interval
+
+  while pending or running:
+    while pending and len(running) < max_running:
+      job = pending.pop()
+      try:
+        job.update(
+            run_retrohunt.run_retrohunt(http_session, job.version_id,
+                                        job.start_time, job.end_time))
+      except requests.requests.exceptions.RequestException as e:
+        job.state, job.error = FAILED, str(e)
+        _LOGGER_.warning("Failed to start %s: %s", job, e)
+        continue
+      _LOGGER_.info("Started %s", job)
+      if job.timeout is not None:
+        job.deadline = clock() + job.timeout.total_seconds()
+      job.schedule = poll_schedule.PollSchedule(min_poll_seconds,
+                                                max_poll_seconds, clock)
+      running.append(job)
+      schedule_poll(job)
+
+    for job in list(running):
+      now = clock()
+      if job.deadline is not None and now >= job.deadline:
+        try:
+          cancel_retrohunt.cancel_retrohunt(http_session, job.version_id,
+                                            job.retrohunt_id)
+          job.state = TIMED_OUT
+        except requests.requests.exceptions.RequestException as e:
+          job.state, job.error = FAILED, f"cancellation failed: {e}"
+        finish(job)
+        continue
+      if now < job.next_poll:
+        continue
+      try:
+        job.update(
+            get_retrohunt.get_retrohunt(http_session, job.version_id,
+                                        job.retrohunt_id))
+      except requests.requests.exceptions.RequestException as e:
+        job.state, job.error = FAILED, str(e)
+      if job.state in _FINAL_STATES:
+        finish(job)
+      else:
+        schedule_poll(job)
+
+    if not running:
+      continue
+    done = sum(j.state in _FINAL_STATES for j in jobs)
+    progress = sum(
+        100.0 if j.state in _FINAL_STATES else j.progress_percentage
+        for j in jobs) / len(jobs)
+    _LOGGER_.info("Progress: %.1f%% (%d done, %d running, %d pending)",
+                  progress, done, len(running), len(pending))
+    wakeups = [j.next_poll for j in running]
+    wakeups += [j.deadline for j in running if j.deadline is not None]
+    sleep(max(min(wakeups) - clock(), 0.0))
+
+  return jobs
+
+
+def iter_job_detections(http_session: requests.AuthorizedSession,
+                        job: RetrohuntJob) -> Iterator[Mapping[str, Any]]:
+  """Yields all the detections of a job's rule version within its time range.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    job: A job whose retrohunt is done.
+
+  Yields:
+    Detections, page by page.
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  page_token = ""
+  while True:
+    detections, page_token = list_detections.list_detections(
+        http_session,
+        job.version_id,
+        page_size=MAX_PAGE_SIZE,
+        page_token=page_token,
+        start_time=job.start_time,
+        end_time=job.end_time)
+    yield from detections
+    if not page_token:
+      return
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  regions.add_argument_region(parser)
+  parser.add_argument(
+      "-vf",
+      "--version_ids_file",
+      type=argparse.FileType("r"),
+      required=True,
+      help=("path of a file with one version ID per line "
+            "('ru_<UUID>[@v_<seconds>_<nanoseconds>]'), or - for STDIN"))
+  parser.add_argument(
+      "-st",
+      "--start_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      required=True,
+      help="Event start time in UTC ('yyyy-mm-ddThh:mm:ssZ')")
+  parser.add_argument(
+      "-et",
+      "--end_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      required=True,
+      help="Event end time in UTC ('yyyy-mm-ddThh:mm:ssZ')")
+  parser.add_argument(
+      "-mr",
+      "--max_running",
+      type=int,
+      default=DEFAULT_MAX_RUNNING,
+      help=("maximum number of retrohunts running at the same time "
+            f"(default = {DEFAULT_MAX_RUNNING})"))
+  parser.add_argument(
+      "-tm",
+      "--timeout_minutes",
+      type=float,
+      help="timeout in minutes for each retrohunt (default = no timeout)")
+  parser.add_argument(
+      "-o",
+      "--output_file",
+      type=argparse.FileType("w"),
+      help="file to write the detections of completed retrohunts to (NDJSON)")
+
+  args = parser.parse_args()
+  for module in (cancel_retrohunt, get_retrohunt, list_detections,
+                 run_retrohunt):
+    module.CHRONICLE_API_BASE_URL = regions.url(module.CHRONICLE_API_BASE_URL,
+                                                args.region)
+  session = chronicle_auth.initialize_http_session(args.credentials_file)
+
+  timeout = None
+  if args.timeout_minutes is not None:
+    timeout = datetime.timedelta(minutes=args.timeout_minutes)
+  retrohunt_jobs = [
+      RetrohuntJob(line.strip(), args.start_time, args.end_time, timeout)
+      for line in args.version_ids_file
+      if line.strip()
+  ]
+
+  def write_detections(job: RetrohuntJob):
+    count = 0
+    for detection in iter_job_detections(session, job):
+      if args.output_file:
+        args.output_file.write(json.dumps(detection) + "\n")
+      count += 1
+    _LOGGER_.info("Collected %d detections of %s", count, job)
+
+  run_retrohunts(session, retrohunt_jobs, write_detections, args.max_running)
+  for j in retrohunt_jobs:
+    print(f"{j.version_id}\t{j.retrohunt_id}\t{j.state}\t{j.error}")
@@ -0,0 +1,141 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "retrohunt_orchestrator" module."""
+
+import datetime
+import unittest
+from unittest import mock
+
+from google.auth.transport import requests
+
+from . import cancel_retrohunt
+from . import get_retrohunt
+from . import retrohunt_orchestrator
+from . import run_retrohunt
+
+
+class FakeRetrohunts:
+  """Fake retrohunts, which progress by a fixed percentage every second."""
+
+  def __init__(self, rates):
+    self.now = 0.0
+    self.rates = rates  # Version ID -> progress percentage per second.
+    self.started = {}  # Version ID -> start time.
+    self.max_running = 0
+    self.num_polls = 0
+    self.poll_errors = {}  # Version ID -> error to raise when it's polled.
+
+  def running(self):
+    return sum(self.progress(v) < 100 for v in self.started)
+
+  def progress(self, version_id):
+    elapsed = self.now - self.started[version_id]
+    return min(elapsed * self.rates[version_id], 100.0)
+
+  def retrohunt(self, version_id):
+    progress = self.progress(version_id)
+    return {
+        "versionId": version_id,
+        "retrohuntId": f"oh_{version_id}",
+        "state": "DONE" if progress >= 100 else "RUNNING",
+        "progressPercentage": str(progress),
+    }
+
+  def run(self, http_session, version_id, start_time, end_time):
+    del http_session, start_time, end_time  # Unused.
+    if self.rates[version_id] is None:
+      raise requests.requests.exceptions.HTTPError("429 Too Many Requests")
+    self.started[version_id] = self.now
+    self.max_running = max(self.max_running, self.running())
+    return self.retrohunt(version_id)
+
+  def get(self, http_session, version_id, retrohunt_id):
+    del http_session, retrohunt_id  # Unused.
+    self.num_polls += 1
+    if version_id in self.poll_errors:
+      raise self.poll_errors[version_id]
+    return self.retrohunt(version_id)
+
+  def sleep(self, seconds):
+    self.now += seconds
+
+
+class RetrohuntOrchestratorTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.start_time = datetime.datetime(
+        2021, 1, 1, tzinfo=datetime.timezone.utc)
+    self.end_time = datetime.datetime(2021, 1, 2, tzinfo=datetime.timezone.utc)
+
+  def run_jobs(self, fake, jobs, **kwargs):
+    with mock.patch.object(run_retrohunt, "run_retrohunt", fake.run), \
+        mock.patch.object(get_retrohunt, "get_retrohunt", fake.get):
+      return retrohunt_orchestrator.run_retrohunts(
+          None, jobs, clock=lambda: fake.now, sleep=fake.sleep, **kwargs)
+
+  def test_run_retrohunts(self):
+    fake = FakeRetrohunts({"ru_1": 1.0, "ru_2": 0.25, "ru_3": 2.0, "ru_4": None})
+    jobs = [
+        retrohunt_orchestrator.RetrohuntJob(v, self.start_time, self.end_time)
+        for v in ("ru_1", "ru_2", "ru_3", "ru_4")
+    ]
+    collected = []
+
+    self.run_jobs(
+        fake, jobs, collector=lambda j: collected.append(j.version_id),
+        max_running=2)
+
+    self.assertEqual([j.state for j in jobs],
+                     ["DONE", "DONE", "DONE", retrohunt_orchestrator.FAILED])
+    self.assertIn("429", jobs[3].error)
+    self.assertEqual(collected, ["ru_1", "ru_3", "ru_2"])
+    self.assertEqual(fake.max_running, 2)
+    # Polling every 5 seconds would take over 100 polls.
+    self.assertLess(fake.num_polls, 30)
+
+  def test_connection_error_fails_only_its_job(self):
+    fake = FakeRetrohunts({"ru_1": 1.0, "ru_2": 1.0})
+    fake.poll_errors = {
+        "ru_1": requests.requests.exceptions.ConnectionError("reset")
+    }
+    jobs = [
+        retrohunt_orchestrator.RetrohuntJob(v, self.start_time, self.end_time)
+        for v in ("ru_1", "ru_2")
+    ]
+
+    self.run_jobs(fake, jobs)
+
+    self.assertEqual([j.state for j in jobs],
+                     [retrohunt_orchestrator.FAILED, "DONE"])
+    self.assertIn("reset", jobs[0].error)
+
+  @mock.patch.object(cancel_retrohunt, "cancel_retrohunt", autospec=True)
+  def test_cancel_after_timeout(self, mock_cancel_retrohunt):
+    fake = FakeRetrohunts({"ru_1": 0.01})
+    job = retrohunt_orchestrator.RetrohuntJob(
+        "ru_1", self.start_time, self.end_time, datetime.timedelta(minutes=10))
+    collector = mock.Mock()
+
+    self.run_jobs(fake, [job], collector=collector)
+
+    self.assertEqual(job.state, retrohunt_orchestrator.TIMED_OUT)
+    self.assertEqual(fake.now, 600.0)
+    mock_cancel_retrohunt.assert_called_once_with(None, "ru_1", "oh_ru_1")
+    collector.assert_not_called()
+
+
+if __name__ == "__main__":
+  unittest.main()
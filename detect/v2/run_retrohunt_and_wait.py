@@ -23,8 +23,10 @@ workflow.
 import argparse
 import datetime
 import json
+import queue
+import threading
 import time
-from typing import Any, Mapping, Sequence, Tuple
+from typing import Any, Iterator, Mapping, Sequence, Tuple
 
 from google.auth.transport import requests
 
@@ -42,6 +44,10 @@ CHRONICLE_API_BASE_URL = "https://backstory.googleapis.com"
 DEFAULT_SLEEP_SECONDS = 5
 # Timeout used to wait until retrohunt is complete.
 DEFAULT_TIMEOUT_MINUTES = 1440.0  # 1 day = 60 * 24 = 1440 minutes.
+# Maximum page size supported by the ListDetections API.
+MAX_PAGE_SIZE = 1000
+# Number of detection pages to fetch ahead of the caller.
+DEFAULT_PREFETCH_PAGES = 2
 
 
 def get_retrohunt_info(
@@ -58,23 +64,21 @@ def get_retrohunt_info(
           retrohunt.get("progressPercentage", 0.0))
 
 
-def run_retrohunt_and_wait(
+def wait_for_retrohunt(
     http_session: requests.AuthorizedSession,
     version_id: str,
     start_time: datetime.datetime,
     end_time: datetime.datetime,
     sleep_seconds: int = DEFAULT_SLEEP_SECONDS,
-    timeout_minutes: float = DEFAULT_TIMEOUT_MINUTES,
-    page_size: int = 0
-    ) -> Tuple[Sequence[Mapping[str, Any]], str]:
-  """Runs a retrohunt and wait, and receive detections.
+    timeout_minutes: float = DEFAULT_TIMEOUT_MINUTES) -> str:
+  """Runs a retrohunt and waits for it to complete.
 
   When retrohunt does not complete within the 'timeout_minutes' time period,
   it cancels the retrohunt and returns TimeoutError.
 
   Args:
     http_session: Authorized session for HTTP requests.
-    version_id: Unique ID of the detection rule to retrieve errors for
+    version_id: Unique ID of the detection rule to run the retrohunt for
       ("ru_<UUID>" or "ru_<UUID>@v_<seconds>_<nanoseconds>"). If a version
       suffix isn't specified we use the rule's latest version.
     start_time: The start time of the time range the retrohunt will process.
@@ -83,14 +87,10 @@ def run_retrohunt_and_wait(
       DONE or CANCELLED.
     timeout_minutes: Optional timeout in minutes. This is used to wait for the
       retrohunt to complete.
-    page_size: Maximum number of detections in the response. Must be
-      non-negative. This is optional. If not provided, default value 100 is
-      applied.
 
   Returns:
-    First page of detections and page token, which is a Base64 token for
-    getting the detections of the next page (an empty token string means the
-    currently retrieved page is the last one).
+    Version ID of the rule that the retrohunt ran ("ru_<UUID>@v_<seconds>_
+    <nanoseconds>").
 
   Raises:
     requests.exceptions.HTTPError: HTTP request resulted in an error
@@ -128,6 +128,50 @@ def run_retrohunt_and_wait(
     raise TimeoutError(
         f"Retrohunt not completed after {timeout_minutes} minutes.")
 
+  return version_id
+
+
+def run_retrohunt_and_wait(
+    http_session: requests.AuthorizedSession,
+    version_id: str,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    sleep_seconds: int = DEFAULT_SLEEP_SECONDS,
+    timeout_minutes: float = DEFAULT_TIMEOUT_MINUTES,
+    page_size: int = 0
+    ) -> Tuple[Sequence[Mapping[str, Any]], str]:
+  """Runs a retrohunt and wait, and receive detections.
+
+  When retrohunt does not complete within the 'timeout_minutes' time period,
+  it cancels the retrohunt and returns TimeoutError.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    version_id: Unique ID of the detection rule to retrieve errors for
+      ("ru_<UUID>" or "ru_<UUID>@v_<seconds>_<nanoseconds>"). If a version
+      suffix isn't specified we use the rule's latest version.
+    start_time: The start time of the time range the retrohunt will process.
+    end_time: The end time of the time range the retrohunt will process.
+    sleep_seconds: Optional interval between retrohunt status checks, until it's
+      DONE or CANCELLED.
+    timeout_minutes: Optional timeout in minutes. This is used to wait for the
+      retrohunt to complete.
+    page_size: Maximum number of detections in the response. Must be
+      non-negative. This is optional. If not provided, default value 100 is
+      applied.
+
+  Returns:
+    First page of detections and page token, which is a Base64 token for
+    getting the detections of the next page (an empty token string means the
+    currently retrieved page is the last one).
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+    TimeoutError: When retrohunt does not complete by timeout.
+  """
+  version_id = wait_for_retrohunt(http_session, version_id, start_time,
+                                  end_time, sleep_seconds, timeout_minutes)
   print("Returning first page of detections.")
   return list_detections.list_detections(
       http_session,
@@ -137,6 +181,121 @@ def run_retrohunt_and_wait(
       end_time=end_time)
 
 
+def iter_detections(
+    http_session: requests.AuthorizedSession,
+    version_id: str,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    page_size: int = MAX_PAGE_SIZE,
+    prefetch_pages: int = DEFAULT_PREFETCH_PAGES
+) -> Iterator[Mapping[str, Any]]:
+  """Yields all the detections of a rule version, fetching pages ahead of time.
+
+  A background thread fetches up to prefetch_pages pages ahead of the caller,
+  so only those pages (and not all the detections) are held in memory. The
+  thread stops when the generator is exhausted or closed.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    version_id: Unique ID of the detection rule version to list detections for.
+    start_time: The time to start listing detections from, inclusive.
+    end_time: The time to end listing detections to, exclusive.
+    page_size: Maximum number of detections in each page.
+    prefetch_pages: Maximum number of pages to fetch ahead of the caller.
+
+  Yields:
+    Detections, ordered by descending detection time.
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  pages = queue.Queue(maxsize=max(prefetch_pages, 1))
+  stopped = threading.Event()
+
+  def put(item: Any):
+    # Don't block forever if the caller stopped consuming pages.
+    while not stopped.is_set():
+      try:
+        pages.put(item, timeout=0.1)
+        return
+      except queue.Full:
+        pass
+
+  def fetch_pages():
+    page_token = ""
+    try:
+      while not stopped.is_set():
+        detections, page_token = list_detections.list_detections(
+            http_session,
+            version_id=version_id,
+            page_size=page_size,
+            page_token=page_token,
+            start_time=start_time,
+            end_time=end_time)
+        put(detections)
+        if not page_token:
+          break
+    except Exception as e:  # pylint: disable=broad-except
+      put(e)  # Re-raised in the caller's thread.
+      return
+    put(None)
+
+  fetcher = threading.Thread(target=fetch_pages, daemon=True)
+  fetcher.start()
+  try:
+    while True:
+      page = pages.get()
+      if page is None:
+        return
+      if isinstance(page, Exception):
+        raise page
+      yield from page
+  finally:
+    stopped.set()
+    fetcher.join()
+
+
+def run_retrohunt_and_stream(
+    http_session: requests.AuthorizedSession,
+    version_id: str,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    sleep_seconds: int = DEFAULT_SLEEP_SECONDS,
+    timeout_minutes: float = DEFAULT_TIMEOUT_MINUTES,
+    page_size: int = MAX_PAGE_SIZE,
+    prefetch_pages: int = DEFAULT_PREFETCH_PAGES
+) -> Iterator[Mapping[str, Any]]:
+  """Runs a retrohunt, waits for it, and yields all of its detections.
+
+  This is a generator, so the retrohunt starts only when the first detection
+  is requested.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    version_id: Unique ID of the detection rule to run the retrohunt for
+      ("ru_<UUID>" or "ru_<UUID>@v_<seconds>_<nanoseconds>").
+    start_time: The start time of the time range the retrohunt will process.
+    end_time: The end time of the time range the retrohunt will process.
+    sleep_seconds: Optional interval between retrohunt status checks.
+    timeout_minutes: Optional timeout in minutes to wait for the retrohunt.
+    page_size: Maximum number of detections in each page.
+    prefetch_pages: Maximum number of pages to fetch ahead of the caller.
+
+  Yields:
+    All the detections of the retrohunt's rule version and time range.
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+    TimeoutError: When retrohunt does not complete by timeout.
+  """
+  version_id = wait_for_retrohunt(http_session, version_id, start_time,
+                                  end_time, sleep_seconds, timeout_minutes)
+  yield from iter_detections(http_session, version_id, start_time, end_time,
+                             page_size, prefetch_pages)
+
+
 if __name__ == "__main__":
   parser = argparse.ArgumentParser()
   chronicle_auth.add_argument_credentials_file(parser)
@@ -178,12 +337,29 @@ if __name__ == "__main__":
       type=int,
       required=False,
       help="maximum number of detections to return")
+  parser.add_argument(
+      "-o",
+      "--output_file",
+      type=argparse.FileType("w"),
+      required=False,
+      help=("write all the detections (not just the first page) to this file, "
+            "one JSON object per line"))
 
   args = parser.parse_args()
   CHRONICLE_API_BASE_URL = regions.url(CHRONICLE_API_BASE_URL, args.region)
   session = chronicle_auth.initialize_http_session(args.credentials_file)
-  detections, next_page_token = run_retrohunt_and_wait(
-      session, args.version_id, args.start_time, args.end_time,
-      args.sleep_seconds, args.timeout_minutes, args.page_size)
-  print(json.dumps(detections, indent=2))
-  print(f"Next page token: {next_page_token}")
+  if args.output_file:
+    count = 0
+    for detection in run_retrohunt_and_stream(
+        session, args.version_id, args.start_time, args.end_time,
+        args.sleep_seconds, args.timeout_minutes, args.page_size or
+        MAX_PAGE_SIZE):
+      args.output_file.write(json.dumps(detection) + "\n")
+      count += 1
+    print(f"Wrote {count} detections to {args.output_file.name}")
+  else:
+    detections, next_page_token = run_retrohunt_and_wait(
+        session, args.version_id, args.start_time, args.end_time,
+        args.sleep_seconds, args.timeout_minutes, args.page_size)
+    print(json.dumps(detections, indent=2))
+    print(f"Next page token: {next_page_token}")
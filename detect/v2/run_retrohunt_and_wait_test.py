@@ -20,6 +20,7 @@ from unittest import mock
 
 from google.auth.transport import requests
 
+from . import list_detections
 from . import run_retrohunt_and_wait as wait
 
 
@@ -221,6 +222,54 @@ class RunRetrohuntAndWaitTest(unittest.TestCase):
           sleep_seconds=2,
           timeout_minutes=0.02)
 
+  @mock.patch.object(list_detections, "list_detections", autospec=True)
+  def test_iter_detections_all_pages(self, mock_list_detections):
+    mock_list_detections.side_effect = [
+        ([{"id": "de_1"}, {"id": "de_2"}], "token1"),
+        ([{"id": "de_3"}], "token2"),
+        ([], ""),
+    ]
+    end_time = datetime.datetime.now()
+    start_time = end_time - datetime.timedelta(hours=1)
+
+    detections = wait.iter_detections(None, "ru_1@v_1_1", start_time, end_time)
+
+    self.assertEqual([d["id"] for d in detections], ["de_1", "de_2", "de_3"])
+    self.assertEqual(
+        [c.kwargs["page_token"] for c in mock_list_detections.call_args_list],
+        ["", "token1", "token2"])
+
+  @mock.patch.object(list_detections, "list_detections", autospec=True)
+  def test_iter_detections_error(self, mock_list_detections):
+    mock_list_detections.side_effect = [
+        ([{"id": "de_1"}], "token1"),
+        requests.requests.exceptions.HTTPError(),
+    ]
+    end_time = datetime.datetime.now()
+    start_time = end_time - datetime.timedelta(hours=1)
+
+    detections = wait.iter_detections(None, "ru_1@v_1_1", start_time, end_time)
+
+    self.assertEqual(next(detections)["id"], "de_1")
+    with self.assertRaises(requests.requests.exceptions.HTTPError):
+      next(detections)
+
+  @mock.patch.object(list_detections, "list_detections", autospec=True)
+  def test_iter_detections_stops_prefetching_when_closed(
+      self, mock_list_detections):
+    mock_list_detections.return_value = ([{"id": "de_1"}], "token")
+    end_time = datetime.datetime.now()
+    start_time = end_time - datetime.timedelta(hours=1)
+
+    detections = wait.iter_detections(
+        None, "ru_1@v_1_1", start_time, end_time, prefetch_pages=2)
+    next(detections)
+    detections.close()
+
+    # The page that was consumed, the ones that were prefetched, and at most
+    # one more that was in flight.
+    self.assertLessEqual(mock_list_detections.call_count, 4)
+
 
 if __name__ == "__main__":
   unittest.main()
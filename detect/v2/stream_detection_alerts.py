@@ -23,10 +23,12 @@ https://cloud.google.com/chronicle/docs/reference/detection-engine-api#streamdet
 import argparse
 import collections
 import datetime
+import gzip
 import json
 import logging
 import time
-from typing import Any, Callable, Iterator, Mapping, Optional, Sequence, Tuple
+from typing import (Any, Callable, Iterable, Iterator, Mapping, Optional,
+                    Sequence, Tuple)
 
 from google.auth.transport import requests
 
@@ -72,9 +74,75 @@ DETECTIONS_PER_WEBHOOK_MESSAGE = 3
 
 CHRONICLE_API_BASE_URL = "https://backstory.googleapis.com"
 
+# Suffix of the index file that is written next to a stream capture file.
+CAPTURE_INDEX_SUFFIX = ".idx"
+
+
+class StreamCapture:
+  """Tees the raw lines of stream responses into a compressed capture file.
+
+  Each record in the gzip-compressed capture file is one line of text:
+  "<seconds since the capture started>\t<JSON-encoded raw stream line>".
+
+  A plain-text index file ("<capture file>.idx") maps each continuation time
+  received over the stream to the number of records captured up to that point,
+  so replays can resume from a given continuation time without re-parsing
+  everything before it.
+  """
+
+  def __init__(self, capture_file: str):
+    self._records = gzip.open(capture_file, "wt", encoding="utf-8")
+    self._index = open(
+        capture_file + CAPTURE_INDEX_SUFFIX, "w", encoding="utf-8")
+    self._start = time.monotonic()
+    self._count = 0
+
+  def tee(self, lines: Iterable[str]) -> Iterator[str]:
+    """Writes each line to the capture file, and yields it unchanged."""
+    for line in lines:
+      elapsed = time.monotonic() - self._start
+      self._records.write(f"{elapsed:.6f}\t{json.dumps(line)}\n")
+      self._count += 1
+      yield line
+
+  def mark(self, continuation_time: str):
+    """Records that all the lines so far lead up to the continuation time."""
+    # The records must be readable before the index points past them, in case
+    # the capture is interrupted before it's closed.
+    self._records.flush()
+    self._index.write(f"{continuation_time}\t{self._count}\n")
+    self._index.flush()
+
+  def close(self):
+    self._records.close()
+    self._index.close()
+
+
+def parse_lines(lines: Iterable[str]) -> Iterator[Mapping[str, Any]]:
+  """Parses raw stream lines, each of which contains one detection batch.
+
+  Args:
+    lines: Lines of a stream response, e.g. from response.iter_lines() or from
+      a stream capture file.
+
+  Yields:
+    Dictionary representations of each detection batch.
+  """
+  for line in lines:
+    if not line:
+      continue
+
+    # Trim all characters before first opening brace, and after last closing
+    # brace. Example:
+    #   Input:  "  {'key1': 'value1'},  "
+    #   Output: "{'key1': 'value1'}"
+    json_string = "{" + line.split("{", 1)[1].rsplit("}", 1)[0] + "}"
+    yield json.loads(json_string)
+
 
 def parse_stream(
-    response: requests.requests.Response) -> Iterator[Mapping[str, Any]]:
+    response: requests.requests.Response,
+    capture: Optional[StreamCapture] = None) -> Iterator[Mapping[str, Any]]:
   """Parses a stream response containing one detection batch.
 
   The requests library provides utilities for iterating over the HTTP stream
@@ -86,6 +154,8 @@ def parse_stream(
 
   Args:
     response: The response object returned from post().
+    capture: Optional stream capture, which receives a copy of each raw line
+      before it is parsed.
 
   Yields:
     Dictionary representations of each detection batch that was sent over the
@@ -95,16 +165,10 @@ def parse_stream(
     if response.encoding is None:
       response.encoding = "utf-8"
 
-    for line in response.iter_lines(decode_unicode=True, delimiter="\r\n"):
-      if not line:
-        continue
-
-      # Trim all characters before first opening brace, and after last closing
-      # brace. Example:
-      #   Input:  "  {'key1': 'value1'},  "
-      #   Output: "{'key1': 'value1'}"
-      json_string = "{" + line.split("{", 1)[1].rsplit("}", 1)[0] + "}"
-      yield json.loads(json_string)
+    lines = response.iter_lines(decode_unicode=True, delimiter="\r\n")
+    if capture:
+      lines = capture.tee(lines)
+    yield from parse_lines(lines)
 
   except Exception as e:  # pylint: disable=broad-except
     # Chronicle's servers will generally send a {"error": ...} dict over the
@@ -251,6 +315,7 @@ def stream_detection_alerts(
     http_session: requests.AuthorizedSession,
     req_data: Mapping[str, Any],
     process_detection_batch_callback: Callable[[DetectionBatch], None],
+    capture: Optional[StreamCapture] = None,
 ) -> Tuple[int, str, str]:
   """Makes one call to stream_detection_alerts, and runs until disconnection.
 
@@ -362,6 +427,8 @@ def stream_detection_alerts(
       or contains they key, "continuationTime").
     process_detection_batch_callback: A callback functions that operates on a
       single detection batch. (e.g. to integrate with other platforms)
+    capture: Optional stream capture, which receives a copy of the raw response
+      lines (see replay_capture).
 
   Returns:
     Tuple containing (HTTP response status code from connection attempt,
@@ -408,41 +475,74 @@ def stream_detection_alerts(
           "connection refused with " +
           f"status={response.status_code}, error={response.text}")
     else:
-      # Loop over each detection batch that is streamed. The following
-      # loop will block, and an iteration only runs when the server
-      # sends a detection batch.
-      for batch in parse_stream(response):
-        if "error" in batch:
-          error_dump = json.dumps(batch["error"], indent="\t")
-          disconnection_reason = f"connection closed with error: {error_dump}"
-          break
-
-        if "heartbeat" in batch:
-          _LOGGER_.info("Got empty heartbeat (confirms connection/keepalive)")
-          continue
-
-        # When we reach this line, we have successfully received
-        # a non-heartbeat detection batch.
-        continuation_time = batch["continuationTime"]
-        if "detections" not in batch:
-          _LOGGER_.info("Got a new continuationTime=%s, no detections",
-                        continuation_time)
-          continue
-        else:
-          _LOGGER_.info("Got detection batch with continuationTime=%s",
-                        continuation_time)
-
-        # Process the batch using the callback.
-        detections = batch["detections"]
-        process_detection_batch_callback((detections, continuation_time))
+      # The following loop will block, and an iteration only runs when the
+      # server sends a detection batch.
+      disconnection_reason, continuation_time = process_detection_batches(
+          parse_stream(response, capture), process_detection_batch_callback,
+          capture)
 
   return (response_code, disconnection_reason, continuation_time)
 
 
+def process_detection_batches(
+    batches: Iterator[Mapping[str, Any]],
+    process_detection_batch_callback: Callable[[DetectionBatch], None],
+    capture: Optional[StreamCapture] = None,
+) -> Tuple[str, str]:
+  """Passes parsed detection batches to the callback, until an error batch.
+
+  Args:
+    batches: Parsed detection batches, from a live stream or from a replay.
+    process_detection_batch_callback: A callback functions that operates on a
+      single detection batch. (e.g. to integrate with other platforms)
+    capture: Optional stream capture, which gets indexed by the continuation
+      time of each non-heartbeat detection batch.
+
+  Returns:
+    Tuple containing (disconnection reason or empty string if the batches ran
+    out without an error, continuation time string received in most recent
+    non-heartbeat detection batch or empty string if no such non-heartbeat
+    detection batch was received).
+  """
+  disconnection_reason = ""
+  continuation_time = ""
+
+  # Loop over each detection batch.
+  for batch in batches:
+    if "error" in batch:
+      error_dump = json.dumps(batch["error"], indent="\t")
+      disconnection_reason = f"connection closed with error: {error_dump}"
+      break
+
+    if "heartbeat" in batch:
+      _LOGGER_.info("Got empty heartbeat (confirms connection/keepalive)")
+      continue
+
+    # When we reach this line, we have successfully received
+    # a non-heartbeat detection batch.
+    continuation_time = batch["continuationTime"]
+    if capture:
+      capture.mark(continuation_time)
+    if "detections" not in batch:
+      _LOGGER_.info("Got a new continuationTime=%s, no detections",
+                    continuation_time)
+      continue
+    else:
+      _LOGGER_.info("Got detection batch with continuationTime=%s",
+                    continuation_time)
+
+    # Process the batch using the callback.
+    detections = batch["detections"]
+    process_detection_batch_callback((detections, continuation_time))
+
+  return (disconnection_reason, continuation_time)
+
+
 def stream_detection_alerts_in_retry_loop(
     credentials_file: str,
     process_detection_batch_callback: Callable[[DetectionBatch], None],
     initial_continuation_time: Optional[datetime.datetime] = None,
+    capture_file: Optional[str] = None,
 ):
   """Calls stream_detection_alerts and manages state for reconnections.
 
@@ -455,12 +555,31 @@ def stream_detection_alerts_in_retry_loop(
       stream_detection_alerts connection (default = server will set this to the
       time of connection). Subsequent stream_detection_alerts connections will
       use continuation times from past connections.
+    capture_file: Optional path of a gzip-compressed file to capture the raw
+      stream responses of all the connections into, for replay_capture.
 
   Raises:
     RuntimeError: Hit retry limit after multiple consecutive failures
       without success.
 
   """
+  capture = StreamCapture(capture_file) if capture_file else None
+  try:
+    _stream_detection_alerts_in_retry_loop(credentials_file,
+                                           process_detection_batch_callback,
+                                           initial_continuation_time, capture)
+  finally:
+    if capture:
+      capture.close()
+
+
+def _stream_detection_alerts_in_retry_loop(
+    credentials_file: str,
+    process_detection_batch_callback: Callable[[DetectionBatch], None],
+    initial_continuation_time: Optional[datetime.datetime],
+    capture: Optional[StreamCapture],
+):
+  """Implements stream_detection_alerts_in_retry_loop (see above)."""
   continuation_time = datetime_converter.strftime(initial_continuation_time)
 
   # Our retry loop uses exponential backoff with a retry limit.
@@ -487,7 +606,7 @@ def stream_detection_alerts_in_retry_loop(
 
     # This function runs until disconnection.
     response_code, disconnection_reason, most_recent_continuation_time = stream_detection_alerts(
-        session, req_data, process_detection_batch_callback)
+        session, req_data, process_detection_batch_callback, capture)
 
     if most_recent_continuation_time:
       consecutive_failures = 0
@@ -510,6 +629,99 @@ def stream_detection_alerts_in_retry_loop(
       # Retry with the same connection request as before.
 
 
+def _capture_records_to_skip(capture_file: str,
+                             start_continuation_time: datetime.datetime) -> int:
+  """Finds how many capture records precede the given continuation time."""
+  skip = 0
+  with open(capture_file + CAPTURE_INDEX_SUFFIX, encoding="utf-8") as index:
+    for entry in index:
+      continuation_time, count = entry.rstrip("\n").split("\t")
+      if datetime_converter.iso8601_datetime_utc(
+          continuation_time) > start_continuation_time:
+        break
+      skip = int(count)
+  return skip
+
+
+def replay_capture(
+    capture_file: str,
+    process_detection_batch_callback: Callable[[DetectionBatch], None],
+    speed: float = 0.0,
+    start_continuation_time: Optional[datetime.datetime] = None,
+) -> str:
+  """Replays a stream capture through the parser and the callback chain.
+
+  This makes it possible to benchmark the parser and callbacks against real
+  traffic, and to backfill new callbacks from history, without connecting to
+  the server. Disconnections that were captured do not stop the replay.
+
+  Args:
+    capture_file: Path of a capture file, written by
+      stream_detection_alerts_in_retry_loop.
+    process_detection_batch_callback: A callback functions that operates on a
+      single detection batch. (e.g. to integrate with other platforms)
+    speed: Replay pacing, relative to the recorded pacing (e.g. 1.0 = same as
+      recorded, 2.0 = twice as fast). The default (0) replays as fast as
+      possible.
+    start_continuation_time: Optional continuation time to resume the replay
+      from, like the initial continuation time of a live stream (default =
+      replay the entire capture).
+
+  Returns:
+    Continuation time string received in the last replayed non-heartbeat
+    detection batch, or empty string if no such batch was replayed.
+
+  Raises:
+    OSError: Failed to read the capture file or its index.
+    ValueError: Invalid capture file contents.
+  """
+  skip = 0
+  if start_continuation_time:
+    skip = _capture_records_to_skip(capture_file, start_continuation_time)
+
+  replayed_records = 0
+  replayed_bytes = 0
+
+  def read_capture(records: Iterable[str]) -> Iterator[str]:
+    nonlocal replayed_records, replayed_bytes
+    first_elapsed = None
+    replay_start = time.monotonic()
+    for i, record in enumerate(records):
+      if i < skip:
+        continue
+      elapsed, line = record.rstrip("\n").split("\t", 1)
+      line = json.loads(line)
+      if speed > 0:
+        if first_elapsed is None:
+          first_elapsed = float(elapsed)
+        delay = ((float(elapsed) - first_elapsed) / speed -
+                 (time.monotonic() - replay_start))
+        if delay > 0:
+          time.sleep(delay)
+      replayed_records += 1
+      replayed_bytes += len(line.encode("utf-8"))
+      yield line
+
+  continuation_time = ""
+  start = time.monotonic()
+  with gzip.open(capture_file, "rt", encoding="utf-8") as records:
+    batches = parse_lines(read_capture(records))
+    while True:
+      disconnection_reason, most_recent_continuation_time = (
+          process_detection_batches(batches, process_detection_batch_callback))
+      continuation_time = most_recent_continuation_time or continuation_time
+      if not disconnection_reason:
+        break
+      _LOGGER_.info("Replayed disconnection: %s", disconnection_reason)
+
+  duration = max(time.monotonic() - start, 1e-9)
+  _LOGGER_.info(
+      "Replayed %d stream lines (%d bytes) in %.3f seconds: "
+      "%.1f lines/s, %.3f MB/s", replayed_records, replayed_bytes, duration,
+      replayed_records / duration, replayed_bytes / duration / 1e6)
+  return continuation_time
+
+
 if __name__ == "__main__":
   parser = argparse.ArgumentParser()
   chronicle_auth.add_argument_credentials_file(parser)
@@ -522,11 +734,36 @@ if __name__ == "__main__":
       help="A timestamp for the initial stream_detection_alerts connection," +
       " in UTC ('yyyy-mm-ddThh:mm:ssZ')",
   )
+  parser.add_argument(
+      "-cf",
+      "--capture_file",
+      type=str,
+      required=False,
+      help="path of a gzip-compressed file to capture the raw stream into")
+  parser.add_argument(
+      "-rf",
+      "--replay_file",
+      type=str,
+      required=False,
+      help="path of a capture file to replay instead of connecting; the" +
+      " continuation time (if any) selects where the replay starts")
+  parser.add_argument(
+      "-rs",
+      "--replay_speed",
+      type=float,
+      default=0.0,
+      help="replay pacing relative to the recorded pacing, e.g. 1.0" +
+      " (default = 0, as fast as possible)")
 
   args = parser.parse_args()
-  CHRONICLE_API_BASE_URL = regions.url(CHRONICLE_API_BASE_URL, args.region)
-  stream_detection_alerts_in_retry_loop(
-      args.credentials_file,
-      callback,
-      args.continuation_time,
-  )
+  if args.replay_file:
+    replay_capture(args.replay_file, callback, args.replay_speed,
+                   args.continuation_time)
+  else:
+    CHRONICLE_API_BASE_URL = regions.url(CHRONICLE_API_BASE_URL, args.region)
+    stream_detection_alerts_in_retry_loop(
+        args.credentials_file,
+        callback,
+        args.continuation_time,
+        args.capture_file,
+    )
@@ -14,8 +14,12 @@
 #
 """Unit tests for the "stream_detection_alerts" module."""
 
+import datetime
 import json
+import os
+import tempfile
 import unittest
+import zlib
 from unittest import mock
 
 from google.auth.transport import requests
@@ -301,5 +305,67 @@ class StreamDetectionAlertsTest(unittest.TestCase):
     self.assertGreater(mock_init_session.call_count, mock_sleep.call_count)
 
 
+  def test_capture_and_replay(self):
+    lines = [
+        '[{"heartbeat": true}',
+        ',{"continuationTime": "2020-12-06T22:39:55.633014925Z"}',
+        ',{"continuationTime": "2020-12-07T22:39:55.633014925Z",' +
+        ' "detections": [{"id": "1"}]}',
+        ',{"error": {"code": 503}}',
+        ',{"continuationTime": "2020-12-08T22:39:55.633014925Z",' +
+        ' "detections": [{"id": "2"}, {"id": "3"}]}',
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      capture_file = os.path.join(tmp_dir, "capture.gz")
+      capture = stream_detection_alerts.StreamCapture(capture_file)
+      batches = stream_detection_alerts.parse_lines(capture.tee(lines))
+      while stream_detection_alerts.process_detection_batches(
+          batches, lambda _: None, capture)[0]:
+        pass  # Keep capturing after the captured disconnection.
+      capture.close()
+
+      # Replay the entire capture, including the batch after the error.
+      callback_call_arguments = []
+      continuation_time = stream_detection_alerts.replay_capture(
+          capture_file, callback_call_arguments.append)
+      self.assertEqual(callback_call_arguments, [
+          ([{"id": "1"}], "2020-12-07T22:39:55.633014925Z"),
+          ([{"id": "2"}, {"id": "3"}], "2020-12-08T22:39:55.633014925Z"),
+      ])
+      self.assertEqual(continuation_time, "2020-12-08T22:39:55.633014925Z")
+
+      # Replay only what comes after a continuation time.
+      callback_call_arguments = []
+      stream_detection_alerts.replay_capture(
+          capture_file,
+          callback_call_arguments.append,
+          start_continuation_time=datetime.datetime(
+              2020, 12, 7, 22, 39, 56, tzinfo=datetime.timezone.utc))
+      self.assertEqual(callback_call_arguments, [
+          ([{"id": "2"}, {"id": "3"}], "2020-12-08T22:39:55.633014925Z"),
+      ])
+
+  def test_capture_mark_flushes_records(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      capture_file = os.path.join(tmp_dir, "capture.gz")
+      capture = stream_detection_alerts.StreamCapture(capture_file)
+      for _ in capture.tee(["line 1", "line 2"]):
+        pass
+      capture.mark("2020-12-07T22:39:55.633014925Z")
+
+      # Before the capture is closed, as if it had crashed.
+      with open(capture_file, "rb") as f:
+        records = zlib.decompressobj(wbits=31).decompress(f.read())
+      with open(capture_file + stream_detection_alerts.CAPTURE_INDEX_SUFFIX,
+                encoding="utf-8") as f:
+        index = f.read()
+      capture.close()
+
+    self.assertEqual(index, "2020-12-07T22:39:55.633014925Z\t2\n")
+    lines = [json.loads(r.split("\t", 1)[1])
+             for r in records.decode("utf-8").splitlines()]
+    self.assertEqual(lines, ["line 1", "line 2"])
+
+
 if __name__ == "__main__":
   unittest.main()
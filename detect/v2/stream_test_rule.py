@@ -24,7 +24,7 @@ import argparse
 import datetime
 import json
 import logging
-from typing import Any, Iterator, Mapping, Sequence, Tuple
+from typing import Any, Iterator, Mapping, Optional, Sequence, TextIO, Tuple
 
 from google.auth.transport import requests
 
@@ -41,6 +41,10 @@ _LOGGER_ = logging.getLogger("stream_test_rule")
 # A Result is a either a detection or rule execution error.
 Result = Mapping[str, Any]
 
+# Kinds of results that are yielded by iter_test_rule_results.
+DETECTION = "detection"
+EXECUTION_ERROR = "error"
+
 CHRONICLE_API_BASE_URL = "https://backstory.googleapis.com"
 
 
@@ -192,12 +196,63 @@ def stream_test_rule(
     Tuple containing (all detections successfully streamed back, all rule
     execution errors successfully streamed back, disconnection reason)
   """
-  url = f"{CHRONICLE_API_BASE_URL}/v2/detect/rules:streamTestRule"
-
   detections = []
   execution_errors = []
   disconnection_reason = ""
 
+  try:
+    for kind, res in iter_test_rule_results(http_session, req_data):
+      if kind == DETECTION:
+        _LOGGER_.info("Got detection")
+        detections.append(res)
+      else:
+        _LOGGER_.info("Got rule execution error")
+        execution_errors.append(res)
+      print_result(res)
+  except RuntimeError as e:
+    disconnection_reason = str(e)
+
+  return (detections, execution_errors, disconnection_reason)
+
+
+def iter_test_rule_results(
+    http_session: requests.AuthorizedSession,
+    req_data: Mapping[str, Any],
+    max_detections: int = 0,
+    max_bytes: int = 0,
+    spill_file: Optional[TextIO] = None) -> Iterator[Tuple[str, Result]]:
+  """Makes one call to stream_test_rule, and yields results as they arrive.
+
+  Unlike stream_test_rule, results are not accumulated in memory. Stopping the
+  iteration early (or reaching one of the optional budgets below) closes the
+  streaming connection, so the server stops testing the rule.
+
+  See stream_test_rule for the formats of detections and rule execution errors.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    req_data: Dictionary containing connection request parameters
+      (contains keys "rule.rule_text", "start_time", "end_time", and
+      optionally "max_results".)
+    max_detections: Optional client-side limit on the number of detections,
+      after which the connection is closed (default = no limit).
+    max_bytes: Optional client-side limit on the total size of the results in
+      compact JSON format, after which the connection is closed
+      (default = no limit).
+    spill_file: Optional text file to write each result to, as one line of
+      JSON ({"detection": ...} or {"error": ...}) per result.
+
+  Yields:
+    Tuples of (DETECTION or EXECUTION_ERROR, detection or rule execution error).
+
+  Raises:
+    RuntimeError: Streaming connection was unexpectedly closed or aborted.
+  """
+  url = f"{CHRONICLE_API_BASE_URL}/v2/detect/rules:streamTestRule"
+
+  num_detections = 0
+  num_bytes = 0
+
   # Results should be streamed continuously.
   # We impose a client-side timeout of 180s (3 mins) between streamed results.
   # This should be enough time to handle delays in streaming back
@@ -220,47 +275,62 @@ def stream_test_rule(
     #   # streamed back if/when the connection breaks.
     _LOGGER_.info("Initiated connection to test rule stream")
     if response.status_code >= 400:
-      disconnection_reason = (
+      raise RuntimeError(
           "connection closed with " +
           f"status={response.status_code}, error={response.text}")
-    else:
-      for result in parse_stream(response):
-        res = None
-        if "detection" in result:
-          _LOGGER_.info("Got detection")
-          res = result["detection"]
-          detections.append(res)
-        elif "error" in result:
-          # We distinguish rule execution errors from
-          # other errors sent back over the stream by checking to see if
-          # the error has the RULES_EXECUTION_ERROR category.
-          error = result["error"]
-          if error.get("category") == "RULES_EXECUTION_ERROR":
-            _LOGGER_.info("Got rule execution error")
-            res = error
-            execution_errors.append(res)
-          else:
-            error_dump = json.dumps(error, indent="\t")
-            disconnection_reason = f"connection aborted with error={error_dump}"
-            break
-
-        # Print an abbreviated dump of a result if it was successfully received.
-        if res:
-          result_dump = json.dumps(res, indent=2)
-          lines = 100
-          result_dump_abbr = "\n".join(result_dump.split("\n")[:lines])
-          print(f"First {lines} lines of the result dump:\n{result_dump_abbr}")
 
-  return (detections, execution_errors, disconnection_reason)
+    for result in parse_stream(response):
+      if "detection" in result:
+        kind, res = DETECTION, result["detection"]
+      elif "error" in result:
+        # We distinguish rule execution errors from
+        # other errors sent back over the stream by checking to see if
+        # the error has the RULES_EXECUTION_ERROR category.
+        error = result["error"]
+        if error.get("category") != "RULES_EXECUTION_ERROR":
+          error_dump = json.dumps(error, indent="\t")
+          raise RuntimeError(f"connection aborted with error={error_dump}")
+        kind, res = EXECUTION_ERROR, error
+      else:
+        continue
+
+      if max_bytes or spill_file:
+        line = json.dumps(result, separators=(",", ":"))
+        num_bytes += len(line.encode("utf-8"))
+        if spill_file:
+          spill_file.write(line + "\n")
+
+      yield kind, res
+
+      if kind == DETECTION:
+        num_detections += 1
+      if ((max_detections and num_detections >= max_detections) or
+          (max_bytes and num_bytes >= max_bytes)):
+        _LOGGER_.info("Reached the client-side limit of %d detections or " +
+                      "%d bytes, closing the connection", num_detections,
+                      num_bytes)
+        return
+
+
+def print_result(res: Result):
+  """Prints an abbreviated dump of a result."""
+  result_dump = json.dumps(res, indent=2)
+  lines = 100
+  result_dump_abbr = "\n".join(result_dump.split("\n")[:lines])
+  print(f"First {lines} lines of the result dump:\n{result_dump_abbr}")
 
 
 def test_rule(http_session: requests.AuthorizedSession,
               rule_content: str,
               event_start_time: datetime.datetime,
               event_end_time: datetime.datetime,
-              max_results: int = 0):
+              max_results: int = 0,
+              max_bytes: int = 0,
+              spill_file: Optional[TextIO] = None):
   """Calls stream_test_rule once to test rule.
 
+  Results are printed as they arrive, and are not kept in memory.
+
   Args:
     http_session: Authorized session for HTTP requests.
     rule_content: Content of a detection rule, used to evaluate logs.
@@ -270,6 +340,10 @@ def test_rule(http_session: requests.AuthorizedSession,
     max_results: Maximum number of detections to return.
       Must be nonnegative and is capped at a server-side limit of 10,000.
       Optional - if not specified, a server-side default of 1,000 is used.
+    max_bytes: Optional limit on the total size of the results, after which
+      testing stops (default = no limit).
+    spill_file: Optional text file to write all the results to, as one line of
+      JSON per result.
 
   Raises:
     RuntimeError: Streaming connection was unexpectedly closed or aborted.
@@ -281,12 +355,21 @@ def test_rule(http_session: requests.AuthorizedSession,
       "max_results": max_results
   }
 
-  dets, errs, disconnection_reason = stream_test_rule(http_session, req_data)
+  counts = {DETECTION: 0, EXECUTION_ERROR: 0}
+  disconnection_reason = ""
+  try:
+    for kind, res in iter_test_rule_results(
+        http_session, req_data, max_bytes=max_bytes, spill_file=spill_file):
+      counts[kind] += 1
+      print_result(res)
+  except RuntimeError as e:
+    disconnection_reason = str(e)
 
   # Print out the total number of detections/rule execution errors
   # that were successfully found from testing the rule, up to the point
   # of disconnection.
-  print(f"Got {len(dets)} detections and {len(errs)} rule execution errors")
+  print(f"Got {counts[DETECTION]} detections and {counts[EXECUTION_ERROR]} "
+        "rule execution errors")
 
   if disconnection_reason:
     raise RuntimeError(f"Connection failed: {disconnection_reason}. Retry "
@@ -323,9 +406,23 @@ if __name__ == "__main__":
       type=int,
       required=False,
       help="maximum number of detections to stream back")
+  parser.add_argument(
+      "-mb",
+      "--max_bytes",
+      type=int,
+      required=False,
+      default=0,
+      help="stop testing after receiving this many bytes of results")
+  parser.add_argument(
+      "-sf",
+      "--spill_file",
+      type=argparse.FileType("w"),
+      required=False,
+      help="path of a file to write all the results to, one JSON per line")
 
   args = parser.parse_args()
   CHRONICLE_API_BASE_URL = regions.url(CHRONICLE_API_BASE_URL, args.region)
   session = chronicle_auth.initialize_http_session(args.credentials_file)
   test_rule(session, args.rule_file.read(), args.event_start_time,
-            args.event_end_time, args.max_results)
+            args.event_end_time, args.max_results, args.max_bytes,
+            args.spill_file)
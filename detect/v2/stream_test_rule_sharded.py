@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Executable and reusable sample for testing a rule over parallel time shards.
+
+This module demonstrates combining multiple single-purpose modules into a larger
+workflow: the time range is split into shards, each shard is tested with its
+own stream_test_rule connection (up to a concurrency limit), and the results
+are merged in detection time order.
+
+API reference:
+https://cloud.google.com/chronicle/docs/reference/detection-engine-api#streamtestrule
+"""
+
+import argparse
+import concurrent.futures
+import datetime
+import heapq
+import json
+import logging
+import threading
+from typing import List, Sequence, Tuple
+
+from google.auth.transport import requests
+
+from common import chronicle_auth
+from common import datetime_converter
+from common import regions
+from common import time_ranges
+from . import stream_test_rule
+
+_LOGGER_ = logging.getLogger("stream_test_rule_sharded")
+
+# Default number of time shards to split the time range into.
+DEFAULT_NUM_SHARDS = 8
+# Default maximum number of concurrent stream_test_rule connections.
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+def _detection_time(detection: stream_test_rule.Result) -> datetime.datetime:
+  return datetime_converter.iso8601_datetime_utc(detection["detectionTime"])
+
+
+def test_rule_sharded(
+    http_session: requests.AuthorizedSession,
+    rule_content: str,
+    event_start_time: datetime.datetime,
+    event_end_time: datetime.datetime,
+    num_shards: int = DEFAULT_NUM_SHARDS,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_results: int = 0,
+) -> Tuple[Sequence[stream_test_rule.Result], Sequence[stream_test_rule.Result],
+           Sequence[str]]:
+  """Tests a rule over time shards concurrently, and merges the results.
+
+  Each shard is subject to the same limits as stream_test_rule (e.g. a time
+  range of up to 2 weeks), so sharding also allows testing longer time ranges.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    rule_content: Content of a detection rule, used to evaluate logs.
+    event_start_time: Start time of the time range of logs to test rule over.
+    event_end_time: End time of the time range of logs to test rule over.
+    num_shards: Number of time shards to test the rule over.
+    max_concurrency: Maximum number of shards to test at the same time.
+    max_results: Maximum number of detections to return, shared by all the
+      shards (default = server-side default per shard). Once it is reached,
+      all the remaining shards are cancelled. Note that these are the first
+      detections to arrive, not necessarily the earliest ones.
+
+  Returns:
+    Tuple containing (detections ordered by detection time, rule execution
+    errors, disconnection reasons of shards that failed). Shards that failed
+    may have contributed some detections before they disconnected.
+
+  Raises:
+    ValueError: Invalid time range or number of shards.
+  """
+  shards = time_ranges.split_time_range(event_start_time, event_end_time,
+                                        num_shards)
+  budget_lock = threading.Lock()
+  budget_reached = threading.Event()
+  num_detections = 0
+
+  def test_shard(
+      shard_start: datetime.datetime, shard_end: datetime.datetime
+  ) -> Tuple[List[Tuple[datetime.datetime, int, stream_test_rule.Result]],
+             List[stream_test_rule.Result]]:
+    nonlocal num_detections
+    detections = []
+    errors = []
+    if budget_reached.is_set():
+      # Another shard used up the budget before this one started.
+      return detections, errors
+    req_data = {
+        "rule.rule_text": rule_content,
+        "start_time": datetime_converter.strftime(shard_start),
+        "end_time": datetime_converter.strftime(shard_end),
+        "max_results": max_results,
+    }
+    results = stream_test_rule.iter_test_rule_results(
+        http_session, req_data, max_detections=max_results)
+    try:
+      for kind, res in results:
+        if budget_reached.is_set():
+          break
+        if kind == stream_test_rule.EXECUTION_ERROR:
+          errors.append(res)
+          continue
+        with budget_lock:
+          if max_results and num_detections >= max_results:
+            budget_reached.set()
+            break
+          num_detections += 1
+          if max_results and num_detections >= max_results:
+            budget_reached.set()
+        # The sequence number keeps the sort stable, and avoids comparing
+        # detections with the same detection time.
+        detections.append((_detection_time(res), len(detections), res))
+    finally:
+      # Close the connection right away if we stopped early.
+      results.close()
+    detections.sort(key=lambda d: d[:2])
+    return detections, errors
+
+  shard_detections = []
+  execution_errors = []
+  disconnection_reasons = []
+  with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+    futures = {
+        executor.submit(test_shard, start, end): (start, end)
+        for start, end in shards
+    }
+    for future in concurrent.futures.as_completed(futures):
+      if budget_reached.is_set():
+        for f in futures:
+          f.cancel()
+      if future.cancelled():
+        continue
+      start, end = futures[future]
+      try:
+        detections, errors = future.result()
+      except RuntimeError as e:
+        reason = (f"shard {datetime_converter.strftime(start)} - "
+                  f"{datetime_converter.strftime(end)}: {e}")
+        _LOGGER_.warning("Testing failed for %s", reason)
+        disconnection_reasons.append(reason)
+        continue
+      shard_detections.append(detections)
+      execution_errors.extend(errors)
+
+  merged = [d[2] for d in heapq.merge(*shard_detections, key=lambda d: d[0])]
+  return merged, execution_errors, disconnection_reasons
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  regions.add_argument_region(parser)
+  parser.add_argument(
+      "-f",
+      "--rule_file",
+      type=argparse.FileType("r"),
+      required=True,
+      help="path of a file with the desired rule's content, or - for STDIN")
+  parser.add_argument(
+      "-st",
+      "--event_start_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      required=True,
+      help="event start time in UTC ('yyyy-mm-ddThh:mm:ssZ')")
+  parser.add_argument(
+      "-et",
+      "--event_end_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      required=True,
+      help="event end time in UTC ('yyyy-mm-ddThh:mm:ssZ')")
+  parser.add_argument(
+      "-ns",
+      "--num_shards",
+      type=int,
+      default=DEFAULT_NUM_SHARDS,
+      help=f"number of time shards (default = {DEFAULT_NUM_SHARDS})")
+  parser.add_argument(
+      "-mc",
+      "--max_concurrency",
+      type=int,
+      default=DEFAULT_MAX_CONCURRENCY,
+      help="maximum number of concurrent connections " +
+      f"(default = {DEFAULT_MAX_CONCURRENCY})")
+  parser.add_argument(
+      "-mr",
+      "--max_results",
+      type=int,
+      required=False,
+      default=0,
+      help="maximum number of detections to stream back from all the shards")
+
+  args = parser.parse_args()
+  stream_test_rule.CHRONICLE_API_BASE_URL = regions.url(
+      stream_test_rule.CHRONICLE_API_BASE_URL, args.region)
+  session = chronicle_auth.initialize_http_session(args.credentials_file)
+  dets, errs, reasons = test_rule_sharded(session, args.rule_file.read(),
+                                          args.event_start_time,
+                                          args.event_end_time, args.num_shards,
+                                          args.max_concurrency,
+                                          args.max_results)
+  print(json.dumps(dets, indent=2))
+  print(f"Got {len(dets)} detections and {len(errs)} rule execution errors")
+  if reasons:
+    raise RuntimeError(f"Testing failed for {len(reasons)} shard(s): " +
+                       "; ".join(reasons))
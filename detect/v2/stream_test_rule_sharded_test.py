@@ -0,0 +1,130 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "stream_test_rule_sharded" module."""
+
+import datetime
+import json
+import unittest
+from unittest import mock
+
+from google.auth.transport import requests
+
+from . import stream_test_rule_sharded
+
+
+class StreamTestRuleShardedTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.start_time = datetime.datetime(
+        2021, 1, 1, tzinfo=datetime.timezone.utc)
+    self.end_time = datetime.datetime(2021, 1, 4, tzinfo=datetime.timezone.utc)
+
+  def mock_streams(self, mock_session, streams_by_start_time):
+    """Makes each shard's connection stream back the given lines."""
+
+    def post(url, stream, data, timeout):
+      del url, stream, timeout  # Unused.
+      connection = mock.MagicMock()
+      response = connection.__enter__.return_value
+      lines = streams_by_start_time[data["start_time"]]
+      if lines is None:
+        response.status_code = 429
+      else:
+        response.status_code = 200
+        response.iter_lines.return_value = lines
+      return connection
+
+    mock_session.post.side_effect = post
+
+  @staticmethod
+  def detection_line(detection_id, detection_time):
+    detection = {"id": detection_id, "detectionTime": detection_time}
+    return json.dumps({"detection": detection})
+
+  @mock.patch.object(requests, "AuthorizedSession", autospec=True)
+  def test_results_are_merged_in_detection_time_order(self, mock_session):
+    self.mock_streams(
+        mock_session, {
+            "2021-01-01T00:00:00Z": [
+                self.detection_line("b", "2021-01-01T12:00:00Z"),
+                self.detection_line("a", "2021-01-01T06:00:00Z"),
+            ],
+            "2021-01-02T00:00:00Z": [
+                '{"error": {"category": "RULES_EXECUTION_ERROR"}}',
+            ],
+            "2021-01-03T00:00:00Z": [
+                self.detection_line("c", "2021-01-03T01:00:00.5Z"),
+            ],
+        })
+
+    dets, errs, reasons = stream_test_rule_sharded.test_rule_sharded(
+        mock_session, "rule", self.start_time, self.end_time, num_shards=3)
+
+    self.assertEqual([d["id"] for d in dets], ["a", "b", "c"])
+    self.assertEqual(errs, [{"category": "RULES_EXECUTION_ERROR"}])
+    self.assertEqual(reasons, [])
+    self.assertEqual(mock_session.post.call_count, 3)
+
+  @mock.patch.object(requests, "AuthorizedSession", autospec=True)
+  def test_max_results_is_shared_by_all_shards(self, mock_session):
+    self.mock_streams(
+        mock_session, {
+            "2021-01-01T00:00:00Z": [
+                self.detection_line("a", "2021-01-01T06:00:00Z"),
+                self.detection_line("b", "2021-01-01T12:00:00Z"),
+            ],
+            "2021-01-02T00:00:00Z": [
+                self.detection_line("c", "2021-01-02T06:00:00Z"),
+            ],
+            "2021-01-03T00:00:00Z": [
+                self.detection_line("d", "2021-01-03T06:00:00Z"),
+            ],
+        })
+
+    # With a concurrency of 1, the first shard uses up the whole budget, and
+    # the remaining shards never connect.
+    dets, _, _ = stream_test_rule_sharded.test_rule_sharded(
+        mock_session,
+        "rule",
+        self.start_time,
+        self.end_time,
+        num_shards=3,
+        max_concurrency=1,
+        max_results=2)
+
+    self.assertEqual([d["id"] for d in dets], ["a", "b"])
+    self.assertEqual(mock_session.post.call_count, 1)
+
+  @mock.patch.object(requests, "AuthorizedSession", autospec=True)
+  def test_failed_shard(self, mock_session):
+    self.mock_streams(
+        mock_session, {
+            "2021-01-01T00:00:00Z": [
+                self.detection_line("a", "2021-01-01T06:00:00Z"),
+            ],
+            "2021-01-02T12:00:00Z": None,
+        })
+
+    dets, _, reasons = stream_test_rule_sharded.test_rule_sharded(
+        mock_session, "rule", self.start_time, self.end_time, num_shards=2)
+
+    self.assertEqual([d["id"] for d in dets], ["a"])
+    self.assertEqual(len(reasons), 1)
+    self.assertIn("2021-01-02T12:00:00Z", reasons[0])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -14,6 +14,7 @@
 #
 """Unit tests for the "stream_test_rule" module."""
 
+import io
 import json
 import unittest
 from unittest import mock
@@ -270,5 +271,57 @@ class StreamTestRuleTest(unittest.TestCase):
     self.assertEqual(disconnection_reason, "")
 
 
+  @mock.patch.object(requests, "AuthorizedSession", autospec=True)
+  def test_iter_results_stops_after_max_detections(self, mock_session):
+    # Mock a successful streaming connection.
+    mock_response = mock_session.post.return_value.__enter__.return_value
+    mock_response.status_code = 200
+    mock_response.iter_lines.side_effect = [[
+        '[{"detection": {"id": "1"}}',
+        ',{"error": {"category": "RULES_EXECUTION_ERROR", "text": "2"}}',
+        ',{"detection": {"id": "3"}}',
+        ',{"detection": {"id": "4"}}',
+    ]]
+
+    spill_file = io.StringIO()
+    results = list(
+        stream_test_rule.iter_test_rule_results(
+            mock_session, {}, max_detections=2, spill_file=spill_file))
+
+    # Results should be yielded in order, and the stream should be closed
+    # right after the second detection.
+    self.assertEqual(results, [
+        (stream_test_rule.DETECTION, {"id": "1"}),
+        (stream_test_rule.EXECUTION_ERROR, {
+            "category": "RULES_EXECUTION_ERROR",
+            "text": "2"
+        }),
+        (stream_test_rule.DETECTION, {"id": "3"}),
+    ])
+    mock_session.post.return_value.__exit__.assert_called_once()
+    self.assertEqual(spill_file.getvalue().splitlines(), [
+        '{"detection":{"id":"1"}}',
+        '{"error":{"category":"RULES_EXECUTION_ERROR","text":"2"}}',
+        '{"detection":{"id":"3"}}',
+    ])
+
+  @mock.patch.object(requests, "AuthorizedSession", autospec=True)
+  def test_iter_results_stops_after_max_bytes(self, mock_session):
+    # Mock a successful streaming connection.
+    mock_response = mock_session.post.return_value.__enter__.return_value
+    mock_response.status_code = 200
+    mock_response.iter_lines.side_effect = [[
+        '[{"detection": {"id": "1"}}',
+        ',{"detection": {"id": "2"}}',
+        ',{"detection": {"id": "3"}}',
+    ]]
+
+    # Each detection is 24 bytes long in compact JSON format.
+    results = list(
+        stream_test_rule.iter_test_rule_results(
+            mock_session, {}, max_bytes=30))
+    self.assertEqual(len(results), 2)
+
+
 if __name__ == "__main__":
   unittest.main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Executable and reusable sample for syncing detections to a local index.
+
+This module demonstrates combining multiple single-purpose modules into a larger
+workflow: each sync lists only the detections that were created since the
+previous sync (using list_detections with the CREATED_TIME list basis), and
+upserts them into a local SQLite database, which can then be queried offline.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import sqlite3
+from typing import Any, Mapping, Optional, Sequence, Tuple
+
+from google.auth.transport import requests
+
+from common import chronicle_auth
+from common import datetime_converter
+from common import regions
+from . import list_detections
+
+# Set up logger that will include timestamps.
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s:%(levelname)s:%(name)s:%(message)s")
+_LOGGER_ = logging.getLogger("sync_detections_index")
+
+# Maximum page size supported by the ListDetections API.
+MAX_PAGE_SIZE = 1000
+# Detections are re-listed from a bit before the watermark, in case some of
+# them became visible only after the previous sync. Upserts make this safe.
+DEFAULT_OVERLAP = datetime.timedelta(minutes=5)
+# Prefix of the names of the per-version_id watermarks in the sync_state table.
+WATERMARK = "created_time_watermark"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+  id TEXT PRIMARY KEY,
+  rule_id TEXT,
+  rule_version TEXT,
+  alert_state TEXT,
+  detection_time_us INTEGER,
+  detection TEXT
+);
+CREATE INDEX IF NOT EXISTS detections_rule_id
+  ON detections (rule_id, detection_time_us);
+CREATE INDEX IF NOT EXISTS detections_rule_version
+  ON detections (rule_version, detection_time_us);
+CREATE INDEX IF NOT EXISTS detections_alert_state
+  ON detections (alert_state, detection_time_us);
+CREATE INDEX IF NOT EXISTS detections_detection_time
+  ON detections (detection_time_us);
+CREATE TABLE IF NOT EXISTS detection_fields (
+  detection_id TEXT,
+  key TEXT,
+  value TEXT
+);
+CREATE INDEX IF NOT EXISTS detection_fields_key_value
+  ON detection_fields (key, value);
+CREATE INDEX IF NOT EXISTS detection_fields_detection_id
+  ON detection_fields (detection_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+  name TEXT PRIMARY KEY,
+  value TEXT
+);
+"""
+
+Detection = Mapping[str, Any]
+
+
+def _timestamp_us(dt: datetime.datetime) -> int:
+  # Stored as integers, because ISO 8601 strings with optional sub-second
+  # digits don't sort lexicographically.
+  delta = dt - datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+  return delta // datetime.timedelta(microseconds=1)
+
+
+def open_index(index_file: str) -> sqlite3.Connection:
+  """Opens (and creates, if needed) a local detection index.
+
+  Args:
+    index_file: Path of the SQLite database file (or ":memory:").
+
+  Returns:
+    Connection to the SQLite database.
+  """
+  conn = sqlite3.connect(index_file)
+  conn.executescript(_SCHEMA)
+  return conn
+
+
+def _watermark_name(version_id: str) -> str:
+  # Each version_id is synced independently, so a first sync of a version_id
+  # doesn't skip its detections that are older than another one's watermark.
+  return f"{WATERMARK}:{version_id}"
+
+
+def get_watermark(conn: sqlite3.Connection,
+                  version_id: str = "-") -> Optional[datetime.datetime]:
+  """Returns the creation time up to which detections were synced, if any.
+
+  Args:
+    conn: Connection to a local detection index (see open_index).
+    version_id: Version ID that the detections were synced for (see
+      sync_detections).
+  """
+  row = conn.execute("SELECT value FROM sync_state WHERE name = ?",
+                     (_watermark_name(version_id),)).fetchone()
+  return datetime_converter.iso8601_datetime_utc(row[0]) if row else None
+
+
+def upsert_detections(conn: sqlite3.Connection,
+                      detections: Sequence[Detection]):
+  """Inserts or replaces detections in the index (without committing)."""
+  for detection in detections:
+    rule_detection = (detection.get("detection") or [{}])[0]
+    conn.execute(
+        "INSERT OR REPLACE INTO detections VALUES (?, ?, ?, ?, ?, ?)",
+        (detection["id"], rule_detection.get("ruleId"),
+         rule_detection.get("ruleVersion"), rule_detection.get("alertState"),
+         _timestamp_us(
+             datetime_converter.iso8601_datetime_utc(
+                 detection["detectionTime"])), json.dumps(detection)))
+    conn.execute("DELETE FROM detection_fields WHERE detection_id = ?",
+                 (detection["id"],))
+    conn.executemany(
+        "INSERT INTO detection_fields VALUES (?, ?, ?)",
+        [(detection["id"], f["key"], f.get("value", ""))
+         for f in rule_detection.get("detectionFields", [])])
+
+
+def sync_detections(http_session: requests.AuthorizedSession,
+                    conn: sqlite3.Connection,
+                    version_id: str = "-",
+                    initial_start_time: Optional[datetime.datetime] = None,
+                    overlap: datetime.timedelta = DEFAULT_OVERLAP) -> int:
+  """Syncs all the detections created since the previous sync to the index.
+
+  Each page is committed as soon as it's stored, but the watermark is advanced
+  only after all the pages were stored, so an interrupted sync is simply
+  repeated by the next one.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    conn: Connection to a local detection index (see open_index).
+    version_id: Version ID of the rule(s) to sync detections for (see the
+      list_detections module).
+    initial_start_time: Creation time to start syncing from, if this
+      version_id was never synced to the index before (default = no min
+      creation time).
+    overlap: How much to re-list before the watermark of the previous sync.
+
+  Returns:
+    Number of detections that were listed (new or updated).
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400).
+  """
+  start_time = get_watermark(conn, version_id)
+  if start_time is not None:
+    start_time -= overlap
+  else:
+    start_time = initial_start_time
+  # Sub-seconds are truncated by list_detections, and would be skipped.
+  end_time = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+
+  count = 0
+  page_token = ""
+  while True:
+    detections, page_token = list_detections.list_detections(
+        http_session,
+        version_id,
+        page_size=MAX_PAGE_SIZE,
+        page_token=page_token,
+        start_time=start_time,
+        end_time=end_time,
+        list_basis="CREATED_TIME")
+    with conn:
+      upsert_detections(conn, detections)
+    count += len(detections)
+    _LOGGER_.info("Synced %d detections", count)
+    if not page_token:
+      break
+
+  with conn:
+    conn.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)",
+                 (_watermark_name(version_id),
+                  datetime_converter.strftime(end_time)))
+  return count
+
+
+def query_detections(conn: sqlite3.Connection,
+                     rule_id: str = "",
+                     rule_version: str = "",
+                     alert_state: str = "",
+                     start_time: Optional[datetime.datetime] = None,
+                     end_time: Optional[datetime.datetime] = None,
+                     detection_fields: Optional[Mapping[str, str]] = None,
+                     limit: int = 0) -> Sequence[Detection]:
+  """Queries detections in a local index.
+
+  Args:
+    conn: Connection to a local detection index (see open_index).
+    rule_id: Optional rule ID to filter by.
+    rule_version: Optional rule version ID to filter by.
+    alert_state: Optional alert state to filter by.
+    start_time: Optional min detection time, inclusive.
+    end_time: Optional max detection time, exclusive.
+    detection_fields: Optional detection field keys and values that all must
+      match.
+    limit: Maximum number of detections to return (default = no limit).
+
+  Returns:
+    Matching detections, ordered by descending detection time (like
+    list_detections).
+  """
+  conditions = []
+  params = []
+  for column, value in (("rule_id", rule_id), ("rule_version", rule_version),
+                        ("alert_state", alert_state)):
+    if value:
+      conditions.append(f"{column} = ?")
+      params.append(value)
+  if start_time:
+    conditions.append("detection_time_us >= ?")
+    params.append(_timestamp_us(start_time))
+  if end_time:
+    conditions.append("detection_time_us < ?")
+    params.append(_timestamp_us(end_time))
+  for key, value in (detection_fields or {}).items():
+    conditions.append("id IN (SELECT detection_id FROM detection_fields "
+                      "WHERE key = ? AND value = ?)")
+    params.extend((key, value))
+
+  query = "SELECT detection FROM detections"
+  if conditions:
+    query += " WHERE " + " AND ".join(conditions)
+  query += " ORDER BY detection_time_us DESC"
+  if limit:
+    query += " LIMIT ?"
+    params.append(limit)
+  return [json.loads(row[0]) for row in conn.execute(query, params)]
+
+
+def _detection_field(field: str) -> Tuple[str, str]:
+  key, sep, value = field.partition("=")
+  if not sep:
+    raise argparse.ArgumentTypeError(f"expected 'key=value', got '{field}'")
+  return key, value
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  regions.add_argument_region(parser)
+  parser.add_argument(
+      "-i",
+      "--index_file",
+      type=str,
+      required=True,
+      help="path of the local SQLite index file")
+  parser.add_argument(
+      "-q",
+      "--query",
+      action="store_true",
+      help="query the local index instead of syncing it")
+  parser.add_argument(
+      "-vi",
+      "--version_id",
+      type=str,
+      default="-",
+      help="sync: version ID of the rule(s) to sync detections for " +
+      "(default = '-', i.e. all the rules)")
+  parser.add_argument(
+      "-st",
+      "--start_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      help="sync: initial creation time, query: min detection time " +
+      "(in UTC: 'yyyy-mm-ddThh:mm:ssZ')")
+  parser.add_argument(
+      "-et",
+      "--end_time",
+      type=datetime_converter.iso8601_datetime_utc,
+      help="query: max detection time in UTC ('yyyy-mm-ddThh:mm:ssZ')")
+  parser.add_argument(
+      "-ri", "--rule_id", type=str, default="", help="query: rule ID")
+  parser.add_argument(
+      "-rv",
+      "--rule_version",
+      type=str,
+      default="",
+      help="query: rule version ID")
+  parser.add_argument(
+      "-a",
+      "--alert_state",
+      type=str,
+      choices=("ALERTING", "NOT_ALERTING"),
+      default="",
+      help="query: alert state")
+  parser.add_argument(
+      "-df",
+      "--detection_field",
+      type=_detection_field,
+      action="append",
+      default=[],
+      help="query: detection field to match ('key=value', can be repeated)")
+  parser.add_argument(
+      "-l",
+      "--limit",
+      type=int,
+      default=0,
+      help="query: maximum number of detections (default = no limit)")
+
+  args = parser.parse_args()
+  index = open_index(args.index_file)
+  if args.query:
+    results = query_detections(index, args.rule_id, args.rule_version,
+                               args.alert_state, args.start_time,
+                               args.end_time, dict(args.detection_field),
+                               args.limit)
+    print(json.dumps(results, indent=2))
+    print(f"Found {len(results)} detections")
+  else:
+    list_detections.CHRONICLE_API_BASE_URL = regions.url(
+        list_detections.CHRONICLE_API_BASE_URL, args.region)
+    session = chronicle_auth.initialize_http_session(args.credentials_file)
+    synced = sync_detections(session, index, args.version_id, args.start_time)
+    print(f"Synced {synced} detections, watermark: "
+          f"{get_watermark(index, args.version_id)}")
+  index.close()
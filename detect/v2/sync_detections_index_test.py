@@ -0,0 +1,142 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "sync_detections_index" module."""
+
+import datetime
+import unittest
+from unittest import mock
+
+from . import list_detections
+from . import sync_detections_index
+
+
+def make_detection(detection_id, detection_time, rule_id="ru_1",
+                   alert_state="ALERTING", fields=None):
+  return {
+      "id": detection_id,
+      "detectionTime": detection_time,
+      "detection": [{
+          "ruleId": rule_id,
+          "ruleVersion": f"{rule_id}@v_1_1",
+          "alertState": alert_state,
+          "detectionFields": [{
+              "key": k,
+              "value": v
+          } for k, v in (fields or {}).items()],
+      }],
+  }
+
+
+class SyncDetectionsIndexTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.conn = sync_detections_index.open_index(":memory:")
+
+  def tearDown(self):
+    self.conn.close()
+    super().tearDown()
+
+  @mock.patch.object(list_detections, "list_detections", autospec=True)
+  def test_sync_advances_watermark(self, mock_list_detections):
+    mock_list_detections.side_effect = [
+        ([make_detection("de_1", "2021-01-01T00:00:00Z")], "token"),
+        ([make_detection("de_2", "2021-01-02T00:00:00Z")], ""),
+        ([make_detection("de_2", "2021-01-02T00:00:00Z",
+                         alert_state="NOT_ALERTING")], ""),
+    ]
+    initial_start_time = datetime.datetime(
+        2021, 1, 1, tzinfo=datetime.timezone.utc)
+
+    count = sync_detections_index.sync_detections(
+        None, self.conn, initial_start_time=initial_start_time)
+
+    self.assertEqual(count, 2)
+    first_sync = mock_list_detections.call_args_list[0].kwargs
+    self.assertEqual(first_sync["start_time"], initial_start_time)
+    self.assertEqual(first_sync["list_basis"], "CREATED_TIME")
+    watermark = sync_detections_index.get_watermark(self.conn)
+    self.assertEqual(watermark, first_sync["end_time"])
+
+    count = sync_detections_index.sync_detections(
+        None, self.conn, initial_start_time=initial_start_time)
+
+    self.assertEqual(count, 1)
+    second_sync = mock_list_detections.call_args_list[2].kwargs
+    self.assertEqual(second_sync["start_time"],
+                     watermark - sync_detections_index.DEFAULT_OVERLAP)
+    results = sync_detections_index.query_detections(self.conn)
+    self.assertEqual([d["id"] for d in results], ["de_2", "de_1"])
+    self.assertEqual(results[0]["detection"][0]["alertState"], "NOT_ALERTING")
+
+  @mock.patch.object(list_detections, "list_detections", autospec=True)
+  def test_sync_watermark_per_version_id(self, mock_list_detections):
+    mock_list_detections.side_effect = [
+        ([make_detection("de_1", "2021-01-02T00:00:00Z")], ""),
+        ([make_detection("de_2", "2021-01-01T00:00:00Z", rule_id="ru_2")], ""),
+    ]
+    initial_start_time = datetime.datetime(
+        2021, 1, 1, tzinfo=datetime.timezone.utc)
+
+    sync_detections_index.sync_detections(
+        None, self.conn, "ru_1@-", initial_start_time=initial_start_time)
+    sync_detections_index.sync_detections(
+        None, self.conn, "ru_2@-", initial_start_time=initial_start_time)
+
+    first_sync, second_sync = [
+        c.kwargs for c in mock_list_detections.call_args_list
+    ]
+    self.assertEqual(second_sync["start_time"], initial_start_time)
+    self.assertEqual(
+        sync_detections_index.get_watermark(self.conn, "ru_1@-"),
+        first_sync["end_time"])
+    self.assertEqual(
+        sync_detections_index.get_watermark(self.conn, "ru_2@-"),
+        second_sync["end_time"])
+    self.assertIsNone(sync_detections_index.get_watermark(self.conn, "-"))
+    self.assertEqual(len(sync_detections_index.query_detections(self.conn)), 2)
+
+  def test_query_detections(self):
+    sync_detections_index.upsert_detections(self.conn, [
+        make_detection("de_1", "2021-01-01T00:00:00Z", fields={"host": "a"}),
+        make_detection("de_2", "2021-01-01T00:00:00.5Z", fields={"host": "b"}),
+        make_detection("de_3", "2021-01-03T00:00:00Z", rule_id="ru_2"),
+        make_detection(
+            "de_4",
+            "2021-01-04T00:00:00Z",
+            alert_state="NOT_ALERTING",
+            fields={"host": "a"}),
+    ])
+
+    def query(**kwargs):
+      results = sync_detections_index.query_detections(self.conn, **kwargs)
+      return [d["id"] for d in results]
+
+    self.assertEqual(query(), ["de_4", "de_3", "de_2", "de_1"])
+    self.assertEqual(query(limit=1), ["de_4"])
+    self.assertEqual(query(rule_id="ru_2"), ["de_3"])
+    self.assertEqual(query(rule_version="ru_1@v_1_1"), ["de_4", "de_2", "de_1"])
+    self.assertEqual(query(alert_state="NOT_ALERTING"), ["de_4"])
+    self.assertEqual(query(detection_fields={"host": "a"}), ["de_4", "de_1"])
+    self.assertEqual(
+        query(
+            start_time=datetime.datetime(
+                2021, 1, 1, 0, 0, 0, 1, tzinfo=datetime.timezone.utc),
+            end_time=datetime.datetime(
+                2021, 1, 4, tzinfo=datetime.timezone.utc)), ["de_3", "de_2"])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Executable and reusable sample for verifying many detection rules.
+
+This module demonstrates combining multiple single-purpose modules into a larger
+workflow: all the rule files in a directory are verified concurrently with
+verify_rule, under a rate limit. Rules whose content already verified
+successfully against the same API (according to a local cache of SHA-256
+hashes) are skipped, so repeated runs only verify new and changed rules.
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+from google.auth.transport import requests
+
+from common import chronicle_auth
+from common import rate_limiter
+from common import regions
+from . import verify_rule
+
+# Set up logger that will include timestamps.
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s:%(levelname)s:%(name)s:%(message)s")
+_LOGGER_ = logging.getLogger("verify_rules")
+
+DEFAULT_PATTERN = "**/*.yaral"
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_QPS = 5.0
+
+# Verification statuses in the report.
+CACHED = "CACHED"
+VERIFIED = "VERIFIED"
+FAILED = "FAILED"  # The rule has a compilation error.
+ERROR = "ERROR"  # The rule couldn't be verified (e.g. HTTP error).
+
+Result = Dict[str, Any]
+
+
+def load_cache(cache_file: str) -> Dict[str, List[str]]:
+  """Loads the hashes of successfully verified rules, per API URL."""
+  if not os.path.exists(cache_file):
+    return {}
+  with open(cache_file) as f:
+    return json.load(f)
+
+
+def save_cache(cache_file: str, cache: Dict[str, List[str]]):
+  """Saves the hashes of successfully verified rules atomically."""
+  with open(cache_file + ".tmp", "w") as f:
+    json.dump(cache, f, indent=2, sort_keys=True)
+  os.replace(cache_file + ".tmp", cache_file)
+
+
+def verify_rules(http_session: requests.AuthorizedSession,
+                 rule_files: Sequence[str],
+                 cache_file: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 qps: float = DEFAULT_QPS) -> List[Result]:
+  """Verifies rule files concurrently, skipping the ones that were verified.
+
+  Only successful verifications are cached, so rules with compilation errors
+  are verified again in each run.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    rule_files: Paths of files with rule contents.
+    cache_file: Optional path of a JSON file with the hashes of rules that were
+      verified successfully, per API URL. It's updated with new successes.
+    max_concurrency: Maximum number of rules to verify at the same time.
+    qps: Maximum number of verifications per second.
+
+  Returns:
+    Report entry for each rule file (in the same order), with its "file",
+    "sha256", "status" (CACHED, VERIFIED, FAILED, or ERROR), and
+    "compilationError" or "error" if there was one.
+  """
+  api_url = verify_rule.CHRONICLE_API_BASE_URL
+  cache = load_cache(cache_file) if cache_file else {}
+  verified_hashes = set(cache.get(api_url, []))
+
+  results = []
+  to_verify = {}  # Content hash -> (content, results with that hash).
+  for path in rule_files:
+    with open(path, "rb") as f:
+      content = f.read()
+    content_hash = hashlib.sha256(content).hexdigest()
+    result = {"file": path, "sha256": content_hash}
+    results.append(result)
+    if content_hash in verified_hashes:
+      result["status"] = CACHED
+    else:
+      # Identical rule files are verified only once.
+      to_verify.setdefault(content_hash, (content.decode("utf-8"), []))
+      to_verify[content_hash][1].append(result)
+  _LOGGER_.info("Verifying %d rules (%d cached)", len(to_verify),
+                len(results) - sum(len(r) for _, r in to_verify.values()))
+
+  limiter = rate_limiter.RateLimiter(qps)
+
+  def verify(content: str) -> Result:
+    limiter.acquire()
+    try:
+      resp = verify_rule.verify_rule(http_session, content)
+    except requests.requests.exceptions.RequestException as e:
+      return {"status": ERROR, "error": str(e)}
+    if "compilationError" in resp:
+      return {"status": FAILED, "compilationError": resp["compilationError"]}
+    return {"status": VERIFIED}
+
+  with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+    futures = {
+        executor.submit(verify, content): content_hash
+        for content_hash, (content, _) in to_verify.items()
+    }
+    for future in concurrent.futures.as_completed(futures):
+      content_hash = futures[future]
+      outcome = future.result()
+      for result in to_verify[content_hash][1]:
+        result.update(outcome)
+      if outcome["status"] == VERIFIED:
+        verified_hashes.add(content_hash)
+
+  if cache_file:
+    cache[api_url] = sorted(verified_hashes)
+    save_cache(cache_file, cache)
+  return results
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  chronicle_auth.add_argument_credentials_file(parser)
+  regions.add_argument_region(parser)
+  parser.add_argument(
+      "-d",
+      "--rules_dir",
+      type=str,
+      required=True,
+      help="directory to search for rule files")
+  parser.add_argument(
+      "-p",
+      "--pattern",
+      type=str,
+      default=DEFAULT_PATTERN,
+      help=f"glob pattern of rule files (default = '{DEFAULT_PATTERN}')")
+  parser.add_argument(
+      "-c",
+      "--cache_file",
+      type=str,
+      help="JSON file to cache the hashes of successfully verified rules in")
+  parser.add_argument(
+      "-o",
+      "--report_file",
+      type=argparse.FileType("w"),
+      default=sys.stdout,
+      help="JSON file to write the report to (default = STDOUT)")
+  parser.add_argument(
+      "-mc",
+      "--max_concurrency",
+      type=int,
+      default=DEFAULT_MAX_CONCURRENCY,
+      help="maximum number of concurrent verifications " +
+      f"(default = {DEFAULT_MAX_CONCURRENCY})")
+  parser.add_argument(
+      "-q",
+      "--qps",
+      type=float,
+      default=DEFAULT_QPS,
+      help=f"maximum verifications per second (default = {DEFAULT_QPS})")
+
+  args = parser.parse_args()
+  verify_rule.CHRONICLE_API_BASE_URL = regions.url(
+      verify_rule.CHRONICLE_API_BASE_URL, args.region)
+  session = chronicle_auth.initialize_http_session(args.credentials_file)
+  rules_dir = pathlib.Path(args.rules_dir)
+  files = sorted(str(p) for p in rules_dir.glob(args.pattern))
+  report = verify_rules(session, files, args.cache_file, args.max_concurrency,
+                        args.qps)
+  json.dump(report, args.report_file, indent=2)
+  args.report_file.write("\n")
+  failures = [r for r in report if r["status"] in (FAILED, ERROR)]
+  _LOGGER_.info("%d rules, %d failed", len(report), len(failures))
+  if failures:
+    sys.exit(1)
@@ -0,0 +1,102 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "verify_rules" module."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from google.auth.transport import requests
+
+from . import verify_rule
+from . import verify_rules
+
+
+def fake_verify_rule(http_session, rule_content):
+  del http_session  # Unused.
+  if "bad" in rule_content:
+    return {"compilationError": "parsing: syntax error"}
+  if "flaky" in rule_content:
+    raise requests.requests.exceptions.HTTPError("503 Service Unavailable")
+  return {}
+
+
+class VerifyRulesTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    self.cache_file = os.path.join(self.tmp_dir.name, "cache.json")
+
+  def tearDown(self):
+    self.tmp_dir.cleanup()
+    super().tearDown()
+
+  def write_rule(self, name, content):
+    path = os.path.join(self.tmp_dir.name, name)
+    with open(path, "w") as f:
+      f.write(content)
+    return path
+
+  @mock.patch.object(verify_rule, "verify_rule", autospec=True)
+  def test_verify_rules_with_cache(self, mock_verify_rule):
+    mock_verify_rule.side_effect = fake_verify_rule
+    files = [
+        self.write_rule("good.yaral", "rule good {}"),
+        self.write_rule("copy.yaral", "rule good {}"),
+        self.write_rule("bad.yaral", "rule bad {"),
+        self.write_rule("flaky.yaral", "rule flaky {}"),
+    ]
+
+    report = verify_rules.verify_rules(
+        None, files, self.cache_file, qps=1000)
+
+    self.assertEqual([r["status"] for r in report], [
+        verify_rules.VERIFIED, verify_rules.VERIFIED, verify_rules.FAILED,
+        verify_rules.ERROR
+    ])
+    self.assertEqual(report[2]["compilationError"], "parsing: syntax error")
+    self.assertIn("503", report[3]["error"])
+    # Identical rules are verified only once.
+    self.assertEqual(mock_verify_rule.call_count, 3)
+
+    # Only successes are cached.
+    report = verify_rules.verify_rules(
+        None, files, self.cache_file, qps=1000)
+
+    self.assertEqual([r["status"] for r in report], [
+        verify_rules.CACHED, verify_rules.CACHED, verify_rules.FAILED,
+        verify_rules.ERROR
+    ])
+    self.assertEqual(mock_verify_rule.call_count, 5)
+
+  @mock.patch.object(verify_rule, "verify_rule", autospec=True)
+  def test_cache_is_per_api_url(self, mock_verify_rule):
+    mock_verify_rule.side_effect = fake_verify_rule
+    files = [self.write_rule("good.yaral", "rule good {}")]
+    verify_rules.verify_rules(None, files, self.cache_file, qps=1000)
+
+    with mock.patch.object(verify_rule, "CHRONICLE_API_BASE_URL",
+                           "https://europe-backstory.googleapis.com"):
+      report = verify_rules.verify_rules(
+          None, files, self.cache_file, qps=1000)
+
+    self.assertEqual(report[0]["status"], verify_rules.VERIFIED)
+    self.assertEqual(mock_verify_rule.call_count, 2)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,179 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Reusable module for uploading many batchCreate requests concurrently.
+
+The ingestion samples (create_udm_events, create_entities and
+create_unstructured_log_entries) each send one batchCreate request. For
+backfills, upload_batches sends a stream of request bodies to one of these
+endpoints with several concurrent workers, over a session whose connection
+pool is large enough for all of them (see mount_pooled_adapter). Each batch is
+retried if it fails transiently (HTTP 429 or 5xx, see common.retry).
+
+Batches are read from the input lazily, and only a bounded number of them are
+in flight at a time. With STRICT ordering, each batch is sent only after the
+previous one was ingested, and the upload stops at the first failed batch; with
+BEST_EFFORT ordering, batches are sent in order but may be ingested in any
+order, and failed batches don't stop the upload.
+"""
+
+import concurrent.futures
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from google.auth.transport import requests
+
+from common import retry
+
+DEFAULT_MAX_WORKERS = 8
+
+STRICT = "strict"
+BEST_EFFORT = "best_effort"
+ORDERINGS = (STRICT, BEST_EFFORT)
+
+# Fields of batchCreate request bodies that hold the ingested events.
+_EVENT_FIELDS = ("entries", "events", "entities")
+_HEADERS = {"Content-Type": "application/json"}
+
+
+class UploadStats:
+  """Counts and throughput of an upload."""
+
+  def __init__(self):
+    self.batches = 0
+    self.events = 0
+    self.bytes = 0
+    self.seconds = 0.0
+    # Indexes (from 0) of batches that failed after retries.
+    self.failed_batches: List[int] = []
+
+  @property
+  def events_per_second(self) -> float:
+    return self.events / self.seconds if self.seconds else 0.0
+
+  @property
+  def bytes_per_second(self) -> float:
+    return self.bytes / self.seconds if self.seconds else 0.0
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {
+        "batches": self.batches,
+        "events": self.events,
+        "bytes": self.bytes,
+        "failedBatches": self.failed_batches,
+        "seconds": round(self.seconds, 3),
+        "eventsPerSecond": round(self.events_per_second, 3),
+        "bytesPerSecond": round(self.bytes_per_second, 3),
+    }
+
+
+def mount_pooled_adapter(http_session: requests.AuthorizedSession,
+                         pool_size: int):
+  """Lets a session keep pool_size connections open to each HTTPS host.
+
+  By default, requests keeps at most 10 connections per host, so more
+  concurrent workers than that would open (and discard) a new connection for
+  most requests.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    pool_size: Maximum number of connections to keep open to each host, e.g.
+      the number of concurrent workers.
+  """
+  adapter = requests.requests.adapters.HTTPAdapter(pool_maxsize=pool_size)
+  http_session.mount("https://", adapter)
+
+
+def event_count(body: Mapping[str, Any]) -> int:
+  """Returns the number of events (or entities, or log entries) in a body."""
+  return sum(len(body.get(field, ())) for field in _EVENT_FIELDS)
+
+
+def upload_batches(http_session: requests.AuthorizedSession,
+                   url: str,
+                   batches: Iterable[Mapping[str, Any]],
+                   max_workers: int = DEFAULT_MAX_WORKERS,
+                   ordering: str = BEST_EFFORT,
+                   sleep: Optional[Callable[[float], None]] = None,
+                   clock: Callable[[], float] = time.monotonic) -> UploadStats:
+  """Sends batchCreate requests concurrently.
+
+  Args:
+    http_session: Authorized session for HTTP requests (see
+      mount_pooled_adapter).
+    url: URL of the batchCreate method, e.g.
+      f"{INGESTION_API_BASE_URL}/v2/udmevents:batchCreate".
+    batches: Request bodies, e.g. from a generator.
+    max_workers: Maximum number of requests at the same time (ignored with
+      STRICT ordering, which sends one request at a time).
+    ordering: STRICT or BEST_EFFORT (see the module docstring).
+    sleep: Optional function that sleeps between retries (for testing).
+    clock: Function that returns the current time in seconds (for testing).
+
+  Returns:
+    The numbers of batches, events and bytes that were ingested, the indexes
+    of failed batches, and the throughput.
+
+  Raises:
+    ValueError: Unknown ordering.
+  """
+  if ordering not in ORDERINGS:
+    raise ValueError(f"unknown ordering: {ordering}")
+  strict = ordering == STRICT
+  # Bound the batches held in memory, while keeping all the workers busy.
+  max_in_flight = 1 if strict else 2 * max_workers
+  retry_kwargs = {"sleep": sleep} if sleep else {}
+  stats = UploadStats()
+  start = clock()
+
+  def send(payload: bytes):
+    def call():
+      response = http_session.request(
+          "POST", url, data=payload, headers=_HEADERS)
+      response.raise_for_status()
+    retry.call_with_retry(call, **retry_kwargs)
+
+  def record(future: concurrent.futures.Future, i: int, events: int,
+             size: int) -> bool:
+    try:
+      future.result()
+    except requests.requests.exceptions.RequestException:
+      stats.failed_batches.append(i)
+      return False
+    stats.batches += 1
+    stats.events += events
+    stats.bytes += size
+    return True
+
+  pending = {}
+  with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+    stopped = False
+    for i, body in enumerate(batches):
+      if len(pending) >= max_in_flight:
+        done, _ = concurrent.futures.wait(
+            pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+          if not record(future, *pending.pop(future)) and strict:
+            stopped = True
+      if stopped:
+        break
+      payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+      pending[executor.submit(send, payload)] = (i, event_count(body),
+                                                 len(payload))
+    for future in concurrent.futures.as_completed(pending):
+      record(future, *pending[future])
+  stats.failed_batches.sort()
+  stats.seconds = clock() - start
+  return stats
@@ -0,0 +1,134 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unit tests for the "batch_uploader" module."""
+
+import json
+import threading
+import unittest
+from unittest import mock
+
+from google.auth.transport import requests
+
+from . import batch_uploader
+
+URL = "https://ingestion/v2/udmevents:batchCreate"
+
+
+def _response(status_code: int) -> mock.MagicMock:
+  response = mock.MagicMock()
+  response.status_code = status_code
+  if status_code >= 400:
+    response.raise_for_status.side_effect = (
+        requests.requests.exceptions.HTTPError(response=response))
+  return response
+
+
+class BatchUploaderTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.session = mock.MagicMock()
+    self.lock = threading.Lock()
+    self.sent = []  # Batch numbers, in the order of the requests.
+    self.status_codes = {}  # Batch number -> list of status codes to return.
+
+  def fake_request(self, method, url, data, headers):
+    del method, url, headers  # Unused.
+    n = json.loads(data)["n"]
+    with self.lock:
+      self.sent.append(n)
+      codes = self.status_codes.get(n, [])
+      return _response(codes.pop(0) if codes else 200)
+
+  def batches(self, count: int):
+    for n in range(count):
+      yield {"n": n, "events": [{"i": i} for i in range(n + 1)]}
+
+  def test_event_count(self):
+    self.assertEqual(batch_uploader.event_count({"entries": [1, 2]}), 2)
+    self.assertEqual(batch_uploader.event_count({"events": [1]}), 1)
+    self.assertEqual(batch_uploader.event_count({"entities": []}), 0)
+
+  def test_mount_pooled_adapter(self):
+    batch_uploader.mount_pooled_adapter(self.session, 32)
+    prefix, adapter = self.session.mount.call_args.args
+    self.assertEqual(prefix, "https://")
+    # pylint: disable-next=protected-access
+    self.assertEqual(adapter._pool_maxsize, 32)
+
+  def test_best_effort(self):
+    self.session.request.side_effect = self.fake_request
+    clock = mock.Mock(side_effect=[0.0, 2.0])
+    stats = batch_uploader.upload_batches(
+        self.session, URL, self.batches(20), max_workers=4, clock=clock)
+    self.assertCountEqual(self.sent, range(20))
+    self.assertEqual(stats.batches, 20)
+    self.assertEqual(stats.events, sum(range(1, 21)))
+    self.assertEqual(stats.failed_batches, [])
+    self.assertEqual(stats.seconds, 2.0)
+    self.assertEqual(stats.events_per_second, stats.events / 2)
+    self.assertEqual(stats.bytes_per_second, stats.bytes / 2)
+    payload_bytes = sum(
+        len(c.kwargs["data"]) for c in self.session.request.call_args_list)
+    self.assertEqual(stats.bytes, payload_bytes)
+
+  def test_retries_and_failures(self):
+    self.session.request.side_effect = self.fake_request
+    self.status_codes = {2: [429, 503], 5: [400]}
+    stats = batch_uploader.upload_batches(
+        self.session, URL, self.batches(8), max_workers=3,
+        sleep=lambda _: None)
+    self.assertEqual(self.sent.count(2), 3)
+    self.assertEqual(self.sent.count(5), 1)
+    self.assertEqual(stats.batches, 7)
+    self.assertEqual(stats.failed_batches, [5])
+
+  def test_strict_stops_at_first_failure(self):
+    self.session.request.side_effect = self.fake_request
+    self.status_codes = {3: [400]}
+    stats = batch_uploader.upload_batches(
+        self.session,
+        URL,
+        self.batches(8),
+        max_workers=4,
+        ordering=batch_uploader.STRICT)
+    self.assertEqual(self.sent, [0, 1, 2, 3])
+    self.assertEqual(stats.batches, 3)
+    self.assertEqual(stats.failed_batches, [3])
+
+  def test_bounded_in_flight(self):
+    consumed = []
+
+    def batches():
+      for batch in self.batches(50):
+        consumed.append(batch["n"])
+        # At most 2 * max_workers batches are read ahead of the sent ones.
+        with self.lock:
+          self.assertLessEqual(len(consumed) - len(self.sent), 2 * 2 + 1)
+        yield batch
+
+    self.session.request.side_effect = self.fake_request
+    stats = batch_uploader.upload_batches(
+        self.session, URL, batches(), max_workers=2)
+    self.assertEqual(stats.batches, 50)
+
+  def test_unknown_ordering(self):
+    with self.assertRaises(ValueError):
+      batch_uploader.upload_batches(
+          self.session, URL, self.batches(1), ordering="random")
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -25,6 +25,13 @@ line. The format of the log depends on the log type (specified by the --log_type
 flag). See ./example_input/sample_unstructured_log_entries.txt for an example
 log for the BIND_DNS log type.
 
+The file (or STDIN) is read line by line, and the logs are packed into as few
+requests as possible, each of which stays under --max_request_bytes (1MB by
+default) after JSON encoding. Each request is sent as soon as it's full, so
+files of any size can be ingested without loading them into memory. Requests
+are sent by --max_workers concurrent workers (see batch_uploader), and the
+throughput is printed to STDERR at the end.
+
 So, assuming you're created a credentials file at ~/.chronicle_credentials.json,
 you can run this command using the sample imput like so:
 
@@ -37,15 +44,90 @@ https://cloud.google.com/chronicle/docs/reference/ingestion-api#unstructuredloge
 """
 
 import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, List
 
 from google.auth.transport import requests
 
 from common import chronicle_auth
 from common import regions
+from . import batch_uploader
 
 INGESTION_API_BASE_URL = "https://malachiteingestion-pa.googleapis.com"
 AUTHORIZATION_SCOPES = ["https://www.googleapis.com/auth/malachite-ingestion"]
 
+# Maximum size of a batchCreate request body.
+DEFAULT_MAX_REQUEST_BYTES = 1_000_000
+# Separator between entries in the JSON encoding of the request body.
+_ENTRY_SEPARATOR_BYTES = len(", ")
+
+
+def build_request_body(log_type: str, customer_id: str,
+                       entries: List[Dict[str, str]]) -> Dict[str, Any]:
+  return {
+      "customerId": customer_id,
+      "logType": log_type,
+      "entries": entries,
+  }
+
+
+def entry_size(entry: Dict[str, str]) -> int:
+  """Returns the size in bytes of an entry in the JSON request body.
+
+  The size is that of the JSON encoding used by requests (ASCII-only, so
+  quotes, backslashes, control and non-ASCII characters are escaped), which
+  can be several times the size of the raw log text.
+  """
+  return len(json.dumps(entry))
+
+
+def batch_log_entries(
+    log_type: str,
+    customer_id: str,
+    logs: Iterable[str],
+    max_request_bytes: int = DEFAULT_MAX_REQUEST_BYTES
+) -> Iterator[List[Dict[str, str]]]:
+  """Packs logs into batches of entries for size-limited requests.
+
+  Logs are consumed lazily, and each batch is yielded as soon as the next log
+  wouldn't fit in it, so only one batch is held in memory at a time.
+
+  Args:
+    log_type: Log type for a feed.
+    customer_id: A string containing the UUID for the Chronicle customer.
+    logs: Logs, one per item (e.g. the lines of a file). Trailing line breaks
+      are removed.
+    max_request_bytes: Maximum size of the JSON request body of each batch.
+
+  Yields:
+    Lists of entries, whose request bodies are at most max_request_bytes each.
+
+  Raises:
+    ValueError: A log doesn't fit in a request on its own.
+  """
+  envelope_bytes = len(
+      json.dumps(build_request_body(log_type, customer_id, [])))
+  entries = []
+  batch_bytes = envelope_bytes
+  for i, log in enumerate(logs, 1):
+    entry = {"logText": log.rstrip("\r\n")}
+    size = entry_size(entry)
+    if envelope_bytes + size > max_request_bytes:
+      raise ValueError(
+          f"log {i} is {size} bytes in JSON, which doesn't fit in a request " +
+          f"of {max_request_bytes} bytes")
+    added_bytes = size + (_ENTRY_SEPARATOR_BYTES if entries else 0)
+    if batch_bytes + added_bytes > max_request_bytes:
+      yield entries
+      entries = []
+      batch_bytes = envelope_bytes
+      added_bytes = size
+    entries.append(entry)
+    batch_bytes += added_bytes
+  if entries:
+    yield entries
+
 
 def create_logs(http_session: requests.AuthorizedSession, log_type: str,
                 customer_id: str, logs_text: str) -> None:
@@ -56,24 +138,51 @@ def create_logs(http_session: requests.AuthorizedSession, log_type: str,
     log_type: Log type for a feed. To see supported log types run
       list_supported_log_types.py
     customer_id: A string containing the UUID for the Chronicle customer.
-    logs_text: A string containing logs delimited by new line characters. The
-      total size of this string may not exceed 1MB or the resultsing request to
-      the ingestion API will fail.
+    logs_text: A string containing logs delimited by new line characters. Logs
+      are sent in as many requests as needed to keep each one under 1MB.
 
   Raises:
     requests.exceptions.HTTPError: HTTP request resulted in an error
       (response.status_code >= 400).
+    ValueError: A log doesn't fit in a request on its own.
   """
-  url = f"{INGESTION_API_BASE_URL}/v2/unstructuredlogentries:batchCreate"
-  entries = [{"logText": t} for t in logs_text.splitlines()]
-  body = {
-      "customerId": customer_id,
-      "logType": log_type,
-      "entries": entries,
-  }
+  create_logs_from_lines(http_session, log_type, customer_id,
+                         logs_text.splitlines())
+
+
+def create_logs_from_lines(
+    http_session: requests.AuthorizedSession,
+    log_type: str,
+    customer_id: str,
+    logs: Iterable[str],
+    max_request_bytes: int = DEFAULT_MAX_REQUEST_BYTES) -> int:
+  """Streams unstructured log entries to the Chronicle backend for ingestion.
+
+  Args:
+    http_session: Authorized session for HTTP requests.
+    log_type: Log type for a feed. To see supported log types run
+      list_supported_log_types.py
+    customer_id: A string containing the UUID for the Chronicle customer.
+    logs: Logs, one per item (e.g. a file object, which yields its lines).
+    max_request_bytes: Maximum size of the JSON body of each request.
 
-  response = http_session.request("POST", url, json=body)
-  response.raise_for_status()
+  Returns:
+    Number of requests sent.
+
+  Raises:
+    requests.exceptions.HTTPError: HTTP request resulted in an error
+      (response.status_code >= 400). Requests before it were already sent.
+    ValueError: A log doesn't fit in a request on its own.
+  """
+  url = f"{INGESTION_API_BASE_URL}/v2/unstructuredlogentries:batchCreate"
+  num_requests = 0
+  for entries in batch_log_entries(log_type, customer_id, logs,
+                                   max_request_bytes):
+    body = build_request_body(log_type, customer_id, entries)
+    response = http_session.request("POST", url, json=body)
+    response.raise_for_status()
+    num_requests += 1
+  return num_requests
 
 
 if __name__ == "__main__":
@@ -95,11 +204,40 @@ if __name__ == "__main__":
       type=argparse.FileType("r"),
       required=True,
       help="path to a file (or \"-\" for STDIN) containing logs, one log per "
-      "line, whose format varies by log type, and whose total size must not "
-      "exceed 1MB events")
+      "line, whose format varies by log type")
+  parser.add_argument(
+      "--max_request_bytes",
+      type=int,
+      default=DEFAULT_MAX_REQUEST_BYTES,
+      help="maximum size of each request body in bytes (default = "
+      f"{DEFAULT_MAX_REQUEST_BYTES})")
+  parser.add_argument(
+      "--max_workers",
+      type=int,
+      default=batch_uploader.DEFAULT_MAX_WORKERS,
+      help="maximum number of concurrent requests (default = "
+      f"{batch_uploader.DEFAULT_MAX_WORKERS})")
+  parser.add_argument(
+      "--ordering",
+      type=str,
+      choices=batch_uploader.ORDERINGS,
+      default=batch_uploader.BEST_EFFORT,
+      help="whether requests must be ingested in order, one at a time "
+      f"(default = {batch_uploader.BEST_EFFORT})")
 
   args = parser.parse_args()
   INGESTION_API_BASE_URL = regions.url(INGESTION_API_BASE_URL, args.region)
   session = chronicle_auth.initialize_http_session(args.credentials_file,
                                                    scopes=AUTHORIZATION_SCOPES)
-  create_logs(session, args.log_type, args.customer_id, args.logs_file.read())
+  batch_uploader.mount_pooled_adapter(session, args.max_workers)
+  bodies = (build_request_body(args.log_type, args.customer_id, entries)
+            for entries in batch_log_entries(args.log_type, args.customer_id,
+                                             args.logs_file,
+                                             args.max_request_bytes))
+  stats = batch_uploader.upload_batches(
+      session,
+      f"{INGESTION_API_BASE_URL}/v2/unstructuredlogentries:batchCreate",
+      bodies, args.max_workers, args.ordering)
+  print(json.dumps(stats.to_dict()), file=sys.stderr)
+  if stats.failed_batches:
+    sys.exit(1)
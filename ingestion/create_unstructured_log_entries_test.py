@@ -14,6 +14,7 @@
 #
 """Unit tests for the create_unstructured_log_entries binary."""
 
+import json
 import unittest
 from unittest import mock
 
@@ -47,6 +48,75 @@ class CreateUnstructuredLogEntryTest(unittest.TestCase):
         mock_session, "LOG_TYPE", "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx",
         "log1\tlog1\r\nlog2\tlog2")
 
+  def test_batch_log_entries_fits_budget(self):
+    logs = [
+        f"log {i} \"quoted\" \u00e9\t\\" * (i % 7 + 1) for i in range(200)
+    ]
+    batches = list(
+        create_unstructured_log_entries.batch_log_entries(
+            "LOG_TYPE", "CUSTOMER_ID", logs, max_request_bytes=1000))
+    self.assertGreater(len(batches), 1)
+    self.assertEqual([e["logText"] for b in batches for e in b], logs)
+    for i, batch in enumerate(batches):
+      body = create_unstructured_log_entries.build_request_body(
+          "LOG_TYPE", "CUSTOMER_ID", batch)
+      size = len(json.dumps(body).encode("utf-8"))
+      self.assertLessEqual(size, 1000)
+      if i < len(batches) - 1:
+        # The next log would not have fit.
+        next_entry = batches[i + 1][0]
+        self.assertGreater(
+            size + 2 + create_unstructured_log_entries.entry_size(next_entry),
+            1000)
+
+  def test_batch_log_entries_counts_escaping(self):
+    # 100 characters that each take 6 bytes when escaped ("\u00e9").
+    log = "\u00e9" * 100
+    batches = list(
+        create_unstructured_log_entries.batch_log_entries(
+            "LOG_TYPE", "CUSTOMER_ID", [log, log], max_request_bytes=1000))
+    self.assertEqual(len(batches), 2)
+
+  def test_batch_log_entries_strips_line_breaks(self):
+    batches = list(
+        create_unstructured_log_entries.batch_log_entries(
+            "LOG_TYPE", "CUSTOMER_ID", ["log1\r\n", "log2\n", "log3"]))
+    self.assertEqual(batches, [[{
+        "logText": "log1"
+    }, {
+        "logText": "log2"
+    }, {
+        "logText": "log3"
+    }]])
+
+  def test_batch_log_entries_log_too_large(self):
+    with self.assertRaises(ValueError):
+      list(
+          create_unstructured_log_entries.batch_log_entries(
+              "LOG_TYPE", "CUSTOMER_ID", ["x" * 1000], max_request_bytes=1000))
+
+  @mock.patch.object(requests, "AuthorizedSession", autospec=True)
+  @mock.patch.object(requests.requests, "Response", autospec=True)
+  def test_create_logs_from_lines_streams(self, mock_response, mock_session):
+    mock_session.request.return_value = mock_response
+    type(mock_response).status_code = mock.PropertyMock(return_value=200)
+    consumed = []
+
+    def logs():
+      for i in range(100):
+        consumed.append(i)
+        # Each full request (10 logs) is sent as soon as the log after it is
+        # read, before any more logs are read.
+        self.assertEqual(mock_session.request.call_count, max(i - 1, 0) // 10)
+        yield f"{i:080d}"
+
+    num_requests = create_unstructured_log_entries.create_logs_from_lines(
+        mock_session, "LOG_TYPE", "CUSTOMER_ID", logs(),
+        max_request_bytes=1100)
+    self.assertEqual(len(consumed), 100)
+    self.assertEqual(num_requests, 10)
+    self.assertEqual(mock_session.request.call_count, 10)
+
 
 if __name__ == "__main__":
   unittest.main()